@@ -1,16 +1,8 @@
 import streamlit as st
-import pandas as pd
 import datetime
-import random
-import io
+import logging
 import urllib.parse
-import base64
 import os
-import re
-import pdfplumber
-from PIL import Image as PILImage
-from openpyxl.styles import Font, Border, Side, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
 
 # ==========================================
 # 1. CONFIGURATION & CSS
@@ -96,857 +88,144 @@ st.markdown(f"""
 # 2. HELPER FUNCTIONS (ALL)
 # ==========================================
 
-# --- A. ATTENDANCE HELPERS ---
-def create_natural_time(year, month, base_hour, is_arrival):
-    """Generates a natural-looking time string."""
-    if is_arrival:
-        minute = random.randint(-5, 10)
-    else:
-        minute = random.randint(0, 10)
-    
-    try:
-        base_time = datetime.datetime(year, month, 1, base_hour, 0)
-        final_time = base_time + datetime.timedelta(minutes=minute)
-        return final_time.strftime("%H:%M")
-    except ValueError:
-        return "00:00"
-
-def distribute_overtime(required_ot, num_working_days):
-    """Distributes required OT hours randomly among allowed working days."""
-    if num_working_days == 0:
-        return []
-        
-    ot_hours_list = [0] * num_working_days
-    hours_distributed = 0
-    
-    max_attempts = required_ot * 5 
-    attempts = 0
-    
-    while hours_distributed < required_ot and attempts < max_attempts:
-        attempts += 1
-        day_index = random.randint(0, num_working_days - 1)
-        ot_to_add = random.choice([1, 1, 2])
-        
-        if hours_distributed + ot_to_add > required_ot:
-            ot_to_add = required_ot - hours_distributed
-            
-        if ot_hours_list[day_index] < 2:
-           ot_to_add_today = min(ot_to_add, 2 - ot_hours_list[day_index])
-           ot_hours_list[day_index] += ot_to_add_today
-           hours_distributed += ot_to_add_today
-        
-        if all(ot >= 2 for ot in ot_hours_list):
-            if hours_distributed < required_ot:
-                remaining = required_ot - hours_distributed
-                for _ in range(remaining):
-                    day_index = random.randint(0, num_working_days - 1)
-                    ot_hours_list[day_index] += 1
-                hours_distributed = sum(ot_hours_list)
-            break
-            
-    return ot_hours_list
-
-def generate_attendance_file(input_df, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift=None):
-    output = io.BytesIO()
-    month_year_str = f"{datetime.date(target_year, target_month, 1).strftime('%B %Y').upper()}"
-
-    title_font = Font(name='Calibri', size=14, bold=True)
-    header_font = Font(name='Calibri', size=11, bold=True)
-    normal_font = Font(name='Calibri', size=11)
-    center_align = Alignment(horizontal='center', vertical='center')
-    right_align = Alignment(horizontal='right', vertical='center')
-    link_font = Font(name='Calibri', size=11, color="0000FF", underline="single")
-    thin_side = Side(border_style='thin', color='000000')
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
-
-    index_data = []
-
-    def is_special(date_obj):
-        """Checks if a given date falls within the special shift date range."""
-        if not sp_shift: return False
-        return sp_shift["start"] <= date_obj <= sp_shift["end"]
-        
-    def get_val(row_s, *keys, default=None):
-        """Safely fetch a value from the pandas row checking multiple possible column names (Case-Insensitive)."""
-        for k in keys:
-            if k in row_s:
-                return row_s[k]
-        return default
-
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        index_ws = writer.book.create_sheet(title="Index", index=0)
-        
-        progress_bar = st.progress(0)
-        total_emps = len(input_df)
-        
-        for i, (_, employee) in enumerate(input_df.iterrows()):
-            progress_bar.progress((i + 1) / total_emps)
-
-            # --- Robust Data Extraction (Case Insensitive Support) ---
-            emp_code = get_val(employee, 'CODE', 'Code', 'code', default='')
-            emp_name = get_val(employee, 'NAME', 'Name', 'name', default='')
-            s_no = get_val(employee, 'S#', 'S.No', 'S. No', 's#', default='')
-            
-            req_ot_raw = get_val(employee, 'Overtime Hours', 'OVERTIME HOURS', 'Overtime', default=0)
-            req_ot = int(req_ot_raw) if pd.notna(req_ot_raw) and str(req_ot_raw).strip() != '' else 0
-            
-            abs_raw = get_val(employee, 'ABSENT DAYS', 'Absent Days', 'Absent', default=0)
-            try:
-                num_absent = int(abs_raw) if pd.notna(abs_raw) and str(abs_raw).strip() != '' else 0
-            except ValueError:
-                num_absent = 0
-            
-            # Extract Status (Handling New and Left Employees dynamically)
-            emp_status_raw = get_val(employee, 'STATUS', 'Status', 'status', default='')
-            if pd.isna(emp_status_raw) or str(emp_status_raw).strip().lower() in ['nan', '']:
-                emp_status = ""
-            else:
-                emp_status = str(emp_status_raw).strip().title()
-                
-            # Extract Date
-            emp_date_raw = get_val(employee, 'DATE', 'Date', 'date', default=pd.NaT)
-            # ---------------------------------------------------------
-                
-            safe_name = str(emp_name).replace(":", "").replace("/", "")
-            sheet_name = f"{emp_code}_{safe_name}"[:31]
-            ws = writer.book.create_sheet(title=sheet_name)
-            
-            # Header Data
-            header_data = [
-                ["Company Name:", company_name_input],
-                ["Report Title:", f"ATTENDANCE SHEETS FOR THE MONTH OF {month_year_str}"],
-                ["Employee Name:", emp_name],
-                ["Employee Code:", emp_code]
-            ]
-            
-            try:
-                next_month = datetime.date(target_year, target_month, 28) + datetime.timedelta(days=4)
-                last_day_of_month = next_month - datetime.timedelta(days=next_month.day)
-                num_days_in_month = last_day_of_month.day
-            except ValueError:
-                num_days_in_month = 30
-                last_day_of_month = datetime.date(target_year, target_month, 30)
-
-            # --- Determine Active Period bounds based on Joining/Leaving status ---
-            active_start_date = datetime.date(target_year, target_month, 1)
-            active_end_date = last_day_of_month
-
-            if pd.notna(emp_date_raw) and str(emp_date_raw).strip() != "":
-                try:
-                    parsed_date = pd.to_datetime(emp_date_raw).date()
-                    if emp_status == "New":
-                        active_start_date = max(active_start_date, parsed_date)
-                    elif emp_status == "Left":
-                        active_end_date = min(active_end_date, parsed_date)
-                except Exception:
-                    pass # Ignore if date format is strictly invalid
-                
-            working_days_in_month = []
-            full_month_data = []
-            sundays = 0
-            holidays_found = 0
-            
-            for day_num in range(1, num_days_in_month + 1):
-                current_date = datetime.date(target_year, target_month, day_num)
-                
-                # Only check holidays and sundays if the employee is currently active
-                if active_start_date <= current_date <= active_end_date:
-                    is_sunday = current_date.weekday() == 6
-                    is_holiday = current_date in holidays_dict
-                    
-                    if is_sunday:
-                        sundays += 1
-                    elif is_holiday:
-                        holidays_found += 1
-                    else:
-                        working_days_in_month.append(current_date)
-            
-            num_working_days = len(working_days_in_month)
-            absent_days = set()
-            
-            # Make sure we don't assign more absent days than the employee actually worked
-            actual_absent = min(num_absent, num_working_days) 
-            if actual_absent > 0:
-                absent_days = set(random.sample(working_days_in_month, actual_absent))
-                
-            index_data.append({
-                "S. No": s_no,
-                "CODE": emp_code,
-                "Name": emp_name,
-                "SheetName": sheet_name,
-                "Absent": actual_absent,
-                "OT Hours": req_ot,
-                "Status": emp_status
-            })
-            
-            # Divide working days into standard and special
-            working_days_with_attendance = [day for day in working_days_in_month if day not in absent_days]
-            standard_working_days = [day for day in working_days_with_attendance if not is_special(day)]
-            
-            # Distribute OT *only* among standard working days
-            ot_schedule = distribute_overtime(req_ot, len(standard_working_days))
-            
-            std_work_counter = 0
-            sp_work_counter = 0
-            total_std_hours = 0
-            
-            for day_num in range(1, num_days_in_month + 1):
-                current_date = datetime.date(target_year, target_month, day_num)
-                date_str = current_date.strftime("%d-%b-%y")
-                
-                row = [date_str, std_shift['name'], "", "", "", ""]
-
-                # Process dates before joining or after leaving first
-                if current_date < active_start_date:
-                    row[1] = "-"
-                    row[5] = "Not Joined"
-                elif current_date > active_end_date:
-                    row[1] = "-"
-                    row[5] = "Left"
-                else:
-                    is_sunday = current_date.weekday() == 6
-                    holiday_name = holidays_dict.get(current_date)
-                    
-                    if is_sunday:
-                        row[5] = "SUNDAY"
-                    elif holiday_name:
-                        row[5] = holiday_name
-                    elif current_date in working_days_with_attendance:
-                        if is_special(current_date):
-                            # Special Shift Day Logic
-                            row[1] = sp_shift['name']
-                            row[2] = create_natural_time(target_year, target_month, 9, True)
-                            row[3] = create_natural_time(target_year, target_month, sp_shift['out_hour'], False)
-                            row[4] = "" # NO OT FOR SPECIAL SHIFT
-                            row[5] = "On Time"
-                            total_std_hours += sp_shift['hours']
-                            sp_work_counter += 1
-                        else:
-                            # Standard Shift Day Logic
-                            ot_hours = ot_schedule[std_work_counter]
-                            row[1] = std_shift['name']
-                            row[2] = create_natural_time(target_year, target_month, 9, True)
-                            row[3] = create_natural_time(target_year, target_month, std_shift['out_hour'] + ot_hours, False)
-                            row[4] = ot_hours if ot_hours > 0 else ""
-                            row[5] = "On Time"
-                            total_std_hours += std_shift['hours']
-                            std_work_counter += 1
-                    elif current_date in working_days_in_month:
-                        row[5] = "Absent"
-                
-                full_month_data.append(row)
-                
-            # Footing Logic
-            total_present_days = std_work_counter + sp_work_counter
-            total_ot_hours = sum(ot_schedule)
-            total_payable_hours = total_std_hours + total_ot_hours
-            
-            shift_breakdown_str = f"({std_work_counter} Std. Days x {std_shift['hours']}h)"
-            if sp_work_counter > 0:
-                shift_breakdown_str += f" + ({sp_work_counter} Spc. Days x {sp_shift['hours']}h)"
-            
-            footing_data = [
-                ["SUMMARY:", ""],
-                ["Total Days in Month", num_days_in_month],
-                ["Sundays (Active)", sundays],
-                ["Gazetted Holidays (Active)", holidays_found],
-                ["Total Present Days", total_present_days],
-                ["Absent", actual_absent],
-                ["Over Time Hrs.", total_ot_hours],
-                [],
-                ["Total Standard Hours", total_std_hours, shift_breakdown_str],
-                ["Total OT Hours", total_ot_hours, f"(Sum of OT HRS)"],
-                ["Total Payable Hours", total_payable_hours]
-            ]
-            
-            # --- WRITING & FORMATTING ---
-            
-            # 1. Header Formatting
-            ws.cell(row=1, column=1, value="Company Name:").font = title_font
-            ws.cell(row=1, column=2, value=company_name_input).font = title_font 
-            ws.merge_cells('B1:F1') 
-
-            for r_idx, row_val in enumerate(header_data[1:], 2):
-                ws.cell(row=r_idx, column=1, value=row_val[0]).font = header_font
-                ws.cell(row=r_idx, column=2, value=row_val[1]).font = normal_font
-                ws.merge_cells(f'B{r_idx}:F{r_idx}') 
-
-            # 2. Data Table
-            data_start_row = 6
-            table_headers = ["DATE", "SHIFT G", "TIME IN", "TIME OUT", "OT HRS", "REMARKS"]
-            
-            for c_idx, val in enumerate(table_headers, 1):
-                cell = ws.cell(row=data_start_row, column=c_idx, value=val)
-                cell.font = header_font
-                cell.border = thin_border
-                cell.alignment = center_align
-                
-            for r_idx, row_val in enumerate(full_month_data, data_start_row + 1):
-                for c_idx, val in enumerate(row_val, 1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=val)
-                    cell.font = normal_font
-                    cell.border = thin_border
-                    cell.alignment = center_align
-                    if c_idx == 5: cell.alignment = right_align
-
-            # 3. Footing
-            footing_start_row = data_start_row + len(full_month_data) + 2
-            ws.cell(row=footing_start_row, column=1, value="SUMMARY:").font = header_font
-            ws.cell(row=footing_start_row, column=1).border = thin_border
-            
-            for r_idx, row_val in enumerate(footing_data[1:], footing_start_row + 1):
-                for c_idx, val in enumerate(row_val, 1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=val)
-                    cell.font = normal_font
-                    cell.border = thin_border
-                    if c_idx == 1: cell.font = header_font
-                    if c_idx > 1: cell.alignment = right_align
-
-            # 4. Dimensions & Print
-            widths = [15, 15, 12, 12, 10, 20]
-            for i, w in enumerate(widths):
-                ws.column_dimensions[get_column_letter(i+1)].width = w
-                
-            ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
-            ws.page_setup.paperSize = ws.PAPERSIZE_A4
-            ws.page_setup.fitToPage = True
-            ws.page_setup.fitToWidth = 1
-            ws.page_setup.fitToHeight = 1
-
-        # --- Index Sheet Logic ---
-        index_headers = ["S. No", "CODE", "Name", "Absent", "OT Hours", "Status"]
-        for c_idx, val in enumerate(index_headers, 1):
-            cell = index_ws.cell(row=1, column=c_idx, value=val)
-            cell.font = header_font
-            cell.border = thin_border
-            cell.alignment = center_align
-            
-        for r_idx, data in enumerate(index_data, 2):
-            c1 = index_ws.cell(row=r_idx, column=1, value=data['S. No'])
-            c1.font = normal_font; c1.border = thin_border; c1.alignment = center_align
-            c2 = index_ws.cell(row=r_idx, column=2, value=data['CODE'])
-            c2.font = normal_font; c2.border = thin_border; c2.alignment = center_align
-            c3 = index_ws.cell(row=r_idx, column=3)
-            c3.value = f'=HYPERLINK("#\'{data["SheetName"]}\'!A1", "{data["Name"]}")'
-            c3.font = link_font; c3.border = thin_border
-            c4 = index_ws.cell(row=r_idx, column=4, value=data['Absent'])
-            c4.font = normal_font; c4.border = thin_border; c4.alignment = center_align
-            c5 = index_ws.cell(row=r_idx, column=5, value=data['OT Hours'])
-            c5.font = normal_font; c5.border = thin_border; c5.alignment = center_align
-            c6 = index_ws.cell(row=r_idx, column=6, value=data['Status'])
-            c6.font = normal_font; c6.border = thin_border; c6.alignment = center_align
-            
-        if 'Sheet' in writer.book.sheetnames:
-            writer.book.remove(writer.book['Sheet'])
+# --- TOOL ENGINES ---
+# Generators live in nfp/ (attendance, invoices, bank, tax, payroll). Each page
+# imports its own module on first use, so a cold start only pays for Streamlit
+# and a tool's dependencies (pandas, openpyxl, pdfplumber) load when it is opened.
+
+# --- PERFORMANCE INSTRUMENTATION ---
+# Stage timings from nfp.instrument are logged as JSON lines on "nfp.perf".
+perf_logger = logging.getLogger("nfp.perf")
+if not perf_logger.handlers:
+    perf_handler = logging.StreamHandler()
+    perf_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    perf_logger.addHandler(perf_handler)
+    perf_logger.setLevel(logging.INFO)
+    perf_logger.propagate = False
+
+def perf_trace(job):
+    """Trace for one tool run, honouring the sidebar Performance settings."""
+    from nfp.instrument import Trace
+    return Trace(job, memory=st.session_state.get("perf_panel", False), profile=st.session_state.get("perf_profile", False))
+
+def show_perf_panel(trace):
+    """Logs the run's stage records and, if enabled, shows them in a collapsible panel."""
+    trace.log()
+    if not st.session_state.get("perf_panel"):
+        return
+    with st.expander(f"⏱️ Performance ({trace.total_wall():.2f}s)", expanded=False):
+        st.dataframe(trace.records(), use_container_width=True, hide_index=True)
+        st.caption("Wall/CPU seconds per stage, summed over repeated calls. Peak MB is the tracemalloc peak during the stage. Tracing covers the whole server process, so while other users' runs are being traced the peaks include their memory too.")
+        if trace.profiler:
+            st.code(trace.profile_text(), language="text")
+            st.download_button(
+                label="📥 Download cProfile Dump (.prof)",
+                data=trace.profile_bytes(),
+                file_name=f"nfp_{trace.job}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.prof",
+                mime="application/octet-stream",
+                key=f"prof_{trace.job}"
+            )
 
-    return output
+def deferred_download(output):
+    """Download data for a spooled artifact: read into memory only when the user clicks."""
+    from nfp.spool import read_output
+    return lambda: read_output(output)
 
-# --- B. INVOICE HELPERS ---
-def num_to_words(n):
-    ones = ['', 'One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 'Eleven', 'Twelve', 'Thirteen', 'Fourteen', 'Fifteen', 'Sixteen', 'Seventeen', 'Eighteen', 'Nineteen']
-    tens = ['', '', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Sixty', 'Seventy', 'Eighty', 'Ninety']
+# --- BACKGROUND JOBS ---
+@st.cache_resource
+def job_runner():
+    """One worker pool per server process, shared by every session."""
+    from nfp.jobs import JobRunner
+    return JobRunner().start()
 
-    def convert(n):
-        if n < 20: return ones[n]
-        if n < 100: return tens[n // 10] + ('' if n % 10 == 0 else ' ' + ones[n % 10])
-        if n < 1000: return ones[n // 100] + ' Hundred' + ('' if n % 100 == 0 else ' and ' + convert(n % 100))
-        if n < 1000000: return convert(n // 1000) + ' Thousand' + ('' if n % 1000 == 0 else ' ' + convert(n % 1000))
-        if n < 1000000000: return convert(n // 1000000) + ' Million' + ('' if n % 1000000 == 0 else ' ' + convert(n % 1000000))
-        return 'Number too large'
+def submit_job(kind, params, label, links=None):
+    """Queues a tool run on the background workers and tells the user where to find it.
 
-    if n == 0: return 'Zero'
-    
-    num_str = f"{n:.2f}"
-    integer_part, decimal_part = num_str.split('.')
-    words = convert(int(integer_part))
-    if int(decimal_part) > 0:
-        words += " and " + convert(int(decimal_part)) + " Paisa"
-    return words + " Only"
-
-def generate_html_invoice(input_df, header_info, tax_rate):
-    grouped = input_df.groupby('DC No.')
-    all_invoices_html = ""
-    
-    for dc_no, group in grouped:
-        header_row = group.iloc[0]
-        customer_name = header_row.get('Customer Name', '')
-        bill_address = header_row.get('Bill To Address', '')
-        customer_ntn = header_row.get('Customer NTN', '')
-        invoice_no = header_row.get('Invoice No.', '')
-        
-        raw_date = header_row.get('Invoice Date', '')
-        try:
-            invoice_date = pd.to_datetime(raw_date).strftime('%d-%b-%Y')
-        except:
-            invoice_date = str(raw_date)
-            
-        payment_terms = header_row.get('Credit Terms', 'Cash')
-        
-        sub_total = group['Total Value (PKR)'].sum()
-        tax_amount = sub_total * (tax_rate / 100)
-        grand_total = sub_total + tax_amount
-        amount_in_words = num_to_words(grand_total)
-        
-        rows_html = ""
-        for idx, row in group.iterrows():
-            u_price = f"{row['Unit Price (PKR)']:,.2f}"
-            t_value = f"{row['Total Value (PKR)']:,.2f}"
-            
-            rows_html += f"""
-            <tr class="bg-white">
-                <td class="p-1 text-center">{idx + 1}</td>
-                <td class="p-1">{row['H.S Code']}</td>
-                <td class="p-1 wrap-text">{row['Item Description']}</td>
-                <td class="p-1">Weaving</td> 
-                <td class="p-1">JOB-{random.randint(1000,9999)}</td>
-                <td class="p-1">{row['DC No.']}</td>
-                <td class="p-1">{row['UOM']}</td>
-                <td class="p-1 text-center">{row['Qty']}</td>
-                <td class="p-1 text-right">{u_price}</td>
-                <td class="p-1 text-right">{t_value}</td>
-            </tr>
-            """
-            
-        for _ in range(max(0, 8 - len(group))):
-             rows_html += '<tr class="bg-white"><td class="p-2 text-center">&nbsp;</td><td></td><td class="wrap-text"></td><td></td><td></td><td></td><td></td><td></td><td></td><td></td></tr>'
-
-        invoice_html = f"""
-        <div class="printable-container max-w-6xl mx-auto bg-white p-6 md:p-8 mb-8" style="page-break-after: always;">
-            <header class="flex justify-between items-start pb-4">
-                <div>
-                    <h1 class="text-2xl md:text-3xl font-bold text-gray-800">{header_info['company_name']}</h1>
-                    <p class="text-sm text-gray-500">{header_info['address']}</p>
-                    <p class="text-sm text-gray-500">Phones: {header_info['phone']}</p>
-                    <p class="text-sm text-gray-500">E-mail: {header_info['email']} | Website: {header_info['web']}</p>
-                    <p class="text-sm text-gray-500 font-semibold mt-1">NTN: {header_info['ntn']}</p>
-                </div>
-                <div class="text-right">
-                    <h2 class="text-2xl md:text-3xl font-semibold text-gray-700">SALES TAX INVOICE</h2>
-                    <div class="mt-2 grid grid-cols-2 gap-2 text-left">
-                        <label class="block text-xs font-medium text-gray-500 p-1">Invoice No.</label>
-                        <input type="text" value="{invoice_no}" class="block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium" readonly>
-                        
-                        <label class="block text-xs font-medium text-gray-500 p-1">Invoice Date</label>
-                        <input type="text" value="{invoice_date}" class="block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">
-                        
-                        <label class="block text-xs font-medium text-gray-500 p-1">Payment Terms</label>
-                        <input type="text" value="{payment_terms}" class="block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">
-
-                        <label class="block text-xs font-medium text-gray-500 p-1">Customer PO</label>
-                        <input type="text" value="PO-REF-XX" class="block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">
-                    </div>
-                </div>
-            </header>
-
-            <div class="main-content">
-                <section class="grid grid-cols-2 gap-6 mt-6 section-spacing">
-                    <div class="border-2 border-black rounded-md p-3">
-                        <h3 class="text-sm font-semibold text-white mb-2 bg-gray-700 p-1 -m-3 border-b border-black dark-bg print-header">BILL TO</h3>
-                        <div class="mt-3">
-                            <label class="block text-xs font-medium text-black font-bold">Customer Name</label>
-                            <input type="text" value="{customer_name}" class="mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium">
-                        </div>
-                        <div class="mt-2">
-                            <label class="block text-xs font-medium text-black font-bold">Address</label>
-                            <textarea class="mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium" rows="2">{bill_address}</textarea>
-                        </div>
-                        <div class="mt-2 grid grid-cols-2 gap-2">
-                             <div>
-                                <label class="block text-xs font-medium text-black font-bold">NTN</label>
-                                <input type="text" value="{customer_ntn}" class="mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium">
-                             </div>
-                             <div>
-                                <label class="block text-xs font-medium text-black font-bold">STRN</label>
-                                <input type="text" value="" class="mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium">
-                             </div>
-                        </div>
-                    </div>
-                    <div class="border-2 border-black rounded-md p-3">
-                        <h3 class="text-sm font-semibold text-white mb-2 bg-gray-700 p-1 -m-3 border-b border-black dark-bg print-header">SHIP TO</h3>
-                        <div class="mt-3">
-                            <p class="text-sm font-semibold text-black">{customer_name}</p>
-                            <p class="text-sm text-black">{bill_address}</p>
-                        </div>
-                    </div>
-                </section>
-    
-                <section class="mt-6 table-container section-spacing">
-                    <h3 class="text-lg font-semibold text-gray-700 mb-2">Item Details</h3>
-                    <table class="w-full text-sm text-left text-gray-500 printable-table">
-                        <thead class="text-xs text-white uppercase bg-gray-700 dark-bg print-header" style="-webkit-print-color-adjust: exact;">
-                            <tr>
-                                <th class="p-2 text-center" style="width: 3%;">Sr.</th>
-                                <th class="p-2" style="width: 8%;">H.S Code</th>
-                                <th class="p-2 wrap-text" style="width: 25%;">Item Description</th>
-                                <th class="p-2" style="width: 10%;">Cost Center</th>
-                                <th class="p-2" style="width: 10%;">Job No.</th>
-                                <th class="p-2" style="width: 10%;">DC No.</th>
-                                <th class="p-2" style="width: 4%;">UOM</th>
-                                <th class="p-2 text-center" style="width: 5%;">Qty</th>
-                                <th class="p-2 text-right" style="width: 10%;">Unit Price</th>
-                                <th class="p-2 text-right" style="width: 15%;">Total Value</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {rows_html}
-                        </tbody>
-                    </table>
-                </section>
-                
-                <section class="grid grid-cols-2 gap-6 mt-6 section-spacing">
-                    <div>
-                        <label class="block text-sm font-medium text-black font-bold">Amount in Words (PKR)</label>
-                        <textarea class="mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm dark-border text-black" rows="2" readonly>{amount_in_words}</textarea>
-                    </div>
-                    <div class="space-y-2">
-                        <div class="flex justify-between items-center bg-gray-700 text-white p-2 rounded-md border-2 border-black dark-bg print-total-box">
-                            <span class="text-sm font-bold text-white">Sub-Total:</span>
-                            <span class="text-sm font-bold text-white">{sub_total:,.2f}</span>
-                        </div>
-                        <div class="flex justify-between items-center p-2">
-                            <div class="text-sm font-bold text-black">
-                                Sales Tax ({tax_rate}%):
-                            </div>
-                            <span class="text-sm font-bold text-black">{tax_amount:,.2f}</span>
-                        </div>
-                        <div class="flex justify-between items-center bg-gray-700 text-white p-3 rounded-md border-2 border-black dark-bg print-total-box">
-                            <span class="text-base font-bold text-white">Grand Total:</span>
-                            <span class="text-base font-bold text-white">{grand_total:,.2f}</span>
-                        </div>
-                    </div>
-                </section>
-            </div>
-
-            <footer class="mt-8">
-                <div class="grid grid-cols-2 gap-8">
-                    <div></div>
-                    <div class="text-center">
-                        <p class="signature-line pt-2 text-sm font-semibold text-gray-700">For {header_info['company_name']}</p>
-                        <p class="text-xs text-gray-500">(Authorized Signatory)</p>
-                    </div>
-                </div>
-            </footer>
-        </div>
-        """
-        all_invoices_html += invoice_html
-
-    full_html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Sales Tax Invoices</title>
-        <script src="https://cdn.tailwindcss.com"></script>
-        <style>
-            body {{ background-color: #f9fafb; font-family: Calibri, sans-serif; }}
-            @media print {{
-                @page {{ size: A4 portrait; margin: 0.1cm; margin-bottom: 0.5cm; }}
-                html, body {{ background-color: #fff; font-size: 9pt; }}
-                .no-print {{ display: none; }}
-                input, textarea, select {{ border: none !important; resize: none; }}
-                .printable-table th {{ background-color: #374151 !important; color: #ffffff !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }}
-                .print-header {{ background-color: #374151 !important; color: #ffffff !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }}
-                .print-total-box {{ background-color: #374151 !important; color: #ffffff !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }}
-                .text-black {{ color: #000000 !important; }}
-                .text-gray-500, .text-gray-600, .text-gray-700, .text-gray-800 {{ color: #000000 !important; }}
-                .border-black {{ border-color: #000000 !important; border-width: 2px !important; border-style: solid !important; }}
-                .border-2 {{ border-width: 2px !important; }}
-            }}
-            .signature-line {{ border-top: 1px solid #4A5568; margin-top: 2.5rem; }}
-            .printable-table, .printable-table th, .printable-table td {{ border: 1px solid #000000 !important; border-collapse: collapse; }}
-        </style>
-    </head>
-    <body class="p-4 md:p-8">
-        {all_invoices_html}
-        <div class="fixed bottom-4 right-4 no-print">
-            <button onclick="window.print()" class="px-6 py-3 bg-blue-600 text-white font-bold rounded-full shadow-lg hover:bg-blue-700 transition">
-                🖨️ Print Invoices
-            </button>
-        </div>
-    </body>
-    </html>
+    `links` maps a param to a stored upload the job reads from disk (see JobStore.submit).
     """
-    return full_html
-
-def generate_excel_invoice(input_df, header_info, tax_rate):
-    output = io.BytesIO()
-    grouped = input_df.groupby('DC No.')
-    header_font = Font(name='Calibri', size=14, bold=True)
-    sub_header_font = Font(name='Calibri', size=10)
-    table_header_font = Font(name='Calibri', size=10, bold=True, color="FFFFFF")
-    fill_dark = PatternFill(start_color="4A5568", end_color="4A5568", fill_type="solid")
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        ws = writer.book.create_sheet("Invoices")
-        ws.column_dimensions['A'].width = 5
-        ws.column_dimensions['B'].width = 10
-        ws.column_dimensions['C'].width = 30
-        ws.column_dimensions['D'].width = 10
-        ws.column_dimensions['E'].width = 10
-        ws.column_dimensions['F'].width = 10
-        ws.column_dimensions['G'].width = 8
-        ws.column_dimensions['H'].width = 8
-        ws.column_dimensions['I'].width = 12
-        ws.column_dimensions['J'].width = 15
-        
-        current_row = 1
-        for dc_no, group in grouped:
-            header_row = group.iloc[0]
-            invoice_no = header_row.get('Invoice No.', '')
-            raw_date = header_row.get('Invoice Date', '')
-            invoice_date = raw_date if isinstance(raw_date, str) else raw_date.strftime('%d-%b-%Y')
-            
-            ws.cell(row=current_row, column=1, value=header_info['company_name']).font = header_font
-            ws.cell(row=current_row, column=8, value="SALES TAX INVOICE").font = header_font
-            current_row += 1
-            ws.cell(row=current_row, column=1, value=header_info['address']).font = sub_header_font
-            ws.cell(row=current_row, column=8, value=f"Invoice No: {invoice_no}").font = sub_header_font
-            current_row += 1
-            ws.cell(row=current_row, column=1, value=f"Phone: {header_info['phone']}").font = sub_header_font
-            ws.cell(row=current_row, column=8, value=f"Date: {invoice_date}").font = sub_header_font
-            current_row += 1
-            ws.cell(row=current_row, column=1, value=f"NTN: {header_info['ntn']}").font = sub_header_font
-            current_row += 2 
-            
-            ws.cell(row=current_row, column=1, value="BILL TO").font = Font(bold=True)
-            ws.cell(row=current_row, column=2, value=header_row.get('Customer Name', ''))
-            current_row += 1
-            ws.cell(row=current_row, column=1, value="Address").font = Font(bold=True)
-            ws.cell(row=current_row, column=2, value=header_row.get('Bill To Address', ''))
-            current_row += 1
-            ws.cell(row=current_row, column=1, value="NTN").font = Font(bold=True)
-            ws.cell(row=current_row, column=2, value=header_row.get('Customer NTN', ''))
-            current_row += 2
-            
-            headers = ["Sr.", "H.S Code", "Description", "Cost Center", "Job No", "DC No", "UOM", "Qty", "Unit Price", "Total"]
-            for col_idx, h in enumerate(headers, 1):
-                c = ws.cell(row=current_row, column=col_idx, value=h)
-                c.font = table_header_font
-                c.fill = fill_dark
-                c.alignment = Alignment(horizontal='center')
-            current_row += 1
-            
-            sub_total = 0
-            for idx, row in group.iterrows():
-                ws.cell(row=current_row, column=1, value=idx+1).border = thin_border
-                ws.cell(row=current_row, column=2, value=row['H.S Code']).border = thin_border
-                ws.cell(row=current_row, column=3, value=row['Item Description']).border = thin_border
-                ws.cell(row=current_row, column=4, value="Weaving").border = thin_border
-                ws.cell(row=current_row, column=5, value="JOB-XXXX").border = thin_border
-                ws.cell(row=current_row, column=6, value=row['DC No.']).border = thin_border
-                ws.cell(row=current_row, column=7, value=row['UOM']).border = thin_border
-                ws.cell(row=current_row, column=8, value=row['Qty']).border = thin_border
-                ws.cell(row=current_row, column=9, value=row['Unit Price (PKR)']).border = thin_border
-                total_val = row['Total Value (PKR)']
-                ws.cell(row=current_row, column=10, value=total_val).border = thin_border
-                sub_total += total_val
-                current_row += 1
-                
-            tax_amount = sub_total * (tax_rate / 100)
-            grand_total = sub_total + tax_amount
-            
-            current_row += 1
-            ws.cell(row=current_row, column=9, value="Sub-Total").font = Font(bold=True)
-            ws.cell(row=current_row, column=10, value=sub_total).font = Font(bold=True)
-            current_row += 1
-            ws.cell(row=current_row, column=9, value=f"GST ({tax_rate}%)").font = Font(bold=True)
-            ws.cell(row=current_row, column=10, value=tax_amount).font = Font(bold=True)
-            current_row += 1
-            ws.cell(row=current_row, column=9, value="Grand Total").font = Font(bold=True)
-            ws.cell(row=current_row, column=10, value=grand_total).font = Font(bold=True)
-            
-            current_row += 1
-            ws.cell(row=current_row, column=1, value="Amount in Words: " + num_to_words(grand_total)).font = Font(italic=True)
-            current_row += 4
-            
-        if 'Sheet' in writer.book.sheetnames:
-            writer.book.remove(writer.book['Sheet'])
-    return output
-
-# --- C. BANK CONVERTER HELPERS ---
-def to_float(x):
-    if not x: return 0.0
-    s = str(x).strip().replace(',', '').replace('(', '-').replace(')', '')
-    s = re.sub(r'[^0-9.-]', '', s) 
-    try:
-        return float(s)
-    except:
-        return 0.0
-
-def extract_text_from_pdf(pdf_file):
-    text = ""
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            content = page.extract_text()
-            if content:
-                text += content + "\n"
-    return text
-
-def parse_bank_statement(raw_text):
-    lines = raw_text.split('\n')
-    date_pattern = r'^(\d{2}/\d{2}/\d{4})'
-    
-    transactions = []
-    current_row = None
-    running_balance = 0.0
-    account_active = False
-
-    for line in lines:
-        line = line.strip()
-        if not line: continue
-
-        if "Opening Balance" in line:
-            parts = line.split()
-            balance_val = to_float(parts[-1])
-            running_balance = balance_val
-            account_active = True
-            
-            transactions.append({
-                "Posting Date": parts[0] if re.match(r'\d', parts[0]) else "",
-                "Value Date": "",
-                "Instrument/Doc No": "",
-                "Details": "--- Opening Balance ---",
-                "Debit": 0.0,
-                "Credit": 0.0,
-                "Balance": balance_val
-            })
-            continue
-
-        match = re.match(date_pattern, line)
-        if match and account_active:
-            if current_row: 
-                transactions.append(current_row)
-            
-            parts = line.split()
-            if len(parts) < 2: continue 
-            
-            post_date = parts[0]
-            
-            instrument = ""
-            details_start_idx = 1
-            if len(parts) > 2 and parts[1].isdigit() and 6 <= len(parts[1]) <= 12:
-                instrument = parts[1]
-                details_start_idx = 2
-            elif len(parts) > 3 and parts[2].isdigit() and 6 <= len(parts[2]) <= 12:
-                instrument = parts[2]
-                details_start_idx = 3
+    import uuid
+    owner = st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+    job_id = job_runner().store.submit(kind, params, owner=owner, label=label, links=links)
+    st.success(f"Queued **{label}** as job `{job_id}`. Track progress and download the result on the **Jobs** page.")
+    return job_id
 
-            try:
-                row_balance = to_float(parts[-1])
-                numeric_candidates = []
-                for p in reversed(parts[:-1]):
-                    if re.search(r'\d', p) and ('.' in p or ',' in p or p.isdigit()):
-                        numeric_candidates.append(p)
-                    else:
-                        break
-                
-                diff = round(row_balance - running_balance, 2)
-                debit = abs(diff) if diff < 0 else 0.0
-                credit = diff if diff > 0 else 0.0
-                
-                details_end_idx = len(parts) - 1 - len(numeric_candidates)
-                details = " ".join(parts[details_start_idx:details_end_idx])
-
-                current_row = {
-                    "Posting Date": post_date,
-                    "Value Date": post_date, 
-                    "Instrument/Doc No": instrument,
-                    "Details": details,
-                    "Debit": debit,
-                    "Credit": credit,
-                    "Balance": row_balance
-                }
-                running_balance = row_balance
-            except Exception:
-                continue
-        else:
-            stop_keywords = ["Carried Forward", "Brought Forward", "Page", "Produced On", "TOTALS", "Closing Balance"]
-            if current_row and not any(k in line for k in stop_keywords):
-                if not re.match(r'^[\d,.\s\-:><]+$', line) or len(line) > 15:
-                    current_row["Details"] += " " + line
-
-    if current_row: 
-        transactions.append(current_row)
-    return transactions
-
-def generate_bank_excel(df):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Extracted Data')
-        workbook = writer.book
-        worksheet = writer.sheets['Extracted Data']
-        
-        header_fmt = workbook.add_format({
-            'bold': True, 'font_color': 'white', 'bg_color': '#003366', 
-            'border': 1, 'align': 'center', 'valign': 'vcenter'
-        })
-        num_fmt = workbook.add_format({'num_format': '#,##0.00', 'border': 1, 'valign': 'top', 'font_name': 'Arial', 'font_size': 10})
-        date_fmt = workbook.add_format({'num_format': 'dd/mm/yyyy', 'align': 'center', 'border': 1, 'valign': 'top', 'font_name': 'Arial', 'font_size': 10})
-        text_fmt = workbook.add_format({'text_wrap': True, 'border': 1, 'valign': 'top', 'font_name': 'Arial', 'font_size': 10})
-        ob_num = workbook.add_format({'num_format': '#,##0.00', 'border': 1, 'bg_color': '#FFFFCC', 'bold': True, 'valign': 'top'})
-        ob_text = workbook.add_format({'text_wrap': True, 'border': 1, 'bg_color': '#FFFFCC', 'bold': True, 'valign': 'top'})
-        ob_date = workbook.add_format({'align': 'center', 'border': 1, 'bg_color': '#FFFFCC', 'bold': True, 'valign': 'top'})
-        
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_fmt)
-            
-        for row_idx, row_data in enumerate(df.values):
-            details_str = str(row_data[3])
-            is_ob = "Opening Balance" in details_str
-            d_fmt = ob_date if is_ob else date_fmt
-            t_fmt = ob_text if is_ob else text_fmt
-            n_fmt = ob_num  if is_ob else num_fmt
-            
-            worksheet.write(row_idx + 1, 0, row_data[0], d_fmt)
-            worksheet.write(row_idx + 1, 1, row_data[1], d_fmt)
-            worksheet.write(row_idx + 1, 2, row_data[2], t_fmt)
-            worksheet.write(row_idx + 1, 3, row_data[3], t_fmt)
-            worksheet.write(row_idx + 1, 4, row_data[4], n_fmt)
-            worksheet.write(row_idx + 1, 5, row_data[5], n_fmt)
-            worksheet.write(row_idx + 1, 6, row_data[6], n_fmt)
-            
-        worksheet.set_column('A:B', 14)
-        worksheet.set_column('C:C', 18)
-        worksheet.set_column('D:D', 65)
-        worksheet.set_column('E:G', 18)
-    return output.getvalue()
-
-# --- D. TAX CALCULATION HELPER ---
-def calculate_fbr_tax(monthly_gross_salary):
-    annual_income = monthly_gross_salary * 12
-    annual_tax = 0
-
-    if annual_income <= 600000:
-        annual_tax = 0
-    elif annual_income <= 1200000:
-        annual_tax = (annual_income - 600000) * 0.01
-    elif annual_income <= 2200000:
-        annual_tax = 6000 + (annual_income - 1200000) * 0.11
-    elif annual_income <= 3200000:
-        annual_tax = 116000 + (annual_income - 2200000) * 0.23
-    elif annual_income <= 4100000:
-        annual_tax = 346000 + (annual_income - 3200000) * 0.30
-    else:
-        annual_tax = 616000 + (annual_income - 4100000) * 0.35
+def heavy_run(tool, units):
+    """Admission to the server-wide governor for a heavy in-process run (see nfp.governor).
 
-    monthly_tax = annual_tax / 12
-    return annual_income, annual_tax, monthly_tax
+    While other sessions' runs hold the capacity, the page shows the user's
+    place in line; the run starts by itself when its turn comes.
+    """
+    from contextlib import contextmanager
+    from nfp.governor import GOVERNOR, estimate_cost
+    status = st.empty()
+
+    def queued(position, running):
+        status.info(f"⏳ Queued: the server is busy with {running} large run(s). You are #{position} in line; this starts automatically. Tick **Run in background** next time to get a Jobs-page download instead.")
+
+    @contextmanager
+    def admitted():
+        with GOVERNOR.admit(tool, estimate_cost(tool, units), on_wait=queued):
+            status.empty()
+            yield
+    return admitted()
+
+# --- HOLIDAY CALENDAR ---
+@st.cache_resource
+def holiday_calendar():
+    """Saved gazetted holidays (SQLite under NFP_DATA_DIR), shared by every session."""
+    from nfp.holidays import HolidayCalendar
+    return HolidayCalendar()
+
+@st.cache_resource
+def fragment_cache():
+    """Rendered attendance sheets and invoices from earlier runs (SQLite under NFP_DATA_DIR), for incremental rebuilds."""
+    from nfp.fragments import FragmentCache
+    return FragmentCache()
+
+# --- UPLOADS ---
+@st.cache_resource
+def upload_store():
+    """Uploaded input files on disk, deduplicated by content across sessions (see nfp.uploads)."""
+    from nfp.uploads import UploadStore
+    return UploadStore()
+
+def stored_upload(uploaded):
+    """Path of an uploaded file in the upload store; it is streamed to disk and hashed once per upload, not on every rerun."""
+    paths = st.session_state.setdefault("upload_paths", {})
+    path = paths.get(uploaded.file_id)
+    if path is None or not upload_store().touch(path):
+        path = upload_store().put(uploaded, suffix=os.path.splitext(uploaded.name)[1])
+        paths[uploaded.file_id] = path
+    return path
+
+@st.cache_data(max_entries=16, ttl=3600, show_spinner=False)
+def _read_stored(path):
+    from nfp.uploads import read_table
+    return read_table(path)
+
+def read_upload(uploaded):
+    """An uploaded .xlsx/.csv as a DataFrame, parsed once per distinct file (the stored path names its content)."""
+    return _read_stored(stored_upload(uploaded))
+
+# --- STATIC ASSETS ---
+@st.cache_resource(show_spinner=False)
+def load_image(path):
+    """Reads a static image once per server process; returns None if missing."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
 
 # ==========================================
 # 3. SIDEBAR
 # ==========================================
 with st.sidebar:
-    try:
-        logo = PILImage.open("nfp_office.jpg") 
+    logo = load_image("nfp_office.jpg") or load_image("Nazeer Fin Pro - NFP.jpg")
+    if logo:
         st.image(logo, use_container_width=True)
-    except:
-        try:
-            logo = PILImage.open("Nazeer Fin Pro - NFP.jpg")
-            st.image(logo, use_container_width=True)
-        except:
-            st.header(f"✨ {BRAND_SHORT}")
+    else:
+        st.header(f"✨ {BRAND_SHORT}")
         
     st.markdown(f"## **{BRAND_NAME}**")
     st.caption("Professional Finance Consultancy")
@@ -963,11 +242,9 @@ with st.sidebar:
     with col_about_label:
         st.write("**About Nazeer Ahmed Khan**")
     with col_about_img:
-        try:
-            about_img = PILImage.open("about_nazeer.jpg")
+        about_img = load_image("about_nazeer.jpg")
+        if about_img:
             st.image(about_img, use_container_width=True)
-        except:
-            pass
             
     with st.expander("View Details"):
         st.write("""
@@ -983,6 +260,10 @@ with st.sidebar:
         """)
     st.write("---")
 
+    with st.expander("⏱️ Performance"):
+        st.checkbox("Show performance panel after each run", key="perf_panel", help="Adds per-stage wall time, CPU time and peak memory. Memory tracking slows runs slightly.")
+        st.checkbox("Profile runs with cProfile", key="perf_profile", help="Adds the top functions and a downloadable .prof dump to the panel.")
+
 # ==========================================
 # 4. MAIN CONTENT
 # ==========================================
@@ -994,17 +275,21 @@ with col_title:
     st.markdown("<div class='brand-sub'>Advanced Financial Solutions & Automation</div>", unsafe_allow_html=True)
 
 with col_logo:
-    try:
-        header_logo = PILImage.open("logo.jpg")
-        st.image(header_logo, width=100) 
-    except:
-        pass 
+    header_logo = load_image("logo.jpg")
+    if header_logo:
+        st.image(header_logo, width=100)
 
-# TABS
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["🏢 Attendance Generator", "🧾 Invoice Maker", "🏦 Bank Converter", "🧮 Payroll Calculator", "📝 Consultancy Blog", "📞 Contact NFP"])
+# TOOL PAGES
+# Each tool is a page function; st.navigation runs only the selected one per
+# interaction instead of executing every tab body on every rerun.
+
+# --- PAGE 1: ATTENDANCE ---
+def attendance_page():
+    from nfp.attendance import (generate_attendance_file, generate_attendance_range, generate_attendance_records,
+                                month_bounds, months_in_range)
+    from nfp.instrument import span
+    from nfp.schema import ATTENDANCE_COLUMNS, HOLIDAY_COLUMNS, SchemaError, normalize_frame
 
-# --- TAB 1: ATTENDANCE ---
-with tab1:
     st.subheader("Auto-Generate Attendance Sheets")
     st.info("Upload your employee data file (`data.xlsx`) to generate payroll-ready Excel sheets with natural time variations.")
     
@@ -1026,11 +311,18 @@ with tab1:
             target_date = st.date_input("Select Month & Year", datetime.date(2026, 2, 1), key="att_target_date")
             selected_month = target_date.month
             selected_year = target_date.year
+            range_mode = st.checkbox("Generate several months in one run", key="att_range_mode", help="One workbook per month, delivered as a single .zip.")
+            if range_mode:
+                range_end = st.date_input("Through Month", datetime.date(selected_year, 12, 1), key="att_range_end")
+                run_months = months_in_range(target_date, range_end)
+                period_label = f"{target_date.strftime('%B %Y')} to {range_end.strftime('%B %Y')}"
+            else:
+                run_months = [(selected_year, selected_month)]
+                period_label = target_date.strftime('%B %Y')
         
         with col_gen_2:
             st.write("**Gazetted Holidays**")
-            if 'holidays' not in st.session_state:
-                st.session_state.holidays = []
+            holidays = holiday_calendar()
             
             col_h1, col_h2 = st.columns(2)
             with col_h1:
@@ -1043,32 +335,39 @@ with tab1:
             with col_b1:
                 if st.button("Add Holiday", key="add_hol_btn"):
                     if h_name:
-                        st.session_state.holidays.append({"date": h_date, "name": h_name})
+                        holidays.add(h_date, h_name)
                         st.success(f"Added: {h_name}")
                     else:
                         st.error("Enter Name")
             with col_b2:
-                if st.button("Clear Holidays", key="clear_hol_btn"):
-                    st.session_state.holidays = []
-                    st.rerun()
-
-            holidays_dict = {}
-            current_month_holidays = []
-            if st.session_state.holidays:
-                for h in st.session_state.holidays:
-                    if h['date'].year == selected_year and h['date'].month == selected_month:
-                        current_month_holidays.append(h)
-                        if h['date'] in holidays_dict:
-                            holidays_dict[h['date']] += f" / {h['name']}"
-                        else:
-                            holidays_dict[h['date']] = h['name']
+                # The calendar is shared by every session of the server: deleting needs a second, explicit click
+                with st.popover("Clear Holidays", help=f"Removes the saved holidays of {period_label}."):
+                    saved = holidays.months(run_months) if run_months else {}
+                    st.warning(f"This deletes the {len(saved)} saved holiday(s) of {period_label} for **everyone** using this app, not just you.")
+                    if st.button("Delete for Everyone", key="clear_hol_btn", disabled=not saved):
+                        holidays.remove(datetime.date(*run_months[0], 1), month_bounds(*run_months[-1])[1])
+                        st.rerun()
+
+            with st.popover("📅 Import Holiday List"):
+                st.caption("An .xlsx or .csv with `Date` and `Name` columns, e.g. a full year of gazetted holidays. Saved holidays are kept across sessions.")
+                holiday_file = st.file_uploader("Holiday List", type=['xlsx', 'csv'], key="holiday_uploader", label_visibility="collapsed")
+                if holiday_file is not None and st.button("Import", key="import_hol_btn"):
+                    try:
+                        raw = read_upload(holiday_file)
+                        added = holidays.import_frame(normalize_frame(raw, HOLIDAY_COLUMNS, title="Holiday list"))
+                        st.success(f"Imported {added} new holiday(s).")
+                    except SchemaError as e:
+                        st.error(e.report())
+
+            # One indexed range query for the selected month(s)
+            holidays_dict = holidays.months(run_months) if run_months else {}
             
-            if current_month_holidays:
+            if holidays_dict:
                 st.caption("Active Holidays:")
-                for h in current_month_holidays:
-                    st.caption(f"- {h['date'].strftime('%d-%b')}: {h['name']}")
+                for h_day, h_label in holidays_dict.items():
+                    st.caption(f"- {h_day.strftime('%d-%b')}: {h_label}")
             else:
-                st.caption("No holidays for this month.")
+                st.caption(f"No holidays for {period_label}.")
 
     # NEW: SHIFT & OVERTIME SETTINGS EXPANDER
     with st.expander("⏱️ Shift & Overtime Settings (Standard & Special)", expanded=False):
@@ -1104,31 +403,178 @@ with tab1:
                 "out_hour": sp_out_hour
             }
 
+    input_kind = st.radio("Input", ["Attendance Summary (data.xlsx)", PUNCH_LOG_INPUT], horizontal=True, key="att_input_kind", help="A raw punch log is the device's own export, one row per check-in/check-out. Sheets then show the real first-in and last-out times, with absences and OT worked out from the punches.")
+    if input_kind == PUNCH_LOG_INPUT:
+        punch_log_section(company_name, target_date, holidays_dict, std_shift_config, special_shift_config)
+        return
+
     uploaded_file = st.file_uploader("Upload Input File", type=['xlsx'])
 
     if uploaded_file is not None:
+        trace = perf_trace("attendance")
         try:
-            df = pd.read_excel(uploaded_file)
+            with trace, span("ingest"):
+                df = normalize_frame(read_upload(uploaded_file), ATTENDANCE_COLUMNS, title="Attendance file")
             st.success("File loaded!")
             with st.expander("View Input Data"):
                 st.dataframe(df.head())
                 
-            if st.button("🚀 Generate & Download Report", type="primary"):
-                with st.spinner("Processing data..."):
-                    excel_data = generate_attendance_file(df, selected_month, selected_year, holidays_dict, company_name, std_shift_config, special_shift_config)
-                    st.success("Done! Your file is ready.")
-                    file_name = f"NFP_Attendance_{target_date.strftime('%B_%Y')}.xlsx"
+            if not range_mode:
+                output_format = st.radio("Output", ["Styled Excel Workbook", *RECORD_OUTPUTS], horizontal=True, key="att_output", help="CSV/Parquet give one row per employee-day plus a summary file, for HRIS imports. They skip the styled workbook and are much faster.")
+            if not range_mode and output_format not in RECORD_OUTPUTS:
+                incremental = st.checkbox("Only rebuild changed employees", value=True, key="att_incremental", help="Reuse the sheets of employees whose rows are unchanged since an earlier run with the same month, holidays and shifts. Corrections to a few rows of a large roster then take seconds, and unchanged employees keep the same times.")
+            else:
+                incremental = False
+            run_in_background = st.checkbox("Run in background (large rosters)", key="att_background", help="Queue the run on a background worker and download it from the Jobs page when it finishes.")
+            if range_mode and not run_months:
+                st.error("'Through Month' must not be before the selected month.")
+            elif range_mode and st.button(f"🚀 Generate {len(run_months)} Months", type="primary"):
+                zip_name = f"NFP_Attendance_{period_label.replace(' ', '_')}.zip"
+                if run_in_background:
+                    submit_job("attendance_range", {
+                        "df": df, "months": run_months, "holidays": holidays_dict, "company_name": company_name,
+                        "std_shift": std_shift_config, "sp_shift": special_shift_config, "file_name": zip_name,
+                    }, label=f"Attendance {period_label} ({len(df)} employees)")
+                    return
+                with st.spinner(f"Processing {len(run_months)} months..."):
+                    progress_bar = st.progress(0)
+                    with heavy_run("attendance", len(df) * len(run_months)), trace:
+                        zip_data, range_summary = generate_attendance_range(df, run_months, holidays_dict, company_name, std_shift_config, special_shift_config, progress=progress_bar.progress)
+                    st.success(f"Done! {len(run_months)} monthly workbooks are ready.")
                     st.download_button(
-                        label="📥 Download Excel File",
-                        data=excel_data.getvalue(),
-                        file_name=file_name,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        label="📥 Download All Months (.zip)",
+                        data=deferred_download(zip_data),
+                        file_name=zip_name,
+                        mime="application/zip",
+                        on_click="ignore"
                     )
+                    with st.expander("Summary by Month"):
+                        st.dataframe(range_summary.groupby("period", sort=False)[["present_days", "absent_days", "ot_hours", "payable_hours"]].sum(), use_container_width=True)
+                show_perf_panel(trace)
+            elif not range_mode and st.button("🚀 Generate & Download Report", type="primary"):
+                record_fmt = RECORD_OUTPUTS.get(output_format)
+                file_name = f"NFP_Attendance_{target_date.strftime('%B_%Y')}.{record_fmt or 'xlsx'}"
+                if run_in_background:
+                    submit_job("attendance_records" if record_fmt else "attendance", {
+                        "df": df, "month": selected_month, "year": selected_year, "holidays": holidays_dict,
+                        "company_name": company_name, "std_shift": std_shift_config, "sp_shift": special_shift_config,
+                        "period": target_date.strftime('%B %Y'), "file_name": file_name, "fmt": record_fmt,
+                        "incremental": incremental,
+                    }, label=f"Attendance {target_date.strftime('%B %Y')} ({len(df)} employees)")
+                    return
+                with st.spinner("Processing data..."):
+                    progress_bar = st.progress(0)
+                    with heavy_run("attendance_records" if record_fmt else "attendance", len(df)), trace:
+                        if record_fmt:
+                            report_data, attendance_summary = generate_attendance_records(df, selected_month, selected_year, holidays_dict, std_shift_config, special_shift_config, fmt=record_fmt, progress=progress_bar.progress)
+                        else:
+                            report_data, attendance_summary = generate_attendance_file(df, selected_month, selected_year, holidays_dict, company_name, std_shift_config, special_shift_config, progress=progress_bar.progress, cache=fragment_cache() if incremental else None)
+                    # Kept for the Payroll Register in the Payroll Calculator tab
+                    st.session_state.attendance_run = {
+                        "summary": attendance_summary,
+                        "period": target_date.strftime('%B %Y'),
+                        "std_hours": std_hours,
+                    }
+                    st.success("Done! Your file is ready.")
+                    if incremental:
+                        rebuilt = attendance_summary.attrs["rebuilt"]
+                        st.caption(f"Rebuilt {len(rebuilt)} of {len(attendance_summary)} employees; the rest were reused from an earlier run."
+                                   + (f" Changed: {', '.join(map(str, rebuilt[:20]))}{' …' if len(rebuilt) > 20 else ''}" if 0 < len(rebuilt) < len(attendance_summary) else ""))
+                    if record_fmt:
+                        col_r1, col_r2 = st.columns(2)
+                        with col_r1:
+                            st.download_button(
+                                label=f"📥 Download Daily Records ({record_fmt.upper()})",
+                                data=deferred_download(report_data),
+                                file_name=file_name,
+                                mime="text/csv" if record_fmt == "csv" else "application/vnd.apache.parquet",
+                                on_click="ignore"
+                            )
+                        with col_r2:
+                            st.download_button(
+                                label="📥 Download Employee Summary (CSV)",
+                                data=attendance_summary.to_csv(index=False),
+                                file_name=f"NFP_Attendance_Summary_{target_date.strftime('%B_%Y')}.csv",
+                                mime="text/csv",
+                                on_click="ignore"
+                            )
+                    else:
+                        st.download_button(
+                            label="📥 Download Excel File",
+                            data=deferred_download(report_data),
+                            file_name=file_name,
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            on_click="ignore"
+                        )
+                show_perf_panel(trace)
+        except SchemaError as e:
+            st.error(e.report())
         except Exception as e:
             st.error(f"Error: {e}")
 
-# --- TAB 2: INVOICE MAKER ---
-with tab2:
+RECORD_OUTPUTS = {"CSV (one row per employee-day)": "csv", "Parquet (one row per employee-day)": "parquet"}
+PUNCH_LOG_INPUT = "Raw Punch Log (biometric device)"
+
+def punch_log_section(company_name, target_date, holidays_dict, std_shift_config, special_shift_config):
+    """Attendance workbook for one month from a biometric device's punch log."""
+    from nfp.attendance import generate_attendance_from_punches
+    from nfp.instrument import span
+    from nfp.schema import SchemaError
+
+    period = target_date.strftime('%B %Y')
+    st.caption(f"Punches from **{period}** are used. Columns: `User ID` (or `CODE`), `Name` (optional) and `Date/Time`, one row per punch. Days are calendar days, so a shift past midnight is split across two dates.")
+    col_u1, col_u2 = st.columns(2)
+    with col_u1:
+        punch_file = st.file_uploader("Upload Punch Log", type=['xlsx', 'csv'], key="punch_log_uploader")
+    with col_u2:
+        roster_file = st.file_uploader("Attendance Roster (optional)", type=['xlsx'], key="punch_roster_uploader", help="Your data.xlsx: adds employees with no punches at all and applies New/Left dates. Without it, everyone in the log gets a sheet.")
+    if punch_file is None:
+        return
+
+    run_in_background = st.checkbox("Run in background (large logs)", key="punch_background", help="Queue the run on a background worker and download it from the Jobs page when it finishes.")
+    if not st.button("🚀 Generate from Punches", type="primary"):
+        return
+    trace = perf_trace("attendance_punches")
+    file_name = f"NFP_Attendance_{target_date.strftime('%B_%Y')}.xlsx"
+    try:
+        with trace, span("ingest"):
+            punch_df = read_upload(punch_file)
+            roster_df = read_upload(roster_file) if roster_file is not None else None
+        if run_in_background:
+            submit_job("attendance_punches", {
+                "punches": punch_df, "roster": roster_df, "month": target_date.month, "year": target_date.year,
+                "holidays": holidays_dict, "company_name": company_name, "std_shift": std_shift_config,
+                "sp_shift": special_shift_config, "period": period, "file_name": file_name,
+            }, label=f"Attendance {period} ({len(punch_df):,} punches)")
+            return
+        with st.spinner("Aggregating punches..."):
+            progress_bar = st.progress(0)
+            with heavy_run("attendance_punches", len(punch_df)), trace:
+                report_data, attendance_summary = generate_attendance_from_punches(
+                    punch_df, target_date.month, target_date.year, holidays_dict, company_name,
+                    std_shift_config, special_shift_config, roster_df=roster_df, progress=progress_bar.progress)
+        # Kept for the Payroll Register in the Payroll Calculator tab
+        st.session_state.attendance_run = {"summary": attendance_summary, "period": period, "std_hours": std_shift_config["hours"]}
+        st.success(f"Done! {len(attendance_summary)} employees from {len(punch_df):,} punches.")
+        st.download_button(
+            label="📥 Download Excel File",
+            data=deferred_download(report_data),
+            file_name=file_name,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            on_click="ignore"
+        )
+        show_perf_panel(trace)
+    except SchemaError as e:
+        st.error(e.report())
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+# --- PAGE 2: INVOICE MAKER ---
+def invoice_page():
+    from nfp.instrument import span
+    from nfp.invoices import generate_excel_invoice, generate_html_invoice, invoice_changes
+    from nfp.schema import INVOICE_COLUMNS, SchemaError, normalize_frame
+
     st.subheader("🧾 Invoice Maker")
     st.info("Upload your Sales Register (`sales_register.xlsx`) to generate bulk GST invoices ready for printing.")
     
@@ -1167,35 +613,65 @@ with tab2:
     invoice_file = st.file_uploader("Upload Sales Register", type=['xlsx'], key="invoice_uploader")
     
     if invoice_file is not None:
+        trace = perf_trace("invoices")
         try:
-            inv_df = pd.read_excel(invoice_file)
+            with trace, span("ingest"):
+                inv_df = normalize_frame(read_upload(invoice_file), INVOICE_COLUMNS, title="Sales register")
             st.success("Sales Register Loaded!")
             with st.expander("Preview Sales Data"):
                 st.dataframe(inv_df.head())
+            incremental = st.checkbox("Only render new or changed invoices", value=True, key="inv_incremental", help="Reuse invoices whose DC lines, company header and tax rate are unchanged since an earlier run, and list which DCs are new or modified.")
+            run_in_background = st.checkbox("Run in background (large registers)", key="inv_background", help="Queue the run on a background worker and download it from the Jobs page when it finishes.")
             if st.button("🖨️ Generate Printable Invoices", type="primary"):
+                if run_in_background:
+                    submit_job("invoices", {"df": inv_df, "header_info": header_info, "tax_rate": inv_tax_rate, "incremental": incremental},
+                               label=f"GST invoices ({inv_df['dc_no'].nunique()} DCs)")
+                    return
+                cache = fragment_cache() if incremental else None
                 with st.spinner("Generating Invoices..."):
-                    html_content = generate_html_invoice(inv_df, header_info, inv_tax_rate)
-                    excel_inv_data = generate_excel_invoice(inv_df, header_info, inv_tax_rate)
+                    with heavy_run("invoices", len(inv_df)), trace:
+                        changes = invoice_changes(inv_df, header_info, inv_tax_rate, cache) if cache else None
+                        html_content = generate_html_invoice(inv_df, header_info, inv_tax_rate, cache=cache)
+                        excel_inv_data = generate_excel_invoice(inv_df, header_info, inv_tax_rate, cache=cache)
+                    if changes is not None:
+                        counts = changes["status"].value_counts()
+                        st.caption(f"{counts.get('new', 0)} new, {counts.get('modified', 0)} modified and {counts.get('unchanged', 0)} unchanged invoices since the last run.")
+                        changed = changes[changes["status"] != "unchanged"]
+                        if len(changed) and len(changed) < len(changes):
+                            with st.expander("Changed Invoices"):
+                                st.dataframe(changed, use_container_width=True, hide_index=True)
+                                st.download_button("📥 Download Change Report (CSV)", data=changes.to_csv(index=False),
+                                                   file_name="GST_Invoices_Changes.csv", mime="text/csv", on_click="ignore")
                     col_d1, col_d2 = st.columns(2)
                     with col_d1:
                         st.download_button(
                             label="📥 Download Invoice (HTML)",
-                            data=html_content,
+                            data=deferred_download(html_content),
                             file_name="GST_Invoices_Printable.html",
-                            mime="text/html"
+                            mime="text/html",
+                            on_click="ignore"
                         )
                     with col_d2:
                         st.download_button(
                             label="📥 Download Excel Invoices",
-                            data=excel_inv_data.getvalue(),
+                            data=deferred_download(excel_inv_data),
                             file_name="GST_Invoices.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            on_click="ignore"
                         )
+                show_perf_panel(trace)
+        except SchemaError as e:
+            st.error(e.report())
         except Exception as e:
             st.error(f"Error processing file: {e}")
 
-# --- TAB 3: BANK CONVERTER ---
-with tab3:
+# --- PAGE 3: BANK CONVERTER ---
+def bank_page():
+    from nfp.bank import (DEFAULT_RULES, categorize, compile_rules, extract_text_from_pdf, generate_bank_excel,
+                          parse_bank_statement, statement_frame)
+    from nfp.instrument import span
+    from nfp.schema import SchemaError
+
     st.subheader("🏦 Bank Statement Converter Pro")
     st.markdown("Automated PDF to Excel Extraction for **Bank AL Habib**.")
     st.info("Direct PDF upload is the most accurate method. The app will automatically calculate Debit/Credit columns by analyzing balance changes.")
@@ -1207,56 +683,322 @@ with tab3:
         key="bank_pdf_uploader"
     )
 
-    if bank_pdf:
-        with st.spinner("Step 1: Reading PDF data..."):
-            raw_content = extract_text_from_pdf(bank_pdf)
+    with st.expander("🏷️ Categorization Rules"):
+        use_rules = st.checkbox("Add a Category column", value=True, key="bank_categorize", help="Each transaction gets the category of the first rule (top to bottom) whose keywords or regex appear in its Details.")
+        st.caption("Keywords match whole words, ignoring case and punctuation; separate several with commas. Regex rules use Python syntax. 'Applies To' limits a rule to debits or credits.")
+        rules_file = st.file_uploader("Import Rules (.xlsx / .csv with Pattern and Category columns)", type=["xlsx", "csv"], key="bank_rules_uploader")
+        if rules_file is not None and st.session_state.get("bank_rules_id") != rules_file.file_id:
+            st.session_state.bank_rules = read_upload(rules_file)
+            st.session_state.bank_rules_id = rules_file.file_id
+        rules_df = st.data_editor(
+            st.session_state.get("bank_rules", DEFAULT_RULES), num_rows="dynamic", use_container_width=True, hide_index=True,
+            column_config={
+                "Match": st.column_config.SelectboxColumn(options=["keyword", "regex"], default="keyword"),
+                "Applies To": st.column_config.SelectboxColumn(options=["any", "debit", "credit"], default="any"),
+            }, key="bank_rules_editor")
+        st.download_button("📥 Download Rules (CSV)", data=rules_df.to_csv(index=False), file_name="bank_category_rules.csv", mime="text/csv", on_click="ignore")
+    rules = None
+    if use_rules:
+        try:
+            rules = compile_rules(rules_df)
+        except SchemaError as e:
+            st.error(e.report())
+
+    run_in_background = st.checkbox("Run in background (large statements)", key="bank_background", help="Read and convert the PDF on a background worker and download it from the Jobs page when it finishes.")
+
+    if bank_pdf and run_in_background:
+        if st.button("🚀 Process & Generate Excel", key="bank_submit_btn"):
+            submit_job("bank", {
+                "rules": rules_df if rules else None,
+                "file_name": f"AL_Habib_Extracted_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+            }, label=f"Bank statement {bank_pdf.name}", links={"input_path": stored_upload(bank_pdf)})
+    elif bank_pdf:
+        trace = perf_trace("bank")
+        # Extract once per uploaded file, not on every rerun of this page
+        if st.session_state.get("bank_pdf_id") != bank_pdf.file_id:
+            with st.spinner("Step 1: Reading PDF data..."), heavy_run("bank", bank_pdf.size / 2**20), trace, span("ingest"):
+                st.session_state.bank_pdf_text = extract_text_from_pdf(stored_upload(bank_pdf))
+                st.session_state.bank_pdf_id = bank_pdf.file_id
+        raw_content = st.session_state.bank_pdf_text
         
         if st.button("🚀 Process & Generate Excel", key="bank_process_btn"):
             with st.spinner("Step 2: Executing Intelligent Parsing..."):
-                bank_data = parse_bank_statement(raw_content)
+                with trace, span("compute"):
+                    bank_data = parse_bank_statement(raw_content)
                 if not bank_data:
                     st.error("No valid transaction patterns found. Please check if the PDF is a standard Bank AL Habib statement.")
                 else:
-                    bank_df = pd.DataFrame(bank_data)
-                    bank_df = bank_df[~bank_df['Details'].str.contains("Closing Balance", na=False)]
+                    bank_df = statement_frame(bank_data)
+                    if rules:
+                        with trace, span("compute"):
+                            bank_df = bank_df.assign(Category=categorize(bank_df, rules))
                     
                     st.markdown(f'<div class="status-card">✅ <b>Statement Analyzed:</b> Found <b>{len(bank_df)}</b> valid rows including balance checkpoints.</div>', unsafe_allow_html=True)
                     st.write("### Data Preview")
                     st.dataframe(bank_df.head(100), use_container_width=True)
+                    if rules:
+                        with st.expander("Totals by Category"):
+                            st.dataframe(bank_df.groupby("Category")[["Debit", "Credit"]].agg(["count", "sum"]), use_container_width=True)
                     
-                    bank_excel_file = generate_bank_excel(bank_df)
+                    with trace, span("serialize"):
+                        bank_excel_file = generate_bank_excel(bank_df)
                     st.download_button(
                         label="💾 Download Structured Excel File",
-                        data=bank_excel_file,
+                        data=deferred_download(bank_excel_file),
                         file_name=f"AL_Habib_Extracted_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        on_click="ignore"
                     )
-
-# --- TAB 4: TAX CALCULATOR ---
-with tab4:
-    st.subheader("🇵🇰 Pakistan Salary Tax Calculator (2025-2026)")
-    st.markdown("Accurate tax calculation based on **FBR Slabs for Salaried Individuals (Tax Year 2025-26)**.")
+                    show_perf_panel(trace)
+
+# --- PAGE 4: TAX CALCULATOR ---
+def tax_page():
+    from nfp.instrument import span
+    from nfp.payroll import build_payroll_register, generate_register_excel
+    from nfp.schema import NET_SALARY_COLUMNS, SALARY_COLUMNS, SchemaError, normalize_frame
+    from nfp.tax import (DEFAULT_TAX_YEAR, TAX_TABLES, build_gross_up_register, build_tax_register, calculate_fbr_tax,
+                         calculate_gross_for_net)
+
+    st.subheader("🇵🇰 Pakistan Salary Tax Calculator")
+    tax_years = list(TAX_TABLES)
+    tax_year = st.selectbox("Tax Year", tax_years, index=tax_years.index(DEFAULT_TAX_YEAR), key="tax_year")
+    st.markdown(f"Accurate tax calculation based on **FBR Slabs for Salaried Individuals (Tax Year {tax_year})**.")
     
-    c1, c2 = st.columns(2)
-    with c1:
-        monthly_salary = st.number_input("Enter Monthly Gross Salary (PKR)", value=100000, step=5000, format="%d")
-    
-    annual_inc, annual_tax, monthly_tax = calculate_fbr_tax(monthly_salary)
-    net_salary = monthly_salary - monthly_tax
-    
-    st.divider()
-    res_col1, res_col2, res_col3 = st.columns(3)
-    with res_col1:
-        st.metric(label="Annual Tax", value=f"{annual_tax:,.0f}")
-    with res_col2:
-        st.metric(label="Monthly Tax Deduction", value=f"{monthly_tax:,.0f}")
-    with res_col3:
-        st.metric(label="Net Monthly Salary", value=f"{net_salary:,.0f}")
-
-    st.caption("Note: Calculations are based on provided FBR Salary Slabs for Tax Year 2025-26. Rebates or adjustments are not included.")
-
-# --- TAB 5: BLOG ---
-with tab5:
+    tax_mode = st.radio("Mode", ["Single Employee", "Batch (Salary Roster)", "Net to Gross", "Payroll Register (from Attendance)"], horizontal=True, key="tax_mode")
+
+    if tax_mode == "Single Employee":
+        c1, c2 = st.columns(2)
+        with c1:
+            monthly_salary = st.number_input("Enter Monthly Gross Salary (PKR)", value=100000, step=5000, format="%d")
+        
+        annual_inc, annual_tax, monthly_tax = calculate_fbr_tax(monthly_salary, tax_year)
+        net_salary = monthly_salary - monthly_tax
+        
+        st.divider()
+        res_col1, res_col2, res_col3 = st.columns(3)
+        with res_col1:
+            st.metric(label="Annual Tax", value=f"{annual_tax:,.0f}")
+        with res_col2:
+            st.metric(label="Monthly Tax Deduction", value=f"{monthly_tax:,.0f}")
+        with res_col3:
+            st.metric(label="Net Monthly Salary", value=f"{net_salary:,.0f}")
+    elif tax_mode == "Batch (Salary Roster)":
+        st.info("Upload a salary roster with columns `CODE`, `NAME` and `Monthly Gross Salary` to calculate tax for every employee at once.")
+        salary_file = st.file_uploader("Upload Salary Roster", type=['xlsx'], key="tax_roster_uploader")
+
+        if salary_file is not None:
+            trace = perf_trace("tax")
+            try:
+                with trace:
+                    with span("ingest"):
+                        roster_df = normalize_frame(read_upload(salary_file), SALARY_COLUMNS, title="Salary roster")
+                    with span("compute"):
+                        tax_df = build_tax_register(roster_df, tax_year)
+                    with span("serialize"):
+                        tax_excel = generate_register_excel(tax_df, 'Tax Register')
+
+                st.divider()
+                res_col1, res_col2, res_col3 = st.columns(3)
+                with res_col1:
+                    st.metric(label="Employees", value=f"{len(tax_df):,}")
+                with res_col2:
+                    st.metric(label="Total Monthly Tax", value=f"{tax_df['Monthly Tax'].sum():,.0f}")
+                with res_col3:
+                    st.metric(label="Total Net Payroll", value=f"{tax_df['Net Monthly Salary'].sum():,.0f}")
+
+                st.dataframe(tax_df.head(100), use_container_width=True)
+                st.download_button(
+                    label="📥 Download Tax Register (Excel)",
+                    data=deferred_download(tax_excel),
+                    file_name=f"NFP_Tax_Register_{tax_year}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    on_click="ignore"
+                )
+                show_perf_panel(trace)
+            except SchemaError as e:
+                st.error(e.report())
+            except Exception as e:
+                st.error(f"Error processing file: {e}")
+
+    elif tax_mode == "Net to Gross":
+        gross_up_mode = st.radio("Input", ["Single Salary", "Batch (Grade Table)"], horizontal=True, key="gross_up_mode")
+        if gross_up_mode == "Single Salary":
+            c1, c2 = st.columns(2)
+            with c1:
+                target_net = st.number_input("Enter Target Net Monthly Salary (PKR)", value=100000, step=5000, format="%d")
+
+            gross_salary = calculate_gross_for_net(target_net, tax_year)
+            annual_inc, annual_tax, monthly_tax = calculate_fbr_tax(gross_salary, tax_year)
+
+            st.divider()
+            res_col1, res_col2, res_col3 = st.columns(3)
+            with res_col1:
+                st.metric(label="Monthly Gross Salary", value=f"{gross_salary:,.2f}")
+            with res_col2:
+                st.metric(label="Monthly Tax Deduction", value=f"{monthly_tax:,.2f}")
+            with res_col3:
+                st.metric(label="Annual Tax", value=f"{annual_tax:,.0f}")
+        else:
+            st.info("Upload a grade table or roster with columns `CODE`, `NAME` and `Target Net Salary` to find the gross salary for each row.")
+            net_file = st.file_uploader("Upload Target Net Salaries", type=['xlsx'], key="gross_up_uploader")
+
+            if net_file is not None:
+                trace = perf_trace("gross_up")
+                try:
+                    with trace:
+                        with span("ingest"):
+                            net_df = normalize_frame(read_upload(net_file), NET_SALARY_COLUMNS, title="Target net salaries")
+                        with span("compute"):
+                            gross_df = build_gross_up_register(net_df, tax_year)
+                        with span("serialize"):
+                            gross_excel = generate_register_excel(gross_df, 'Gross-up Register')
+
+                    st.divider()
+                    res_col1, res_col2, res_col3 = st.columns(3)
+                    with res_col1:
+                        st.metric(label="Rows", value=f"{len(gross_df):,}")
+                    with res_col2:
+                        st.metric(label="Total Monthly Gross", value=f"{gross_df['Monthly Gross Salary'].sum():,.0f}")
+                    with res_col3:
+                        st.metric(label="Total Monthly Tax", value=f"{gross_df['Monthly Tax'].sum():,.0f}")
+
+                    st.dataframe(gross_df.head(100), use_container_width=True)
+                    st.download_button(
+                        label="📥 Download Gross-up Register (Excel)",
+                        data=deferred_download(gross_excel),
+                        file_name=f"NFP_Gross_Up_{tax_year}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        on_click="ignore"
+                    )
+                    show_perf_panel(trace)
+                except SchemaError as e:
+                    st.error(e.report())
+                except Exception as e:
+                    st.error(f"Error processing file: {e}")
+
+    else:
+        attendance_run = st.session_state.get("attendance_run")
+        if not attendance_run:
+            st.info("Generate an attendance report on the **Attendance Generator** page first. Its present days, absences and OT hours are used here directly.")
+        else:
+            st.info(f"Using attendance for **{attendance_run['period']}** ({len(attendance_run['summary'])} employees). Upload the salary roster (`CODE`, `Monthly Gross Salary`) to build the payroll register.")
+            col_p1, col_p2 = st.columns(2)
+            with col_p1:
+                ot_multiplier = st.number_input("OT Rate Multiplier", value=2.0, min_value=1.0, step=0.5)
+            with col_p2:
+                working_day_basis = st.number_input("Working Days Basis (Hourly Rate)", value=26, min_value=1, max_value=31)
+            payroll_file = st.file_uploader("Upload Salary Roster", type=['xlsx'], key="payroll_roster_uploader")
+
+            if payroll_file is not None:
+                trace = perf_trace("payroll")
+                try:
+                    with trace:
+                        with span("ingest"):
+                            roster_df = normalize_frame(read_upload(payroll_file), SALARY_COLUMNS, title="Salary roster")
+                        with span("compute"):
+                            payroll_df, missing_codes = build_payroll_register(
+                                attendance_run["summary"], roster_df, attendance_run["std_hours"],
+                                tax_year=tax_year, ot_multiplier=ot_multiplier, working_day_basis=working_day_basis
+                            )
+                        with span("serialize"):
+                            payroll_excel = generate_register_excel(payroll_df, 'Payroll Register')
+                    if missing_codes:
+                        st.warning(f"No salary found for {len(missing_codes)} employee(s): {', '.join(map(str, missing_codes[:20]))}")
+
+                    st.divider()
+                    res_col1, res_col2, res_col3 = st.columns(3)
+                    with res_col1:
+                        st.metric(label="Total Gross Pay", value=f"{payroll_df['Gross Pay'].sum():,.0f}")
+                    with res_col2:
+                        st.metric(label="Total Income Tax", value=f"{payroll_df['Income Tax'].sum():,.0f}")
+                    with res_col3:
+                        st.metric(label="Total Net Pay", value=f"{payroll_df['Net Pay'].sum():,.0f}")
+
+                    st.dataframe(payroll_df.head(100), use_container_width=True)
+                    st.download_button(
+                        label="📥 Download Payroll Register (Excel)",
+                        data=deferred_download(payroll_excel),
+                        file_name=f"NFP_Payroll_{attendance_run['period'].replace(' ', '_')}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        on_click="ignore"
+                    )
+                    show_perf_panel(trace)
+                except SchemaError as e:
+                    st.error(e.report())
+                except Exception as e:
+                    st.error(f"Error processing file: {e}")
+
+    st.caption(f"Note: Calculations are based on provided FBR Salary Slabs for Tax Year {tax_year}. Rebates or adjustments are not included.")
+
+# --- JOBS PAGE ---
+def jobs_page():
+    import pathlib
+    from nfp.jobs import DONE, FAILED, FINISHED, QUEUED
+
+    st.subheader("📋 Background Jobs")
+    runner = job_runner()
+    runner.ensure()
+    st.info(f"Runs submitted with **Run in background** are processed here, at most {runner.workers} at a time across all users. Finished files stay available for 24 hours.")
+    lookup = st.text_input("Find a job by ID", key="job_lookup", placeholder="Paste a job ID from another session")
+
+    def job_list():
+        jobs = runner.store.list(owner=st.session_state.get("job_owner", ""))
+        if lookup and not any(job["id"] == lookup.strip() for job in jobs):
+            found = runner.store.get(lookup.strip())
+            if found:
+                jobs.insert(0, found)
+            else:
+                st.warning("No job with that ID.")
+        return jobs
+
+    def show_jobs():
+        jobs = job_list()
+        if not jobs:
+            st.caption("No jobs yet.")
+            return
+        for job in jobs:
+            with st.container(border=True):
+                col_j1, col_j2 = st.columns([3, 1])
+                with col_j1:
+                    st.markdown(f"**{job['label']}**  \n`{job['id']}` · submitted {datetime.datetime.fromtimestamp(job['created']).strftime('%d-%b %H:%M:%S')}")
+                with col_j2:
+                    st.markdown(f"**{job['status'].title()}**")
+                if job["status"] not in FINISHED:
+                    st.progress(job["progress"], text="Waiting for a free worker..." if job["status"] == QUEUED else f"{job['progress']:.0%}")
+                    if job["status"] == QUEUED and st.button("Cancel", key=f"cancel_{job['id']}"):
+                        runner.store.cancel(job["id"])
+                        st.rerun()
+                elif job["status"] == FAILED:
+                    st.error(job["error"])
+                elif job["status"] == DONE:
+                    payroll_ready = job["kind"] in ("attendance", "attendance_punches")
+                    cols = st.columns(len(job["artifacts"]) + payroll_ready)
+                    for col, artifact in zip(cols, job["artifacts"]):
+                        path = runner.store.artifact_path(job["id"], artifact["name"])
+                        with col:
+                            # Read from disk on click; polling reruns don't load the file
+                            st.download_button(f"📥 {artifact['name']}", data=pathlib.Path(path).read_bytes,
+                                               file_name=artifact["name"], mime=artifact["mime"],
+                                               key=f"dl_{job['id']}_{artifact['name']}", on_click="ignore")
+                    if payroll_ready:
+                        with cols[-1]:
+                            if st.button("Use for Payroll Register", key=f"use_{job['id']}"):
+                                st.session_state.attendance_run = runner.store.load_result(job["id"])
+                                st.success("Attendance loaded for the Payroll Calculator.")
+        if not any(job["status"] not in FINISHED for job in jobs) and st.session_state.get("jobs_polling"):
+            # Everything finished: stop the auto-refresh with one full rerun
+            st.session_state.jobs_polling = False
+            st.rerun()
+
+    st.session_state.jobs_polling = any(job["status"] not in FINISHED for job in job_list())
+    st.fragment(show_jobs, run_every=2 if st.session_state.jobs_polling else None)()
+
+    counts = runner.store.counts()
+    if counts:
+        st.caption("Queue: " + " · ".join(f"{status.title()} {n}" for status, n in counts.items()))
+
+# --- PAGE 5: BLOG ---
+def blog_page():
     st.subheader("📰 NFP Financial Insights")
     st.write("Welcome to the NazeerFinPro blog. Here we share insights on financial management and automation.")
     
@@ -1278,17 +1020,17 @@ with tab5:
         st.write("Why your stakeholders ignore your spreadsheets and how to fix it with dashboards...")
         st.button("Read More", key="b2")
 
-# --- TAB 6: CONTACT ---
-with tab6:
+# --- PAGE 6: CONTACT ---
+def contact_page():
     st.subheader("🤝 Work with NazeerFinPro")
     st.write("Ready to automate your financial processes? Let's connect.")
     
     c1, c2 = st.columns([1, 2])
     with c1:
-        try:
-            profile = PILImage.open("Nazeer Fin Pro - NFP.jpg") 
+        profile = load_image("Nazeer Fin Pro - NFP.jpg")
+        if profile:
             st.image(profile, width=200)
-        except:
+        else:
             st.info("[Profile Photo Placeholder]")
     with c2:
         st.markdown("""
@@ -1320,5 +1062,16 @@ with tab6:
             else:
                 st.warning("⚠️ Please write a message first.")
 
+pages = st.navigation([
+    st.Page(attendance_page, title="Attendance Generator", icon="🏢", url_path="attendance", default=True),
+    st.Page(invoice_page, title="Invoice Maker", icon="🧾", url_path="invoices"),
+    st.Page(bank_page, title="Bank Converter", icon="🏦", url_path="bank"),
+    st.Page(tax_page, title="Payroll Calculator", icon="🧮", url_path="payroll"),
+    st.Page(jobs_page, title="Jobs", icon="📋", url_path="jobs"),
+    st.Page(blog_page, title="Consultancy Blog", icon="📝", url_path="blog"),
+    st.Page(contact_page, title="Contact NFP", icon="📞", url_path="contact"),
+], position="top")
+pages.run()
+
 # Footer
 st.markdown(f"<div class='footer'>© 2025 {BRAND_NAME}. All Rights Reserved. Powered by Python & Streamlit.</div>", unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1 @@
+"""Benchmarks for the NFP Tool Suite engines (see benchmarks/run.py)."""
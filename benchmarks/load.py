@@ -0,0 +1,85 @@
+"""Multi-session load test: several users starting heavy tools at once in one process.
+
+Each simulated session is a thread, as Streamlit runs each session's script
+in its own thread of the same server process. Every session generates an
+attendance workbook through the shared admission governor (or straight
+through with --no-governor) and the run reports how long sessions queued,
+how many ran at once and the process's peak RSS.
+
+Usage (from the repository root; run each variant in a fresh process, since
+peak RSS is a process-lifetime maximum):
+    python -m benchmarks.load --sessions 8 --employees 1000
+    python -m benchmarks.load --sessions 8 --employees 1000 --no-governor
+    python -m benchmarks.load --sessions 8 --employees 1000 --max-runs 1 --budget-mb 400
+"""
+import argparse
+import resource
+import sys
+import threading
+import time
+
+from benchmarks import synthetic
+from benchmarks.run import HOLIDAYS, STD_SHIFT
+from nfp.attendance import generate_attendance_file
+from nfp.governor import Governor, estimate_cost
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KiB elsewhere
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NFP multi-session load test")
+    parser.add_argument("--sessions", type=int, default=6)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--budget-mb", type=int, default=None, help="governor budget (default NFP_HEAVY_BUDGET_MB or 1024)")
+    parser.add_argument("--max-runs", type=int, default=None, help="governor concurrency (default NFP_HEAVY_MAX_RUNS or 2)")
+    parser.add_argument("--no-governor", action="store_true", help="start every session at once")
+    args = parser.parse_args()
+
+    governor = None if args.no_governor else Governor(args.budget_mb, args.max_runs)
+    roster = synthetic.make_roster(args.employees)
+    cost = estimate_cost("attendance", args.employees)
+    lock = threading.Lock()
+    active, peak_active, results = [0], [0], []
+
+    def session(i):
+        queued_at = time.perf_counter()
+        waits = []
+
+        def run():
+            started = time.perf_counter()
+            with lock:
+                active[0] += 1
+                peak_active[0] = max(peak_active[0], active[0])
+            output, _ = generate_attendance_file(roster, 2, 2026, HOLIDAYS, "ABC COMPANY", STD_SHIFT)
+            output.close()
+            with lock:
+                active[0] -= 1
+                results.append((i, started - queued_at, time.perf_counter() - started, max(waits, default=0)))
+
+        if governor is None:
+            run()
+        else:
+            with governor.admit("attendance", cost, on_wait=lambda position, running: waits.append(position)):
+                run()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    mode = "no governor" if governor is None else f"governor: {governor.max_runs} runs / {governor.budget_mb} MB"
+    print(f"{args.sessions} sessions x {args.employees} employees ({mode}, est. {cost:.0f} MB per run)")
+    print(f"{'session':>8} {'queued s':>9} {'run s':>8} {'queue pos':>10}")
+    for i, queued, ran, place in sorted(results):
+        print(f"{i:>8} {queued:>9.2f} {ran:>8.2f} {place:>10}")
+    print(f"wall {wall:.2f}s, peak concurrent runs {peak_active[0]}, peak RSS {_peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
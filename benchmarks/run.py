@@ -0,0 +1,189 @@
+"""Benchmark runner: time, peak memory and throughput per tool at several sizes.
+
+Usage (from the repository root):
+    python -m benchmarks.run                          # all tools, small+medium
+    python -m benchmarks.run --sizes small,medium,large --out bench.json
+    python -m benchmarks.run --tools attendance,tax --compare old.json
+
+Peak memory is the tracemalloc peak of Python allocations during the call
+(the generators are pure Python/pandas, so this tracks their working set).
+Results are written as JSON so runs from different versions can be diffed.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks import synthetic
+from nfp.attendance import generate_attendance_file, generate_attendance_from_punches
+from nfp.bank import (DEFAULT_RULES, categorize, compile_rules, extract_text_from_pdf, generate_bank_excel,
+                      parse_bank_statement, statement_frame)
+from nfp.invoices import generate_excel_invoice, generate_html_invoice
+from nfp.tax import calculate_fbr_tax, calculate_fbr_tax_batch, calculate_gross_for_net_batch
+
+HEADER_INFO = {"company_name": "NFP Benchmarks", "address": "Plot No. 123, S.I.T.E, Karachi, Pakistan.",
+               "phone": "00923333126614", "email": "nfp@gmail.com", "web": "www.nfp.com", "ntn": "N123456-7"}
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+HOLIDAYS = {datetime.date(2026, 2, 5): "Kashmir Day"}
+
+
+def _attendance(n):
+    roster = synthetic.make_roster(n)
+    return n, "employees", lambda: generate_attendance_file(roster, 2, 2026, HOLIDAYS, "ABC COMPANY", STD_SHIFT)
+
+
+def _attendance_cells(n):
+    roster = synthetic.make_roster(n)
+    return n, "employees", lambda: generate_attendance_file(roster, 2, 2026, HOLIDAYS, "ABC COMPANY", STD_SHIFT, render="cells")
+
+
+def _attendance_punches(n):
+    log = synthetic.make_punch_log(n)
+    return len(log), "punches", lambda: generate_attendance_from_punches(log, 2, 2026, HOLIDAYS, "ABC COMPANY", STD_SHIFT)
+
+
+def _invoice_html(n):
+    sales = synthetic.make_sales_register(n, 6)
+    return n, "invoices", lambda: generate_html_invoice(sales, HEADER_INFO, 18.0)
+
+
+def _invoice_excel(n):
+    sales = synthetic.make_sales_register(n, 6)
+    return n, "invoices", lambda: generate_excel_invoice(sales, HEADER_INFO, 18.0)
+
+
+def _bank_pdf(n):
+    path = synthetic.make_statement_pdf(os.path.join(tempfile.mkdtemp(prefix="nfp-bench-"), "statement.pdf"), n)
+    return n, "pages", lambda: extract_text_from_pdf(path)
+
+
+def _bank_parse(n):
+    text = synthetic.make_statement_text(n)
+    return n, "pages", lambda: parse_bank_statement(text)
+
+
+def _bank_excel(n):
+    import pandas as pd
+    df = pd.DataFrame(parse_bank_statement(synthetic.make_statement_text(n)))
+    return n, "pages", lambda: generate_bank_excel(df)
+
+
+def _bank_categorize(n):
+    df = statement_frame(parse_bank_statement(synthetic.make_statement_text(n // 40)))
+    rules = compile_rules(DEFAULT_RULES)
+    return len(df), "transactions", lambda: categorize(df, rules)
+
+
+def _tax_scalar(n):
+    salaries = np.random.default_rng(0).uniform(30000, 1500000, n).tolist()
+    return n, "salaries", lambda: [calculate_fbr_tax(s) for s in salaries]
+
+
+def _tax_batch(n):
+    salaries = np.random.default_rng(0).uniform(30000, 1500000, n)
+    return n, "salaries", lambda: calculate_fbr_tax_batch(salaries)
+
+
+def _tax_gross_up(n):
+    targets = np.random.default_rng(0).uniform(30000, 1500000, n)
+    return n, "salaries", lambda: calculate_gross_for_net_batch(targets)
+
+
+# tool -> (workload factory, {size: n})
+WORKLOADS = {
+    "attendance": (_attendance, {"small": 50, "medium": 500, "large": 3000}),
+    "attendance_cells": (_attendance_cells, {"small": 50, "medium": 500, "large": 3000}),
+    "attendance_punches": (_attendance_punches, {"small": 50, "medium": 500, "large": 3000}),
+    "invoice_html": (_invoice_html, {"small": 10, "medium": 200, "large": 2000}),
+    "invoice_excel": (_invoice_excel, {"small": 10, "medium": 200, "large": 2000}),
+    "bank_pdf": (_bank_pdf, {"small": 5, "medium": 50, "large": 1000}),
+    "bank_parse": (_bank_parse, {"small": 5, "medium": 100, "large": 500}),
+    "bank_excel": (_bank_excel, {"small": 5, "medium": 100, "large": 500}),
+    "bank_categorize": (_bank_categorize, {"small": 10_000, "medium": 100_000, "large": 1_000_000}),
+    "tax_scalar": (_tax_scalar, {"small": 10_000, "medium": 100_000, "large": 1_000_000}),
+    "tax_batch": (_tax_batch, {"small": 10_000, "medium": 1_000_000, "large": 10_000_000}),
+    "tax_gross_up": (_tax_gross_up, {"small": 10_000, "medium": 1_000_000, "large": 10_000_000}),
+}
+
+
+def run_one(tool, size, seed=0, memory=True):
+    """Times one workload, then (optionally) repeats it under tracemalloc for the peak.
+
+    The two passes are separate because tracemalloc slows allocation-heavy
+    code several-fold and would distort the timings.
+    """
+    factory, sizes = WORKLOADS[tool]
+    n, unit, job = factory(sizes[size])
+    random.seed(seed)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    job()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    peak = None
+    if memory:
+        random.seed(seed)
+        tracemalloc.start()
+        job()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"tool": tool, "size": size, "n": n, "unit": unit,
+            "wall_s": round(wall, 4), "cpu_s": round(cpu, 4),
+            "peak_mb": round(peak / 2**20, 2) if peak is not None else None,
+            "throughput": round(n / wall, 1) if wall else None}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NFP Tool Suite benchmarks")
+    parser.add_argument("--tools", default=",".join(WORKLOADS), help="comma-separated subset of: " + ", ".join(WORKLOADS))
+    parser.add_argument("--sizes", default="small,medium", help="comma-separated subset of small, medium, large")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass (faster)")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="previous results JSON to show the change against")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = {(r["tool"], r["size"]): r for r in json.load(f)["results"]}
+
+    results = []
+    print(f"{'tool':<20}{'size':<8}{'n':>10} {'wall s':>9} {'cpu s':>9} {'peak MB':>9} {'per s':>12}")
+    for tool in args.tools.split(","):
+        for size in args.sizes.split(","):
+            r = run_one(tool, size, args.seed, memory=not args.no_memory)
+            results.append(r)
+            line = f"{tool:<20}{size:<8}{r['n']:>10,} {r['wall_s']:>9.3f} {r['cpu_s']:>9.3f} {r['peak_mb'] if r['peak_mb'] is not None else float('nan'):>9.1f} {r['throughput']:>12,.0f}"
+            old = previous.get((tool, size))
+            if old and old["wall_s"]:
+                line += f"   ({r['wall_s'] / old['wall_s'] - 1:+.0%} vs baseline)"
+            print(line, flush=True)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Cold-start import cost of the app shell and of each tool.
+
+Every measurement runs in a fresh interpreter with `python -X importtime`.
+The shell is what app.py imports at module level (Streamlit); each tool line
+is the extra time to import that tool's engine on top of the shell, i.e. what
+a user pays the first time they open the page.
+
+Usage:
+    python benchmarks/startup.py                       # report
+    python benchmarks/startup.py --save startup.json   # record a baseline
+    python benchmarks/startup.py --baseline startup.json --tolerance 0.3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SHELL = ["streamlit"]
+TOOLS = {
+    "attendance": ["nfp.attendance"],
+    "invoices": ["nfp.invoices"],
+    "bank": ["nfp.bank"],
+    "tax/payroll": ["nfp.tax", "nfp.payroll"],
+}
+
+
+def _import_profile(modules):
+    """Runs one fresh interpreter; returns [(self_us, cumulative_us, indent, name)]."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cum_us), len(name) - len(name.lstrip()), name.strip()))
+    return rows
+
+
+def measure(tool_modules, repeat):
+    """Best-of-`repeat` milliseconds spent importing `tool_modules` after the shell."""
+    best_ms, best_top = None, []
+    for _ in range(repeat):
+        rows = _import_profile(SHELL + tool_modules)
+        # Everything after the shell's last top-level import line belongs to the tool
+        shell_end = max(i for i, r in enumerate(rows) if r[3] in SHELL and r[2] == 1)
+        if not tool_modules:
+            tool_rows = rows[:shell_end + 1]
+        else:
+            tool_rows = rows[shell_end + 1:]
+        total_ms = sum(r[0] for r in tool_rows) / 1000
+        if best_ms is None or total_ms < best_ms:
+            packages = [r for r in tool_rows if "." not in r[3] and not r[3].startswith("_")]
+            top = sorted(packages, key=lambda r: -r[1])[:4]
+            best_ms, best_top = total_ms, [(r[3], r[1] / 1000) for r in top]
+    return best_ms, best_top
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the NFP Tool Suite")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a JSON file written with --save")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown vs baseline (0.3 = +30%%)")
+    args = parser.parse_args()
+
+    results = {}
+    for label, modules in [("shell", [])] + list(TOOLS.items()):
+        ms, top = measure(modules, args.repeat)
+        results[label] = round(ms, 1)
+        heaviest = ", ".join(f"{name} {t:.0f}ms" for name, t in top)
+        print(f"{label:<12} {ms:8.1f} ms   heaviest: {heaviest}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failed = [k for k, v in results.items() if k in baseline and v > baseline[k] * (1 + args.tolerance)]
+        for k in failed:
+            print(f"REGRESSION: {k} {results[k]} ms vs baseline {baseline[k]} ms")
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
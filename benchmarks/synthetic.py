@@ -0,0 +1,171 @@
+"""Seeded synthetic inputs shaped like the real uploads.
+
+Every generator takes a `seed` so two runs (or two versions of the code)
+benchmark exactly the same workload.
+"""
+import datetime
+import random
+
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = ["Khurram", "Fayaz", "Hassnain", "Shahid", "Mehmood", "Ayesha", "Bilal", "Sana",
+               "Imran", "Zainab", "Usman", "Hira", "Kashif", "Nadia", "Tariq", "Rabia"]
+ITEMS = ["Plastic Buttons, 20mm (10 Gross/Box)", 'Dyed Polyester Fabric, Navy Blue, 58"',
+         "Finished Trousers, Khaki, Size 34", "Cotton Yarn 20/1", "Zipper Nylon #5, Black",
+         "Woven Label, Printed", "Denim Fabric 12oz, Indigo", "Polo Shirt, Pique, White"]
+UOMS = ["Gross", "Meters", "Pcs", "Kg", "Dozen"]
+CUSTOMERS = [("Karachi Garments Ltd.", "Plot B-54, S.I.T.E Area, Karachi, Pakistan.", "1234567-8"),
+             ("Lahore Textiles (Pvt) Ltd.", "21-KM Ferozepur Road, Lahore, Pakistan.", "2345678-9"),
+             ("Faisalabad Weaving Co.", "Jhang Road, Faisalabad, Pakistan.", "3456789-0")]
+NARRATIONS = ["IBFT TRANSFER FROM", "CHEQUE DEPOSIT", "ONLINE FUNDS TRANSFER TO", "ATM CASH WITHDRAWAL",
+              "SALARY CREDIT", "UTILITY BILL PAYMENT K-ELECTRIC", "POS PURCHASE", "INTER BRANCH CREDIT"]
+
+
+def make_roster(n_employees, seed=0, target_year=2026, target_month=2):
+    """Attendance roster in the data.xlsx layout, with a few New/Left employees."""
+    rng = np.random.default_rng(seed)
+    status = rng.choice(["", "", "", "", "", "", "", "", "New", "Left"], n_employees)
+    days = rng.integers(1, 28, n_employees)
+    dates = [datetime.datetime(target_year, target_month, int(d)) if s else pd.NaT for s, d in zip(status, days)]
+    return pd.DataFrame({
+        "S#": np.arange(1, n_employees + 1),
+        "CODE": np.arange(1000, 1000 + n_employees),
+        "NAME": [f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {i}" for i in range(n_employees)],
+        "ABSENT DAYS": rng.choice([np.nan, 0, 1, 2, 3], n_employees),
+        "Overtime Hours": rng.integers(0, 40, n_employees),
+        "STATUS": status,
+        "Date": dates,
+    })
+
+
+def make_punch_log(n_employees, target_year=2026, target_month=2, punches_per_day=4, seed=0):
+    """Raw biometric device log for `make_roster` codes: `punches_per_day` punches on every
+    Monday-Saturday, first around 09:00 and last around 18:00-20:00, with ~5% of days missed."""
+    rng = np.random.default_rng(seed)
+    n_days = (datetime.date(target_year + target_month // 12, target_month % 12 + 1, 1)
+              - datetime.date(target_year, target_month, 1)).days
+    days = pd.date_range(datetime.date(target_year, target_month, 1), periods=n_days)
+    days = days[days.dayofweek != 6]
+    codes = np.repeat(np.arange(1000, 1000 + n_employees), len(days))
+    day = np.tile(days.to_numpy(), n_employees)
+    worked = rng.random(len(day)) > 0.05
+    codes, day = codes[worked], day[worked]
+
+    arrive = 9 * 60 + rng.integers(-10, 20, len(day))
+    leave = 18 * 60 + rng.integers(0, 150, len(day))
+    minutes = np.linspace(arrive, leave, punches_per_day).T.astype(int) if punches_per_day > 1 else arrive[:, None]
+    stamps = day[:, None] + minutes.astype("timedelta64[m]")
+    order = rng.permutation(stamps.size)   # devices log punches in arrival order, not per employee
+    code_col = np.repeat(codes, punches_per_day)[order]
+    return pd.DataFrame({
+        "User ID": code_col,
+        "Name": [f"{FIRST_NAMES[(c - 1000) % len(FIRST_NAMES)]} {c - 1000}" for c in code_col],
+        "Date/Time": stamps.ravel()[order],
+    })
+
+
+def make_salary_roster(n_employees, seed=0):
+    """Salary roster matching `make_roster` codes."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "CODE": np.arange(1000, 1000 + n_employees),
+        "NAME": [f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {i}" for i in range(n_employees)],
+        "Monthly Gross Salary": rng.integers(37, 800, n_employees) * 1000,
+    })
+
+
+def make_sales_register(n_dcs, lines_per_dc, seed=0):
+    """Sales register in the sales_register.xlsx layout: `n_dcs` DCs x `lines_per_dc` lines."""
+    rng = random.Random(seed)
+    rows = []
+    for d in range(n_dcs):
+        customer, address, ntn = CUSTOMERS[d % len(CUSTOMERS)]
+        invoice_date = datetime.datetime(2025, 10, 1) + datetime.timedelta(days=d % 28)
+        for _ in range(lines_per_dc):
+            qty = rng.randint(1, 500)
+            price = rng.randint(50, 2000)
+            rows.append({
+                "DC No.": f"DC-{1000 + d}",
+                "Invoice No.": f"SI-2025-{1000 + d}",
+                "Invoice Date": invoice_date,
+                "Customer Name": customer,
+                "Bill To Address": address,
+                "Customer NTN": ntn,
+                "Credit Terms": rng.choice(["Credit 30", "Credit 45", "Cash"]),
+                "Item Description": rng.choice(ITEMS),
+                "H.S Code": rng.randint(1000, 9999),
+                "UOM": rng.choice(UOMS),
+                "Qty": qty,
+                "Unit Price (PKR)": price,
+                "Total Value (PKR)": qty * price,
+            })
+    return pd.DataFrame(rows)
+
+
+def make_statement_text(n_pages, lines_per_page=40, seed=0):
+    """Extracted text of a Bank AL Habib style statement with `n_pages` pages."""
+    rng = random.Random(seed)
+    balance = 500000.00
+    day = datetime.date(2025, 1, 1)
+    out = [f"{day:%d/%m/%Y} Opening Balance {balance:,.2f}"]
+    for page in range(1, n_pages + 1):
+        if page > 1:
+            out.append(f"Brought Forward {balance:,.2f}")
+        for i in range(lines_per_page):
+            if i % 5 == 0:
+                day += datetime.timedelta(days=1)
+            amount = round(rng.uniform(100, 250000), 2)
+            credit = rng.random() < 0.45 or balance < amount
+            balance = round(balance + amount if credit else balance - amount, 2)
+            instrument = f" {rng.randint(100000, 99999999)}" if rng.random() < 0.3 else ""
+            narration = rng.choice(NARRATIONS)
+            out.append(f"{day:%d/%m/%Y}{instrument} {narration} REF{rng.randint(1000, 9999)} {amount:,.2f} {balance:,.2f}")
+            if rng.random() < 0.3:
+                out.append(f"REF {rng.randint(10**9, 10**10)} {rng.choice(FIRST_NAMES).upper()} ENTERPRISES")
+        out.append(f"Carried Forward {balance:,.2f}")
+        out.append(f"Page {page} of {n_pages}")
+    out.append(f"Closing Balance {balance:,.2f}")
+    return "\n".join(out)
+
+
+def _pdf_text(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_statement_pdf(path, n_pages, lines_per_page=40, seed=0):
+    """Writes `make_statement_text` as a real text PDF (one statement page per PDF page) to `path`.
+
+    A minimal hand-built PDF (Helvetica, uncompressed content streams), so
+    extraction can be benchmarked without a PDF-writing dependency.
+    """
+    pages, current = [], []
+    for line in make_statement_text(n_pages, lines_per_page, seed).split("\n"):
+        current.append(line)
+        if line.startswith("Page "):
+            pages.append(current)
+            current = []
+    if current:
+        pages[-1].extend(current)
+
+    offsets = []
+    with open(path, "wb") as f:
+        def obj(body):
+            offsets.append(f.tell())
+            f.write(f"{len(offsets)} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+        obj(b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+        obj(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        for i, lines in enumerate(pages):
+            obj(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {5 + 2 * i} 0 R "
+                f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+            stream = ("BT /F1 8 Tf 10 TL 30 810 Td " + " ".join(f"({_pdf_text(line)}) Tj T*" for line in lines) + " ET").encode("latin-1")
+            obj(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+        xref = f.tell()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        f.write(b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets))
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return path
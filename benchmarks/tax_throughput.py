@@ -0,0 +1,43 @@
+"""Throughput check for the FBR tax engine.
+
+Usage: python benchmarks/tax_throughput.py [--n 5000000] [--year 2025-26]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nfp.tax import DEFAULT_TAX_YEAR, annual_tax, annual_tax_batch  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=5_000_000, help="number of incomes to evaluate")
+    parser.add_argument("--year", default=DEFAULT_TAX_YEAR)
+    args = parser.parse_args()
+
+    incomes = np.random.default_rng(42).uniform(0, 20_000_000, args.n)
+
+    start = time.perf_counter()
+    batch = annual_tax_batch(incomes, args.year)
+    batch_s = time.perf_counter() - start
+
+    sample = incomes[:min(args.n, 200_000)]
+    start = time.perf_counter()
+    scalar = [annual_tax(x, args.year) for x in sample]
+    scalar_s = time.perf_counter() - start
+
+    if not np.allclose(batch[:len(sample)], scalar):
+        sys.exit("batch and scalar results disagree")
+
+    print(f"tax year {args.year}")
+    print(f"batch : {args.n:>10,} incomes in {batch_s:.3f}s  ({args.n / batch_s:,.0f}/s)")
+    print(f"scalar: {len(sample):>10,} incomes in {scalar_s:.3f}s  ({len(sample) / scalar_s:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared engine code for the NFP Tool Suite (used by app.py)."""
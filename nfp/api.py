@@ -0,0 +1,315 @@
+"""HTTP API for the tool engines, for integrations that push files without the UI.
+
+An async Starlette app served by uvicorn. Uploads are the raw request body
+(the .xlsx or .pdf itself) and are streamed to disk in chunks, never held in
+memory whole; tool options go in the query string. Each upload becomes a job
+on the same queue the Streamlit Jobs page uses (`nfp.jobs`), run by this
+server's worker pool, and the finished files are streamed back from disk.
+
+    python -m nfp.api --port 8765 --workers 2
+
+    POST /jobs/attendance?month=2&year=2026&holiday=2026-02-05=Kashmir%20Day   body: data.xlsx
+    POST /jobs/attendance_records?month=2&year=2026&format=csv                  body: data.xlsx
+    POST /jobs/invoices?tax_rate=18&company_name=...                           body: sales_register.xlsx
+    POST /jobs/bank                                                            body: statement.pdf
+    POST /jobs/tax_register?tax_year=2025-26                                   body: salary roster .xlsx
+    GET  /jobs/{id}                      status, progress, error and artifact URLs
+    GET  /jobs/{id}/artifacts/{name}     download a finished file
+    DELETE /jobs/{id}                    cancel a queued job
+    GET  /tax?monthly_gross=100000&monthly_gross=250000&tax_year=2025-26
+
+Set `NFP_API_TOKEN` to require `Authorization: Bearer <token>` on every request.
+"""
+import argparse
+import calendar
+import datetime
+import math
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, JSONResponse
+from starlette.routing import Route
+
+from nfp.jobs import DONE, JobRunner
+
+MAX_UPLOAD_BYTES = int(os.environ.get("NFP_API_MAX_UPLOAD_MB", 200)) * 2**20
+
+UPLOAD_SUFFIX = {"attendance": ".xlsx", "attendance_records": ".xlsx", "invoices": ".xlsx", "tax_register": ".xlsx", "bank": ".pdf"}
+
+
+class BadRequest(ValueError):
+    """Invalid request; reported to the client with `status` (400 unless given)."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _error(status, message):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def _number(query, name, default, kind=float):
+    value = query.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return kind(value)
+    except ValueError:
+        raise BadRequest(f"'{name}' must be a number, got '{value}'") from None
+
+
+def _date(value, name):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"'{name}' must be a date (YYYY-MM-DD), got '{value}'") from None
+
+
+# --- JOB PARAMETERS FROM THE QUERY STRING ---
+# Defaults match the Streamlit pages.
+
+def _attendance_params(query):
+    today = datetime.date.today()
+    month = _number(query, "month", today.month, int)
+    year = _number(query, "year", today.year, int)
+    if not 1 <= month <= 12:
+        raise BadRequest("'month' must be between 1 and 12")
+
+    holidays = {}
+    for entry in query.getlist("holiday"):
+        day, _, name = entry.partition("=")
+        day = _date(day, "holiday")
+        if (day.year, day.month) == (year, month):
+            holidays[day] = f"{holidays[day]} / {name}" if day in holidays else (name or "Holiday")
+
+    std_shift = {"name": query.get("shift_name", "(0900:1800)"),
+                 "hours": _number(query, "std_hours", 9, int),
+                 "out_hour": _number(query, "out_hour", 18, int)}
+    sp_shift = None
+    if query.get("sp_start") and query.get("sp_end"):
+        sp_shift = {"start": _date(query["sp_start"], "sp_start"), "end": _date(query["sp_end"], "sp_end"),
+                    "name": query.get("sp_name", "(0900:1600)"),
+                    "hours": _number(query, "sp_hours", 7, int),
+                    "out_hour": _number(query, "sp_out_hour", 16, int)}
+
+    period = f"{calendar.month_name[month]} {year}"
+    return {"month": month, "year": year, "holidays": holidays,
+            "company_name": query.get("company_name", "ABC COMPANY"),
+            "std_shift": std_shift, "sp_shift": sp_shift, "period": period,
+            "file_name": f"NFP_Attendance_{period.replace(' ', '_')}.xlsx"}, f"Attendance {period}"
+
+
+def _attendance_records_params(query):
+    fmt = query.get("format", "parquet")
+    if fmt not in ("csv", "parquet"):
+        raise BadRequest("'format' must be 'csv' or 'parquet'")
+    params, label = _attendance_params(query)
+    params["fmt"] = fmt
+    params["file_name"] = params["file_name"].replace(".xlsx", f".{fmt}")
+    return params, f"{label} ({fmt})"
+
+
+def _invoice_params(query):
+    header_info = {
+        "company_name": query.get("company_name", "NazeerFinPro-NFP"),
+        "address": query.get("address", "Plot No. 123, S.I.T.E, Karachi, Pakistan."),
+        "phone": query.get("phone", "00923333126614"),
+        "email": query.get("email", "nfp@gmail.com"),
+        "web": query.get("web", "www.nfp.com"),
+        "ntn": query.get("ntn", "N123456-7"),
+    }
+    return {"header_info": header_info, "tax_rate": _number(query, "tax_rate", 18.0)}, "GST invoices"
+
+
+def _bank_params(query):
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M')
+    return {"file_name": f"AL_Habib_Extracted_{stamp}.xlsx"}, "Bank statement"
+
+
+def _tax_register_params(query):
+    from nfp.tax import DEFAULT_TAX_YEAR, get_tax_table
+    tax_year = query.get("tax_year", DEFAULT_TAX_YEAR)
+    try:
+        get_tax_table(tax_year)
+    except ValueError as e:
+        raise BadRequest(str(e)) from None
+    return {"tax_year": tax_year, "file_name": f"NFP_Tax_Register_{tax_year}.xlsx"}, f"Tax register {tax_year}"
+
+
+JOB_PARAMS = {
+    "attendance": _attendance_params,
+    "attendance_records": _attendance_records_params,
+    "invoices": _invoice_params,
+    "bank": _bank_params,
+    "tax_register": _tax_register_params,
+}
+
+
+# --- HANDLERS ---
+
+def _job_json(request, job):
+    return {
+        "id": job["id"], "kind": job["kind"], "label": job["label"], "status": job["status"],
+        "progress": job["progress"], "error": job["error"],
+        "artifacts": [{"name": a["name"], "mime": a["mime"], "size": a["size"],
+                       "url": str(request.url_for("artifact", job_id=job["id"], name=a["name"]))}
+                      for a in job["artifacts"]],
+    }
+
+
+async def _stream_to_file(request, suffix):
+    """Write the request body to a temp file chunk by chunk; returns its path."""
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=request.app.state.runner.store.root)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise BadRequest(f"Upload exceeds {MAX_UPLOAD_BYTES // 2**20} MB", status=413)
+                await run_in_threadpool(f.write, chunk)
+        if size == 0:
+            raise BadRequest("Empty upload: send the file as the request body")
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+async def submit_job(request):
+    kind = request.path_params["kind"]
+    if kind not in JOB_PARAMS:
+        return _error(404, f"Unknown job kind '{kind}'. Available: {', '.join(JOB_PARAMS)}")
+    try:
+        params, label = JOB_PARAMS[kind](request.query_params)
+        upload = await _stream_to_file(request, UPLOAD_SUFFIX[kind])
+    except BadRequest as e:
+        return _error(e.status, str(e))
+    store = request.app.state.runner.store
+    job_id = await run_in_threadpool(store.submit, kind, params, owner="api", label=label,
+                                     files={"input_path": upload})
+    job = await run_in_threadpool(store.get, job_id)
+    return JSONResponse(_job_json(request, job), status_code=202,
+                        headers={"Location": str(request.url_for("job", job_id=job_id))})
+
+
+async def job_status(request):
+    job = await run_in_threadpool(request.app.state.runner.store.get, request.path_params["job_id"])
+    if job is None:
+        return _error(404, "No such job")
+    return JSONResponse(_job_json(request, job))
+
+
+async def cancel_job(request):
+    store = request.app.state.runner.store
+    job_id = request.path_params["job_id"]
+    if await run_in_threadpool(store.get, job_id) is None:
+        return _error(404, "No such job")
+    if not await run_in_threadpool(store.cancel, job_id):
+        return _error(409, "Only queued jobs can be cancelled")
+    return JSONResponse(_job_json(request, await run_in_threadpool(store.get, job_id)))
+
+
+async def artifact(request):
+    store = request.app.state.runner.store
+    job = await run_in_threadpool(store.get, request.path_params["job_id"])
+    name = request.path_params["name"]
+    if job is None or job["status"] != DONE:
+        return _error(404, "No finished job with that ID")
+    match = next((a for a in job["artifacts"] if a["name"] == name), None)
+    if match is None:
+        return _error(404, f"Job has no artifact '{name}'")
+    return FileResponse(store.artifact_path(job["id"], name), media_type=match["mime"], filename=name)
+
+
+def _salary(value):
+    try:
+        gross = float(value)
+    except ValueError:
+        gross = math.nan
+    if not math.isfinite(gross) or gross < 0:   # float() accepts "nan" and "inf"
+        raise BadRequest(f"'monthly_gross' must be a non-negative number, got '{value}'")
+    return gross
+
+
+async def tax(request):
+    """Monthly FBR withholding for one or more salaries; cheap enough to answer inline."""
+    from nfp.tax import DEFAULT_TAX_YEAR, calculate_fbr_tax_batch, get_tax_table
+    tax_year = request.query_params.get("tax_year", DEFAULT_TAX_YEAR)
+    salaries = request.query_params.getlist("monthly_gross")
+    if not salaries:
+        return _error(400, "Pass at least one 'monthly_gross'")
+    try:
+        get_tax_table(tax_year)
+        gross = [_salary(s) for s in salaries]
+    except ValueError as e:
+        return _error(400, str(e))
+    annual_income, annual_tax, monthly_tax = calculate_fbr_tax_batch(gross, tax_year)
+    return JSONResponse({"tax_year": tax_year, "results": [
+        {"monthly_gross": g, "annual_income": float(a), "annual_tax": float(t),
+         "monthly_tax": float(m), "net_monthly_salary": g - float(m)}
+        for g, a, t, m in zip(gross, annual_income, annual_tax, monthly_tax)
+    ]})
+
+
+async def health(request):
+    runner = request.app.state.runner
+    return JSONResponse({"status": "ok", "workers": runner.workers,
+                         "queue": await run_in_threadpool(runner.store.counts)})
+
+
+class _TokenAuth:
+    """Rejects requests without `Authorization: Bearer <token>` (ASGI middleware)."""
+
+    def __init__(self, app, token):
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and dict(scope["headers"]).get(b"authorization") != self.expected:
+            await _error(401, "Missing or invalid API token")(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def create_app(root=None, workers=None, token=None):
+    """The ASGI app; starts its job worker pool on startup and stops it on shutdown."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.runner = await run_in_threadpool(JobRunner(root, workers).start)
+        try:
+            yield
+        finally:
+            await run_in_threadpool(app.state.runner.stop)
+
+    app = Starlette(routes=[
+        Route("/health", health),
+        Route("/tax", tax),
+        Route("/jobs/{kind}", submit_job, methods=["POST"]),
+        Route("/jobs/{job_id}", job_status, methods=["GET"], name="job"),
+        Route("/jobs/{job_id}", cancel_job, methods=["DELETE"]),
+        Route("/jobs/{job_id}/artifacts/{name}", artifact, name="artifact"),
+    ], lifespan=lifespan)
+    token = token or os.environ.get("NFP_API_TOKEN")
+    return _TokenAuth(app, token) if token else app
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="NFP Tool Suite HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="job worker processes (default: NFP_JOB_WORKERS or 2)")
+    parser.add_argument("--jobs-dir", default=None, help="job queue directory (default: NFP_JOBS_DIR or <tmp>/nfp_jobs)")
+    args = parser.parse_args(argv)
+    uvicorn.run(create_app(args.jobs_dir, args.workers), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
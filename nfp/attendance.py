@@ -0,0 +1,869 @@
+"""Attendance sheet generator: roster in, one styled sheet per employee out."""
+import datetime
+import multiprocessing
+import os
+import random
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles import Font, Border, Side, Alignment
+from openpyxl.utils import get_column_letter
+
+from nfp.fragments import content_key
+from nfp.instrument import span
+from nfp.schema import ATTENDANCE_COLUMNS, PUNCH_COLUMNS, code_key, normalize_frame
+from nfp.spool import rewind, spooled_output
+
+
+def create_natural_time(year, month, base_hour, is_arrival):
+    """Generates a natural-looking time string."""
+    if is_arrival:
+        minute = random.randint(-5, 10)
+    else:
+        minute = random.randint(0, 10)
+    
+    try:
+        base_time = datetime.datetime(year, month, 1, base_hour, 0)
+        final_time = base_time + datetime.timedelta(minutes=minute)
+        return final_time.strftime("%H:%M")
+    except ValueError:
+        return "00:00"
+
+def distribute_overtime(required_ot, num_working_days):
+    """Distributes required OT hours randomly among allowed working days."""
+    if num_working_days == 0:
+        return []
+        
+    ot_hours_list = [0] * num_working_days
+    hours_distributed = 0
+    
+    max_attempts = required_ot * 5 
+    attempts = 0
+    
+    while hours_distributed < required_ot and attempts < max_attempts:
+        attempts += 1
+        day_index = random.randint(0, num_working_days - 1)
+        ot_to_add = random.choice([1, 1, 2])
+        
+        if hours_distributed + ot_to_add > required_ot:
+            ot_to_add = required_ot - hours_distributed
+            
+        if ot_hours_list[day_index] < 2:
+           ot_to_add_today = min(ot_to_add, 2 - ot_hours_list[day_index])
+           ot_hours_list[day_index] += ot_to_add_today
+           hours_distributed += ot_to_add_today
+        
+        if all(ot >= 2 for ot in ot_hours_list):
+            if hours_distributed < required_ot:
+                remaining = required_ot - hours_distributed
+                for _ in range(remaining):
+                    day_index = random.randint(0, num_working_days - 1)
+                    ot_hours_list[day_index] += 1
+                hours_distributed = sum(ot_hours_list)
+            break
+            
+    return ot_hours_list
+
+def month_bounds(target_year, target_month):
+    """Returns (days in month, last date of month)."""
+    try:
+        next_month = datetime.date(target_year, target_month, 28) + datetime.timedelta(days=4)
+        last_day_of_month = next_month - datetime.timedelta(days=next_month.day)
+        return last_day_of_month.day, last_day_of_month
+    except ValueError:
+        return 30, datetime.date(target_year, target_month, 30)
+
+def attendance_styles():
+    """Fonts, borders and alignments shared by every sheet of one workbook."""
+    thin_side = Side(border_style='thin', color='000000')
+    return {
+        "title_font": Font(name='Calibri', size=14, bold=True),
+        "header_font": Font(name='Calibri', size=11, bold=True),
+        "normal_font": Font(name='Calibri', size=11),
+        "center_align": Alignment(horizontal='center', vertical='center'),
+        "right_align": Alignment(horizontal='right', vertical='center'),
+        "link_font": Font(name='Calibri', size=11, color="0000FF", underline="single"),
+        "thin_border": Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side),
+    }
+
+def active_period(employee, target_month, target_year):
+    """First and last day of the month the employee counts for, from their joining/leaving status."""
+    active_start_date = datetime.date(target_year, target_month, 1)
+    active_end_date = month_bounds(target_year, target_month)[1]
+
+    if pd.notna(employee.date): # Unparseable dates were coerced to NaT and are ignored
+        parsed_date = employee.date.date()
+        if employee.status == "New":
+            active_start_date = max(active_start_date, parsed_date)
+        elif employee.status == "Left":
+            active_end_date = min(active_end_date, parsed_date)
+    return active_start_date, active_end_date
+
+def compute_employee(employee, target_month, target_year, holidays_dict, std_shift, sp_shift=None):
+    """Computes one employee's month without touching Excel.
+
+    `employee` is a row of a roster normalized with ATTENDANCE_COLUMNS.
+    Returns a record with the day rows, the footer, the Index sheet row and
+    the payroll summary row.
+    """
+    def is_special(date_obj):
+        """Checks if a given date falls within the special shift date range."""
+        if not sp_shift: return False
+        return sp_shift["start"] <= date_obj <= sp_shift["end"]
+
+    req_ot = employee.ot_hours
+    num_absent = employee.absent_days
+    
+    num_days_in_month = month_bounds(target_year, target_month)[0]
+    active_start_date, active_end_date = active_period(employee, target_month, target_year)
+        
+    working_days_in_month = []
+    full_month_data = []
+    sundays = 0
+    holidays_found = 0
+    
+    for day_num in range(1, num_days_in_month + 1):
+        current_date = datetime.date(target_year, target_month, day_num)
+        
+        # Only check holidays and sundays if the employee is currently active
+        if active_start_date <= current_date <= active_end_date:
+            is_sunday = current_date.weekday() == 6
+            is_holiday = current_date in holidays_dict
+            
+            if is_sunday:
+                sundays += 1
+            elif is_holiday:
+                holidays_found += 1
+            else:
+                working_days_in_month.append(current_date)
+    
+    num_working_days = len(working_days_in_month)
+    absent_days = set()
+    
+    # Make sure we don't assign more absent days than the employee actually worked
+    actual_absent = min(num_absent, num_working_days) 
+    if actual_absent > 0:
+        absent_days = set(random.sample(working_days_in_month, actual_absent))
+    
+    # Divide working days into standard and special
+    working_days_with_attendance = [day for day in working_days_in_month if day not in absent_days]
+    standard_working_days = [day for day in working_days_with_attendance if not is_special(day)]
+    
+    # Distribute OT *only* among standard working days
+    ot_schedule = distribute_overtime(req_ot, len(standard_working_days))
+    
+    std_work_counter = 0
+    sp_work_counter = 0
+    total_std_hours = 0
+    
+    for day_num in range(1, num_days_in_month + 1):
+        current_date = datetime.date(target_year, target_month, day_num)
+        date_str = current_date.strftime("%d-%b-%y")
+        
+        row = [date_str, std_shift['name'], "", "", "", ""]
+
+        # Process dates before joining or after leaving first
+        if current_date < active_start_date:
+            row[1] = "-"
+            row[5] = "Not Joined"
+        elif current_date > active_end_date:
+            row[1] = "-"
+            row[5] = "Left"
+        else:
+            is_sunday = current_date.weekday() == 6
+            holiday_name = holidays_dict.get(current_date)
+            
+            if is_sunday:
+                row[5] = "SUNDAY"
+            elif holiday_name:
+                row[5] = holiday_name
+            elif current_date in working_days_with_attendance:
+                if is_special(current_date):
+                    # Special Shift Day Logic
+                    row[1] = sp_shift['name']
+                    row[2] = create_natural_time(target_year, target_month, 9, True)
+                    row[3] = create_natural_time(target_year, target_month, sp_shift['out_hour'], False)
+                    row[4] = "" # NO OT FOR SPECIAL SHIFT
+                    row[5] = "On Time"
+                    total_std_hours += sp_shift['hours']
+                    sp_work_counter += 1
+                else:
+                    # Standard Shift Day Logic
+                    ot_hours = ot_schedule[std_work_counter]
+                    row[1] = std_shift['name']
+                    row[2] = create_natural_time(target_year, target_month, 9, True)
+                    row[3] = create_natural_time(target_year, target_month, std_shift['out_hour'] + ot_hours, False)
+                    row[4] = ot_hours if ot_hours > 0 else ""
+                    row[5] = "On Time"
+                    total_std_hours += std_shift['hours']
+                    std_work_counter += 1
+            elif current_date in working_days_in_month:
+                row[5] = "Absent"
+        
+        full_month_data.append(row)
+        
+    return employee_record(employee, full_month_data, active_start_date, active_end_date, sundays,
+                           holidays_found, std_work_counter, sp_work_counter, actual_absent, total_std_hours,
+                           sum(ot_schedule), req_ot, std_shift, sp_shift)
+
+def employee_record(employee, full_month_data, active_start_date, active_end_date, sundays, holidays_found,
+                    std_work_counter, sp_work_counter, actual_absent, total_std_hours, total_ot_hours, index_ot_hours,
+                    std_shift, sp_shift=None):
+    """Assembles the record `write_employee_sheet` lays out from one employee's day rows and month totals."""
+    emp_code = employee.code
+    emp_name = employee.name
+    emp_status = employee.status
+    num_days_in_month = len(full_month_data)
+
+    safe_name = str(emp_name).replace(":", "").replace("/", "")
+    sheet_name = f"{emp_code}_{safe_name}"[:31]
+
+    # Footing Logic
+    total_present_days = std_work_counter + sp_work_counter
+    total_payable_hours = total_std_hours + total_ot_hours
+    
+    shift_breakdown_str = f"({std_work_counter} Std. Days x {std_shift['hours']}h)"
+    if sp_work_counter > 0:
+        shift_breakdown_str += f" + ({sp_work_counter} Spc. Days x {sp_shift['hours']}h)"
+    
+    footing_data = [
+        ["SUMMARY:", ""],
+        ["Total Days in Month", num_days_in_month],
+        ["Sundays (Active)", sundays],
+        ["Gazetted Holidays (Active)", holidays_found],
+        ["Total Present Days", total_present_days],
+        ["Absent", actual_absent],
+        ["Over Time Hrs.", total_ot_hours],
+        [],
+        ["Total Standard Hours", total_std_hours, shift_breakdown_str],
+        ["Total OT Hours", total_ot_hours, f"(Sum of OT HRS)"],
+        ["Total Payable Hours", total_payable_hours]
+    ]
+
+    return {
+        "code": emp_code,
+        "name": emp_name,
+        "sheet_name": sheet_name,
+        "rows": full_month_data,
+        "footing": footing_data,
+        "index": {
+            "S. No": employee.s_no,
+            "CODE": emp_code,
+            "Name": emp_name,
+            "SheetName": sheet_name,
+            "Absent": actual_absent,
+            "OT Hours": index_ot_hours,
+            "Status": emp_status
+        },
+        "summary": {
+            "code": emp_code,
+            "name": emp_name,
+            "status": emp_status,
+            "days_in_month": num_days_in_month,
+            "active_days": (active_end_date - active_start_date).days + 1,
+            "present_days": total_present_days,
+            "absent_days": actual_absent,
+            "std_hours": total_std_hours,
+            "ot_hours": total_ot_hours,
+            "payable_hours": total_payable_hours,
+        },
+    }
+
+def write_employee_sheet(ws, record, company_name_input, month_year_str, styles):
+    """Writes one employee's header, day table, footer and print setup."""
+    header_font = styles["header_font"]
+    normal_font = styles["normal_font"]
+    center_align = styles["center_align"]
+    right_align = styles["right_align"]
+    thin_border = styles["thin_border"]
+
+    header_data = [
+        ["Company Name:", company_name_input],
+        ["Report Title:", f"ATTENDANCE SHEETS FOR THE MONTH OF {month_year_str}"],
+        ["Employee Name:", record["name"]],
+        ["Employee Code:", record["code"]]
+    ]
+    full_month_data = record["rows"]
+    footing_data = record["footing"]
+
+    # 1. Header Formatting
+    ws.cell(row=1, column=1, value="Company Name:").font = styles["title_font"]
+    ws.cell(row=1, column=2, value=company_name_input).font = styles["title_font"]
+    ws.merge_cells('B1:F1') 
+
+    for r_idx, row_val in enumerate(header_data[1:], 2):
+        ws.cell(row=r_idx, column=1, value=row_val[0]).font = header_font
+        ws.cell(row=r_idx, column=2, value=row_val[1]).font = normal_font
+        ws.merge_cells(f'B{r_idx}:F{r_idx}') 
+
+    # 2. Data Table
+    data_start_row = 6
+    table_headers = ["DATE", "SHIFT G", "TIME IN", "TIME OUT", "OT HRS", "REMARKS"]
+    
+    for c_idx, val in enumerate(table_headers, 1):
+        cell = ws.cell(row=data_start_row, column=c_idx, value=val)
+        cell.font = header_font
+        cell.border = thin_border
+        cell.alignment = center_align
+        
+    for r_idx, row_val in enumerate(full_month_data, data_start_row + 1):
+        for c_idx, val in enumerate(row_val, 1):
+            cell = ws.cell(row=r_idx, column=c_idx, value=val)
+            cell.font = normal_font
+            cell.border = thin_border
+            cell.alignment = center_align
+            if c_idx == 5: cell.alignment = right_align
+
+    # 3. Footing
+    footing_start_row = data_start_row + len(full_month_data) + 2
+    ws.cell(row=footing_start_row, column=1, value="SUMMARY:").font = header_font
+    ws.cell(row=footing_start_row, column=1).border = thin_border
+    
+    for r_idx, row_val in enumerate(footing_data[1:], footing_start_row + 1):
+        for c_idx, val in enumerate(row_val, 1):
+            cell = ws.cell(row=r_idx, column=c_idx, value=val)
+            cell.font = normal_font
+            cell.border = thin_border
+            if c_idx == 1: cell.font = header_font
+            if c_idx > 1: cell.alignment = right_align
+
+    # 4. Dimensions & Print
+    widths = [15, 15, 12, 12, 10, 20]
+    for i, w in enumerate(widths):
+        ws.column_dimensions[get_column_letter(i+1)].width = w
+        
+    ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
+    ws.page_setup.paperSize = ws.PAPERSIZE_A4
+    ws.page_setup.fitToPage = True
+    ws.page_setup.fitToWidth = 1
+    ws.page_setup.fitToHeight = 1
+
+def fill_employee_sheet(ws, record):
+    """Writes only the values that differ between employees into a sheet cloned
+    from a template made by `write_employee_sheet` (same cell layout, same month)."""
+    ws.cell(row=3, column=2, value=record["name"])
+    ws.cell(row=4, column=2, value=record["code"])
+    for r_idx, row_val in enumerate(record["rows"], 7):
+        for c_idx, val in enumerate(row_val, 1):
+            ws.cell(row=r_idx, column=c_idx, value=val)
+    footing_start_row = 6 + len(record["rows"]) + 2
+    for r_idx, row_val in enumerate(record["footing"][1:], footing_start_row + 1):
+        for c_idx, val in enumerate(row_val[1:], 2):
+            ws.cell(row=r_idx, column=c_idx, value=val)
+
+def write_index_sheet(index_ws, index_data, styles):
+    """Writes the Index sheet linking to every employee sheet."""
+    header_font = styles["header_font"]
+    normal_font = styles["normal_font"]
+    center_align = styles["center_align"]
+    thin_border = styles["thin_border"]
+
+    index_headers = ["S. No", "CODE", "Name", "Absent", "OT Hours", "Status"]
+    for c_idx, val in enumerate(index_headers, 1):
+        cell = index_ws.cell(row=1, column=c_idx, value=val)
+        cell.font = header_font
+        cell.border = thin_border
+        cell.alignment = center_align
+        
+    for r_idx, data in enumerate(index_data, 2):
+        c1 = index_ws.cell(row=r_idx, column=1, value=data['S. No'])
+        c1.font = normal_font; c1.border = thin_border; c1.alignment = center_align
+        c2 = index_ws.cell(row=r_idx, column=2, value=data['CODE'])
+        c2.font = normal_font; c2.border = thin_border; c2.alignment = center_align
+        c3 = index_ws.cell(row=r_idx, column=3)
+        c3.value = f'=HYPERLINK("#\'{data["SheetName"]}\'!A1", "{data["Name"]}")'
+        c3.font = styles["link_font"]; c3.border = thin_border
+        c4 = index_ws.cell(row=r_idx, column=4, value=data['Absent'])
+        c4.font = normal_font; c4.border = thin_border; c4.alignment = center_align
+        c5 = index_ws.cell(row=r_idx, column=5, value=data['OT Hours'])
+        c5.font = normal_font; c5.border = thin_border; c5.alignment = center_align
+        c6 = index_ws.cell(row=r_idx, column=6, value=data['Status'])
+        c6.font = normal_font; c6.border = thin_border; c6.alignment = center_align
+
+# Every employee sheet of a month has the same merged header, column widths,
+# page setup and styled cells; only the values differ. In "template" mode the
+# first employee's sheet is styled once and every sheet is a copy of it with
+# its values written in (`copy_worksheet` copies the style ids, so no Font or
+# Border objects are looked up per cell). "cells" styles every sheet cell by
+# cell; both produce the same sheet XML.
+RENDER_MODES = ("template", "cells")
+TEMPLATE_SHEET = "__template__"
+
+def write_attendance_workbook(output, roster, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift=None, styles=None, progress=None, render="template", compute=None):
+    """Writes one month's workbook for a normalized roster into `output`; returns the summary rows.
+
+    `styles` may be shared between workbooks (see `attendance_styles`).
+    `render` is one of `RENDER_MODES`. `compute`, if given, is called with
+    each roster row instead of `compute_employee` and returns its record.
+    """
+    if render not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode '{render}'. Available: {', '.join(RENDER_MODES)}")
+    month_year_str = f"{datetime.date(target_year, target_month, 1).strftime('%B %Y').upper()}"
+    styles = styles or attendance_styles()
+
+    index_data = []
+    summary_data = []
+
+    writer = pd.ExcelWriter(output, engine='openpyxl')
+    index_ws = writer.book.create_sheet(title="Index", index=0)
+    
+    total_emps = len(roster)
+    template = None
+    
+    for i, employee in enumerate(roster.itertuples(index=False)):
+        if progress:
+            progress((i + 1) / total_emps)
+
+        with span("compute"):
+            if compute:
+                record = compute(employee)
+            else:
+                record = compute_employee(employee, target_month, target_year, holidays_dict, std_shift, sp_shift)
+        with span("render"):
+            if render == "cells":
+                ws = writer.book.create_sheet(title=record["sheet_name"])
+                write_employee_sheet(ws, record, company_name_input, month_year_str, styles)
+            else:
+                if template is None:
+                    template = writer.book.create_sheet(title=TEMPLATE_SHEET)
+                    write_employee_sheet(template, record, company_name_input, month_year_str, styles)
+                ws = writer.book.copy_worksheet(template)
+                ws.title = record["sheet_name"]
+                fill_employee_sheet(ws, record)
+        index_data.append(record["index"])
+        summary_data.append(record["summary"])
+
+    with span("render"):
+        if template is not None:
+            writer.book.remove(template)
+        write_index_sheet(index_ws, index_data, styles)
+        if 'Sheet' in writer.book.sheetnames:
+            writer.book.remove(writer.book['Sheet'])
+
+    with span("serialize"):
+        writer.close()
+
+    return summary_data
+
+def generate_attendance_file(input_df, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift=None, progress=None, cache=None, render="template"):
+    """Builds the attendance workbook.
+
+    Returns `(output, summary_df)`: the workbook as a spooled file and one summary row
+    per employee (present days, hours, OT) for the payroll stage. `progress`,
+    if given, is called with the completed fraction after each employee.
+
+    With a `cache` (FragmentCache), only employees whose rows changed since the
+    last run are recomputed and rendered; their codes are listed in
+    `summary_df.attrs["rebuilt"]`. Otherwise `render` picks how sheets are
+    styled (see `RENDER_MODES`).
+    """
+    output = spooled_output()
+
+    # Resolve column aliases and dtypes once; rows below use plain attribute access
+    with span("ingest"):
+        roster = normalize_frame(input_df, ATTENDANCE_COLUMNS, title="Attendance file")
+
+    if cache is None:
+        summary_data = write_attendance_workbook(output, roster, target_month, target_year, holidays_dict,
+                                                 company_name_input, std_shift, sp_shift, progress=progress, render=render)
+        return rewind(output), pd.DataFrame(summary_data)
+
+    summary_data, rebuilt = write_attendance_incremental(output, roster, target_month, target_year, holidays_dict,
+                                                         company_name_input, std_shift, sp_shift, cache, progress=progress)
+    summary_df = pd.DataFrame(summary_data)
+    summary_df.attrs["rebuilt"] = rebuilt
+    return rewind(output), summary_df
+
+# --- INCREMENTAL REGENERATION ---
+# Correction cycles usually touch a few rows of a large roster. With a
+# FragmentCache, each employee's record and rendered sheet XML are stored
+# under a hash of that employee's row and the month settings; a re-run
+# computes and renders only the changed employees and assembles the package
+# from cached sheet XML for the rest. Unchanged employees also keep the
+# exact times and OT days they were given the first time.
+
+SHEET_CACHE_VERSION = 1   # bump when compute_employee or write_employee_sheet output changes
+
+
+def _employee_key(employee, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift):
+    month_holidays = sorted((day, name) for day, name in holidays_dict.items()
+                            if (day.year, day.month) == (target_year, target_month))
+    return content_key("attendance-sheet", SHEET_CACHE_VERSION, tuple(employee), target_month, target_year,
+                       month_holidays, company_name_input, std_shift, sp_shift)
+
+
+def _build_workbook(records, rendered, company_name_input, month_year_str, styles, progress):
+    """openpyxl package with full sheets for `rendered` indexes and empty placeholders for the rest."""
+    book_file = spooled_output()
+    writer = pd.ExcelWriter(book_file, engine='openpyxl')
+    index_ws = writer.book.create_sheet(title="Index", index=0)
+    sheets = []
+    for i, record in enumerate(records):
+        if progress:
+            progress((i + 1) / len(records))
+        with span("render"):
+            ws = writer.book.create_sheet(title=record["sheet_name"])
+            if i in rendered:
+                write_employee_sheet(ws, record, company_name_input, month_year_str, styles)
+        sheets.append(ws)
+    with span("render"):
+        write_index_sheet(index_ws, [record["index"] for record in records], styles)
+        if 'Sheet' in writer.book.sheetnames:
+            writer.book.remove(writer.book['Sheet'])
+    with span("serialize"):
+        writer.close()
+    return zipfile.ZipFile(rewind(book_file)), [ws.path.lstrip("/") for ws in sheets]
+
+
+def write_attendance_incremental(output, roster, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift, cache, styles=None, progress=None):
+    """`write_attendance_workbook` that reuses unchanged employees from `cache` (a FragmentCache).
+
+    Returns `(summary_data, rebuilt_codes)`: the summary rows and the codes of
+    the employees that were new or changed since they were last cached.
+    """
+    month_year_str = f"{datetime.date(target_year, target_month, 1).strftime('%B %Y').upper()}"
+    styles = styles or attendance_styles()
+    employees = list(roster.itertuples(index=False))
+    keys = [_employee_key(employee, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift)
+            for employee in employees]
+    with span("ingest"):
+        cached = cache.get_many("attendance", keys)
+
+    records, fresh = [], set()
+    for i, (employee, key) in enumerate(zip(employees, keys)):
+        if key in cached:
+            records.append(cached[key][0]["record"])
+        else:
+            with span("compute"):
+                records.append(compute_employee(employee, target_month, target_year, holidays_dict, std_shift, sp_shift))
+            fresh.add(i)
+
+    # Style ids in sheet XML index the workbook's style table, which openpyxl
+    # builds from the cells it writes: always rendering the first sheet keeps
+    # that table the same however few employees changed.
+    rendered = fresh | ({0} if records else set())
+    source, paths = _build_workbook(records, rendered, company_name_input, month_year_str, styles, progress)
+    styles_key = content_key(source.read("xl/styles.xml"))
+    if any(cached[keys[i]][0]["styles"] != styles_key for i in range(len(records)) if i not in rendered):
+        rendered = set(range(len(records)))   # cached XML is from another style table (e.g. openpyxl upgrade)
+        source, paths = _build_workbook(records, rendered, company_name_input, month_year_str, styles, progress)
+
+    sheet_index = {path: i for i, path in enumerate(paths)}
+    new_fragments = []
+    with span("serialize"):
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as package:
+            for info in source.infolist():
+                i = sheet_index.get(info.filename)
+                if i is None or i in rendered:
+                    data = source.read(info)
+                    stored = cached.get(keys[i]) if i is not None else None
+                    # Shared-string cells (older openpyxl) would point into this workbook's string table
+                    if i is not None and b' t="s"' not in data and (stored is None or stored[0]["styles"] != styles_key):
+                        new_fragments.append((keys[i], {"record": records[i], "styles": styles_key}, data))
+                else:
+                    data = cached[keys[i]][1]
+                package.writestr(info, data)
+        cache.put_many("attendance", new_fragments)
+        cache.purge()
+
+    return [record["summary"] for record in records], [records[i]["code"] for i in sorted(fresh)]
+
+# --- RAW PUNCH LOGS ---
+# Biometric devices export one row per punch. The log is reduced to one row
+# per employee-day (first punch in, last punch out, late arrival, whole OT
+# hours past the shift's checkout) with a single groupby and column-wise
+# arithmetic, so only that small daily frame is visited row by row to lay
+# out the sheets. Days are calendar days: a shift that runs past midnight
+# is split across two dates.
+
+LATE_GRACE_MINUTES = 15
+_CLOCK = np.array([f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60)], dtype=object)
+
+def punch_roster(punches):
+    """An attendance roster (see ATTENDANCE_COLUMNS) of everyone in a normalized punch log."""
+    first = punches.groupby("code", sort=True)["name"].first()
+    return pd.DataFrame({"S#": range(1, len(first) + 1), "CODE": first.index, "NAME": first.to_numpy()})
+
+def aggregate_punches(punches, target_month, target_year, std_shift, sp_shift=None):
+    """Daily attendance from a normalized punch log (see PUNCH_COLUMNS).
+
+    Returns one row per employee-day with punches in the month: code (its
+    `code_key`, to match roster codes typed as numbers or text), date, time_in, time_out ("" after a single punch), ot_hours and
+    late. Special-shift days use the special checkout hour and earn no OT.
+    """
+    month_start = pd.Timestamp(target_year, target_month, 1)
+    stamps = punches["punch_time"]
+    in_month = (stamps >= month_start) & (stamps < month_start + pd.offsets.MonthBegin(1))
+    log = pd.DataFrame({"code": punches["code"][in_month], "time": stamps[in_month]})
+    log["day"] = log["time"].dt.normalize()
+
+    daily = log.groupby(["code", "day"], sort=False)["time"].agg(first_in="min", last_out="max", punches="count").reset_index()
+    # HH:MM by table lookup on minute-of-day; Series.dt.strftime formats each value in Python
+    clock_in = _CLOCK[((daily["first_in"] - daily["day"]) // pd.Timedelta(minutes=1)).to_numpy()]
+    clock_out = _CLOCK[((daily["last_out"] - daily["day"]) // pd.Timedelta(minutes=1)).to_numpy()]
+
+    special = pd.Series(False, index=daily.index)
+    out_hour = pd.Series(std_shift["out_hour"], index=daily.index)
+    shift_hours = pd.Series(std_shift["hours"], index=daily.index)
+    if sp_shift:
+        special = daily["day"].between(pd.Timestamp(sp_shift["start"]), pd.Timestamp(sp_shift["end"]))
+        out_hour = out_hour.mask(special, sp_shift["out_hour"])
+        shift_hours = shift_hours.mask(special, sp_shift["hours"])
+    checkout = daily["day"] + pd.to_timedelta(out_hour, unit="h")
+    check_in = checkout - pd.to_timedelta(shift_hours, unit="h")
+
+    paired = daily["punches"] > 1
+    ot_hours = ((daily["last_out"] - checkout) // pd.Timedelta(hours=1)).clip(lower=0)
+    return pd.DataFrame({
+        "code": code_key(daily["code"]),
+        "date": daily["day"].dt.date,
+        "time_in": clock_in,
+        "time_out": pd.Series(clock_out, index=daily.index).where(paired, ""),
+        "ot_hours": ot_hours.where(paired & ~special, 0).astype(int),
+        "late": daily["first_in"] > check_in + pd.Timedelta(minutes=LATE_GRACE_MINUTES),
+    })
+
+def compute_employee_punches(employee, days, target_month, target_year, holidays_dict, std_shift, sp_shift=None):
+    """`compute_employee` from real punches instead of synthesized times.
+
+    `days` maps each date the employee punched on to its `aggregate_punches`
+    row `(time_in, time_out, ot_hours, late)`. A working day without punches
+    is absent; a day with one punch is present with the checkout missing.
+    """
+    def is_special(date_obj):
+        if not sp_shift: return False
+        return sp_shift["start"] <= date_obj <= sp_shift["end"]
+
+    num_days_in_month = month_bounds(target_year, target_month)[0]
+    active_start_date, active_end_date = active_period(employee, target_month, target_year)
+
+    full_month_data = []
+    sundays = holidays_found = absent = 0
+    std_work_counter = sp_work_counter = 0
+    total_std_hours = total_ot_hours = 0
+
+    for day_num in range(1, num_days_in_month + 1):
+        current_date = datetime.date(target_year, target_month, day_num)
+        row = [current_date.strftime("%d-%b-%y"), std_shift['name'], "", "", "", ""]
+        punched = days.get(current_date)
+
+        if current_date < active_start_date:
+            row[1] = "-"
+            row[5] = "Not Joined"
+        elif current_date > active_end_date:
+            row[1] = "-"
+            row[5] = "Left"
+        else:
+            holiday_name = holidays_dict.get(current_date)
+            if is_special(current_date):
+                row[1] = sp_shift['name']
+            if punched:
+                row[2], row[3] = punched[0], punched[1]
+            if current_date.weekday() == 6:
+                sundays += 1
+                row[5] = "SUNDAY"
+            elif holiday_name:
+                holidays_found += 1
+                row[5] = holiday_name
+            elif not punched:
+                absent += 1
+                row[5] = "Absent"
+            else:
+                time_in, time_out, ot_hours, late = punched
+                row[4] = ot_hours if ot_hours > 0 else ""
+                row[5] = "Missing Out Punch" if not time_out else ("Late" if late else "On Time")
+                total_ot_hours += ot_hours
+                if is_special(current_date):
+                    total_std_hours += sp_shift['hours']
+                    sp_work_counter += 1
+                else:
+                    total_std_hours += std_shift['hours']
+                    std_work_counter += 1
+
+        full_month_data.append(row)
+
+    return employee_record(employee, full_month_data, active_start_date, active_end_date, sundays, holidays_found,
+                           std_work_counter, sp_work_counter, absent, total_std_hours, total_ot_hours, total_ot_hours,
+                           std_shift, sp_shift)
+
+def generate_attendance_from_punches(punch_df, target_month, target_year, holidays_dict, company_name_input, std_shift, sp_shift=None, roster_df=None, progress=None):
+    """Builds the attendance workbook from a raw punch log instead of a summarized roster.
+
+    `roster_df` (an attendance file, see ATTENDANCE_COLUMNS) is optional: it
+    adds employees who never punched and their New/Left dates. Without it,
+    everyone in the log gets a sheet. Returns `(output, summary_df)` like
+    `generate_attendance_file`.
+    """
+    output = spooled_output()
+    with span("ingest"):
+        punches = normalize_frame(punch_df, PUNCH_COLUMNS, title="Punch log")
+        roster = normalize_frame(punch_roster(punches) if roster_df is None else roster_df, ATTENDANCE_COLUMNS,
+                                 title="Attendance file")
+
+    with span("compute"):
+        daily = aggregate_punches(punches, target_month, target_year, std_shift, sp_shift)
+        by_code = {}
+        for code, day, time_in, time_out, ot_hours, late in zip(*(daily[c].to_numpy() for c in daily.columns)):
+            by_code.setdefault(code, {})[day] = (time_in, time_out, int(ot_hours), bool(late))
+
+    def compute(employee):
+        days = by_code.get(code_key([employee.code])[0], {})
+        return compute_employee_punches(employee, days, target_month, target_year, holidays_dict, std_shift, sp_shift)
+
+    summary_data = write_attendance_workbook(output, roster, target_month, target_year, holidays_dict,
+                                             company_name_input, std_shift, sp_shift, progress=progress, compute=compute)
+    return rewind(output), pd.DataFrame(summary_data)
+
+# --- DATE RANGES ---
+# Months are independent, so a range run writes each month's workbook to a
+# temp file (in worker processes when it is large enough) and zips them.
+
+PARALLEL_MIN_EMPLOYEE_MONTHS = 2000   # below this, starting worker processes costs more than it saves
+
+_range_job = {}   # set only in spawned worker processes, by _init_range_worker
+
+def months_in_range(start_date, end_date):
+    """`(year, month)` pairs from `start_date`'s month through `end_date`'s month."""
+    months = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def month_file_name(year, month):
+    return f"NFP_Attendance_{datetime.date(year, month, 1).strftime('%B_%Y')}.xlsx"
+
+def _init_range_worker(job):
+    # Runs once per worker process: the roster and settings are sent once, not once per month
+    _range_job.update(job)
+
+def _write_range_month(path, year, month, progress=None, job=None):
+    # In this process the caller passes `job`: the server runs several sessions' ranges at once
+    job = _range_job if job is None else job
+    with open(path, "wb") as f:
+        return write_attendance_workbook(f, job["roster"], month, year, job["holidays"], job["company_name"],
+                                         job["std_shift"], job["sp_shift"], styles=job.get("styles"), progress=progress)
+
+def generate_attendance_range(input_df, months, holidays_dict, company_name_input, std_shift, sp_shift=None, progress=None, max_workers=None):
+    """Builds one attendance workbook per month of `months` (`(year, month)` pairs) in one run.
+
+    The roster is normalized once and the holiday map may cover the whole
+    range. Returns `(output, summary_df)`: a spooled zip holding one
+    `month_file_name` workbook per month, and the summary rows of every
+    month with a `period` column. Months run in parallel worker processes
+    when the run is big enough to pay for starting them; `max_workers=1`
+    keeps everything in this process.
+    """
+    with span("ingest"):
+        roster = normalize_frame(input_df, ATTENDANCE_COLUMNS, title="Attendance file")
+    job = {"roster": roster, "holidays": holidays_dict, "company_name": company_name_input,
+           "std_shift": std_shift, "sp_shift": sp_shift}
+    if max_workers is None:
+        large = len(roster) * len(months) >= PARALLEL_MIN_EMPLOYEE_MONTHS
+        max_workers = min(len(months), os.cpu_count() or 1) if large else 1
+
+    summaries = {}
+    output = spooled_output()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {ym: os.path.join(tmp, month_file_name(*ym)) for ym in months}
+        if max_workers > 1:
+            # spawn, not fork: the Streamlit server is multi-threaded
+            with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_range_worker, initargs=(job,)) as pool:
+                futures = {pool.submit(_write_range_month, paths[ym], *ym): ym for ym in months}
+                for done, future in enumerate(as_completed(futures), 1):
+                    summaries[futures[future]] = future.result()
+                    if progress:
+                        progress(done / len(months))
+        else:
+            job = dict(job, styles=attendance_styles())
+            for i, ym in enumerate(months):
+                month_progress = (lambda f, i=i: progress((i + f) / len(months))) if progress else None
+                summaries[ym] = _write_range_month(paths[ym], *ym, progress=month_progress, job=job)
+
+        with span("serialize"), zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as bundle:
+            for ym in months:
+                bundle.write(paths[ym], os.path.basename(paths[ym]))
+
+    summary = pd.concat([pd.DataFrame(summaries[ym]).assign(period=datetime.date(ym[0], ym[1], 1).strftime('%B %Y'))
+                         for ym in months], ignore_index=True)
+    return rewind(output), summary
+
+# --- LONG-FORMAT EXPORT ---
+# The same per-employee computation, streamed as one row per employee-day for
+# HRIS imports instead of being laid out in a styled workbook.
+
+RECORD_FORMATS = ("csv", "parquet")
+
+def _record_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("code", pa.string()), ("name", pa.string()), ("date", pa.date32()), ("shift", pa.string()),
+        ("time_in", pa.string()), ("time_out", pa.string()), ("ot_hours", pa.int16()), ("remark", pa.string()),
+    ])
+
+def generate_attendance_records(input_df, target_month, target_year, holidays_dict, std_shift, sp_shift=None, fmt="parquet", batch_size=500, progress=None):
+    """Machine-readable attendance: one row per employee-day, no workbook.
+
+    Columns: code, name, date, shift, time_in, time_out, ot_hours, remark
+    (blank cells become nulls, OT 0). Rows are streamed to a CSV or Parquet
+    file `batch_size` employees at a time (one CSV chunk / Parquet row group
+    each). Returns `(output, summary_df)` like `generate_attendance_file`.
+    """
+    import pyarrow as pa
+    if fmt not in RECORD_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Available: {', '.join(RECORD_FORMATS)}")
+
+    with span("ingest"):
+        roster = normalize_frame(input_df, ATTENDANCE_COLUMNS, title="Attendance file")
+    days = [datetime.date(target_year, target_month, day) for day in range(1, month_bounds(target_year, target_month)[0] + 1)]
+    schema = _record_schema()
+
+    output = spooled_output()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(output, schema, compression="zstd")
+    else:
+        import pyarrow.csv as pa_csv
+        writer = pa_csv.CSVWriter(output, schema)
+
+    columns = {name: [] for name in schema.names}
+    summary_data = []
+
+    def flush():
+        with span("serialize"):
+            writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    total_emps = len(roster)
+    for i, employee in enumerate(roster.itertuples(index=False)):
+        if progress:
+            progress((i + 1) / total_emps)
+
+        with span("compute"):
+            record = compute_employee(employee, target_month, target_year, holidays_dict, std_shift, sp_shift)
+        with span("render"):
+            code, name = str(record["code"]), str(record["name"])
+            for day, (_, shift, time_in, time_out, ot_hours, remark) in zip(days, record["rows"]):
+                columns["code"].append(code)
+                columns["name"].append(name)
+                columns["date"].append(day)
+                columns["shift"].append(shift)
+                columns["time_in"].append(time_in or None)
+                columns["time_out"].append(time_out or None)
+                columns["ot_hours"].append(ot_hours or 0)
+                columns["remark"].append(remark or None)
+        summary_data.append(record["summary"])
+        if (i + 1) % batch_size == 0:
+            flush()
+
+    if columns["code"] or not summary_data:
+        flush()
+    with span("serialize"):
+        writer.close()
+    return rewind(output), pd.DataFrame(summary_data)
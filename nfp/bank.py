@@ -0,0 +1,307 @@
+"""Bank AL Habib statement converter: PDF text -> transactions -> Excel."""
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import pdfplumber
+
+from nfp.schema import CATEGORY_RULE_COLUMNS, SchemaError, normalize_frame
+from nfp.spool import rewind, spooled_output
+
+
+def to_float(x):
+    if not x: return 0.0
+    s = str(x).strip().replace(',', '').replace('(', '-').replace(')', '')
+    s = re.sub(r'[^0-9.-]', '', s) 
+    try:
+        return float(s)
+    except:
+        return 0.0
+
+def extract_text_from_pdf(pdf_file):
+    """Text of every page, one page after another.
+
+    pdfplumber caches each page's parsed layout objects (chars, lines, rects)
+    for as long as the document is open, so on a 1,000+ page statement memory
+    would grow with the page count. Each page is closed as soon as its text is
+    taken, which keeps the working set at roughly one page.
+    """
+    texts = []
+    with pdfplumber.open(pdf_file) as pdf:
+        for page in pdf.pages:
+            content = page.extract_text()
+            page.close()
+            if content:
+                texts.append(content + "\n")
+    return "".join(texts)
+
+def parse_bank_statement(raw_text):
+    lines = raw_text.split('\n')
+    date_pattern = r'^(\d{2}/\d{2}/\d{4})'
+    
+    transactions = []
+    current_row = None
+    running_balance = 0.0
+    account_active = False
+
+    for line in lines:
+        line = line.strip()
+        if not line: continue
+
+        if "Opening Balance" in line:
+            parts = line.split()
+            balance_val = to_float(parts[-1])
+            running_balance = balance_val
+            account_active = True
+            
+            transactions.append({
+                "Posting Date": parts[0] if re.match(r'\d', parts[0]) else "",
+                "Value Date": "",
+                "Instrument/Doc No": "",
+                "Details": "--- Opening Balance ---",
+                "Debit": 0.0,
+                "Credit": 0.0,
+                "Balance": balance_val
+            })
+            continue
+
+        match = re.match(date_pattern, line)
+        if match and account_active:
+            if current_row: 
+                transactions.append(current_row)
+            
+            parts = line.split()
+            if len(parts) < 2: continue 
+            
+            post_date = parts[0]
+            
+            instrument = ""
+            details_start_idx = 1
+            if len(parts) > 2 and parts[1].isdigit() and 6 <= len(parts[1]) <= 12:
+                instrument = parts[1]
+                details_start_idx = 2
+            elif len(parts) > 3 and parts[2].isdigit() and 6 <= len(parts[2]) <= 12:
+                instrument = parts[2]
+                details_start_idx = 3
+
+            try:
+                row_balance = to_float(parts[-1])
+                numeric_candidates = []
+                for p in reversed(parts[:-1]):
+                    if re.search(r'\d', p) and ('.' in p or ',' in p or p.isdigit()):
+                        numeric_candidates.append(p)
+                    else:
+                        break
+                
+                diff = round(row_balance - running_balance, 2)
+                debit = abs(diff) if diff < 0 else 0.0
+                credit = diff if diff > 0 else 0.0
+                
+                details_end_idx = len(parts) - 1 - len(numeric_candidates)
+                details = " ".join(parts[details_start_idx:details_end_idx])
+
+                current_row = {
+                    "Posting Date": post_date,
+                    "Value Date": post_date, 
+                    "Instrument/Doc No": instrument,
+                    "Details": details,
+                    "Debit": debit,
+                    "Credit": credit,
+                    "Balance": row_balance
+                }
+                running_balance = row_balance
+            except Exception:
+                continue
+        else:
+            stop_keywords = ["Carried Forward", "Brought Forward", "Page", "Produced On", "TOTALS", "Closing Balance"]
+            if current_row and not any(k in line for k in stop_keywords):
+                if not re.match(r'^[\d,.\s\-:><]+$', line) or len(line) > 15:
+                    current_row["Details"] += " " + line
+
+    if current_row: 
+        transactions.append(current_row)
+    return transactions
+
+def statement_frame(transactions):
+    """Transactions from `parse_bank_statement` as a DataFrame, without the closing balance row."""
+    df = pd.DataFrame(transactions)
+    return df[~df['Details'].str.contains("Closing Balance", na=False)]
+
+# --- CATEGORIZATION ---
+# Accountants map narrations to ledger accounts with a rule table (keywords or
+# a regex -> category, optionally only for debits or credits); the first
+# matching rule in table order wins. Keyword rules are compiled once into a
+# phrase table per side and looked up for all word n-grams of the distinct
+# narrations at once (one hash-table probe per n-gram), so their cost does not
+# grow with the number of rules. Regex rules are checked one by one with pandas'
+# vectorized `str.contains`, only on narrations no earlier rule has claimed.
+
+UNCATEGORIZED = "Uncategorized"
+RULE_SIDES = ("any", "debit", "credit")
+
+DEFAULT_RULES = pd.DataFrame([
+    ("SALARY", "Salaries & Wages", "keyword", "debit"),
+    ("SALARY", "Salary Received", "keyword", "credit"),
+    ("K-ELECTRIC, SSGC, SNGPL, PTCL, WASA, UTILITY BILL", "Utilities", "keyword", "any"),
+    ("ATM CASH WITHDRAWAL, CASH WITHDRAWAL", "Cash", "keyword", "any"),
+    ("CHEQUE DEPOSIT, CLEARING", "Cheque Deposits", "keyword", "any"),
+    ("IBFT, FUNDS TRANSFER, INTER BRANCH", "Bank Transfers", "keyword", "any"),
+    ("POS PURCHASE", "Card Purchases", "keyword", "any"),
+    ("WHT, WITHHOLDING TAX, EXCISE DUTY, FED", "Taxes & Duties", "keyword", "any"),
+    (r"CHARGES?|COMMISSION|SMS ALERT", "Bank Charges", "regex", "any"),
+], columns=["Pattern", "Category", "Match", "Applies To"])
+
+_WORD = re.compile(r"\w+")
+
+
+class CompiledRules(NamedTuple):
+    phrases: dict             # side -> {"UPPER CASE WORDS": rule index}
+    regexes: dict             # side -> [(rule index, compiled regex)] in rule order
+    categories: np.ndarray    # rule index -> category, plus UNCATEGORIZED last
+    max_words: int            # longest keyword phrase
+
+
+def compile_rules(rules_df):
+    """Validates a rule table and compiles it; problems are raised together as a `SchemaError`.
+
+    Keyword patterns match whole words, case- and punctuation-insensitively;
+    several keywords for one category can be separated by commas.
+    """
+    rules = normalize_frame(rules_df, CATEGORY_RULE_COLUMNS, title="Category rules")
+    problems = []
+    phrases = {side: {} for side in RULE_SIDES}
+    regexes = {side: [] for side in RULE_SIDES}
+    categories = []
+    max_words = 0
+    for row_no, rule in enumerate(rules.itertuples(index=False), 2):
+        pattern, category = str(rule.pattern).strip(), str(rule.category).strip()
+        if not pattern or not category:
+            continue
+        match = str(rule.match).strip().lower() or "keyword"
+        side = str(rule.applies_to).strip().lower() or "any"
+        if side not in RULE_SIDES:
+            problems.append(f"row {row_no}: 'Applies To' must be any, debit or credit, got '{rule.applies_to}'")
+            continue
+        targets = RULE_SIDES if side == "any" else (side,)
+        index = len(categories)
+        if match == "keyword":
+            for keyword in pattern.split(","):
+                words = _WORD.findall(keyword.upper())
+                if words:
+                    max_words = max(max_words, len(words))
+                    for target in targets:
+                        phrases[target].setdefault(" ".join(words), index)
+        elif match == "regex":
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                problems.append(f"row {row_no}: invalid regex '{pattern}' ({e})")
+                continue
+            for target in targets:
+                regexes[target].append((index, compiled))
+        else:
+            problems.append(f"row {row_no}: match type must be 'keyword' or 'regex', got '{rule.match}'")
+            continue
+        categories.append(category)
+    if problems:
+        raise SchemaError("Category rules", problems)
+    return CompiledRules(phrases, regexes, np.array(categories + [UNCATEGORIZED], dtype=object), max_words)
+
+
+def _word_ngrams(texts, max_words):
+    """`[(rows, grams)]` for n = 1..max_words: every run of n consecutive words of each text, upper-cased."""
+    words = pd.Series(texts, dtype=object).str.upper().str.findall(_WORD).explode().dropna()
+    rows, words = words.index.to_numpy(), words.to_numpy(dtype=object)
+    ngrams, grams = [], words
+    for n in range(1, max_words + 1):
+        if n > 1:
+            grams = grams[:-1] + " " + words[n - 1:]
+        same_text = rows[:len(grams)] == rows[n - 1:]
+        ngrams.append((rows[:len(grams)][same_text], pd.Index(grams[same_text], dtype=object)))
+    return ngrams
+
+
+def categorize(df, rules):
+    """Category for every row of a `statement_frame`, from `compile_rules` output (or a rule table).
+
+    Debits are matched against `any` and `debit` rules, credits against `any`
+    and `credit` rules; the opening balance row gets a blank category.
+    """
+    if not isinstance(rules, CompiledRules):
+        rules = compile_rules(rules)
+    details = df["Details"].fillna("").astype(str)
+    category = pd.Series(UNCATEGORIZED, index=df.index, dtype=object)
+    sides = np.select([df["Debit"].to_numpy() > 0, df["Credit"].to_numpy() > 0], ["debit", "credit"], "any")
+
+    # Each distinct narration is tokenized and matched once
+    codes, uniques = pd.factorize(details.to_numpy(dtype=object))
+    texts = pd.Series(uniques, dtype=object)
+    ngrams = _word_ngrams(uniques, rules.max_words) if rules.max_words else []
+    none = len(rules.categories) - 1
+    for side in RULE_SIDES:
+        mask = sides == side
+        if not mask.any() or not (rules.phrases[side] or rules.regexes[side]):
+            continue
+        best = np.full(len(uniques), none, dtype=np.int64)
+        if rules.phrases[side]:
+            table = pd.Index(list(rules.phrases[side]), dtype=object)
+            rule_of = np.fromiter(rules.phrases[side].values(), dtype=np.int64, count=len(table))
+            for rows, grams in ngrams:
+                found = table.get_indexer(grams)
+                hit = found >= 0
+                np.minimum.at(best, rows[hit], rule_of[found[hit]])
+        for index, regex in rules.regexes[side]:
+            open_rows = np.flatnonzero(best > index)
+            if len(open_rows):
+                hit = texts.iloc[open_rows].str.contains(regex).to_numpy(dtype=bool)
+                best[open_rows[hit]] = index
+        category[mask] = rules.categories[best[codes[mask]]]
+    category[details.str.contains("Opening Balance", regex=False).to_numpy()] = ""
+    return category
+
+def generate_bank_excel(df):
+    output = spooled_output()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False, sheet_name='Extracted Data')
+        workbook = writer.book
+        worksheet = writer.sheets['Extracted Data']
+        
+        header_fmt = workbook.add_format({
+            'bold': True, 'font_color': 'white', 'bg_color': '#003366', 
+            'border': 1, 'align': 'center', 'valign': 'vcenter'
+        })
+        num_fmt = workbook.add_format({'num_format': '#,##0.00', 'border': 1, 'valign': 'top', 'font_name': 'Arial', 'font_size': 10})
+        date_fmt = workbook.add_format({'num_format': 'dd/mm/yyyy', 'align': 'center', 'border': 1, 'valign': 'top', 'font_name': 'Arial', 'font_size': 10})
+        text_fmt = workbook.add_format({'text_wrap': True, 'border': 1, 'valign': 'top', 'font_name': 'Arial', 'font_size': 10})
+        ob_num = workbook.add_format({'num_format': '#,##0.00', 'border': 1, 'bg_color': '#FFFFCC', 'bold': True, 'valign': 'top'})
+        ob_text = workbook.add_format({'text_wrap': True, 'border': 1, 'bg_color': '#FFFFCC', 'bold': True, 'valign': 'top'})
+        ob_date = workbook.add_format({'align': 'center', 'border': 1, 'bg_color': '#FFFFCC', 'bold': True, 'valign': 'top'})
+        
+        for col_num, value in enumerate(df.columns.values):
+            worksheet.write(0, col_num, value, header_fmt)
+            
+        for row_idx, row_data in enumerate(df.values):
+            details_str = str(row_data[3])
+            is_ob = "Opening Balance" in details_str
+            d_fmt = ob_date if is_ob else date_fmt
+            t_fmt = ob_text if is_ob else text_fmt
+            n_fmt = ob_num  if is_ob else num_fmt
+            
+            worksheet.write(row_idx + 1, 0, row_data[0], d_fmt)
+            worksheet.write(row_idx + 1, 1, row_data[1], d_fmt)
+            worksheet.write(row_idx + 1, 2, row_data[2], t_fmt)
+            worksheet.write(row_idx + 1, 3, row_data[3], t_fmt)
+            worksheet.write(row_idx + 1, 4, row_data[4], n_fmt)
+            worksheet.write(row_idx + 1, 5, row_data[5], n_fmt)
+            worksheet.write(row_idx + 1, 6, row_data[6], n_fmt)
+            if len(row_data) > 7:
+                worksheet.write(row_idx + 1, 7, row_data[7], t_fmt)
+            
+        worksheet.set_column('A:B', 14)
+        worksheet.set_column('C:C', 18)
+        worksheet.set_column('D:D', 65)
+        worksheet.set_column('E:G', 18)
+        if len(df.columns) > 7:
+            worksheet.set_column('H:H', 24)
+    return rewind(output)
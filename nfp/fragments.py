@@ -0,0 +1,100 @@
+"""Persistent cache of rendered output fragments, for incremental regeneration.
+
+Generators that build one big file out of many independent parts (a sheet
+per employee, an invoice per DC) store each rendered part here under a hash
+of everything that went into it. On the next run only parts whose inputs
+changed are rendered again; the rest are copied from the cache.
+
+    cache = FragmentCache()                               # NFP_DATA_DIR/fragments.sqlite3
+    key = content_key("attendance-sheet", row, month, holidays, shift)
+    hits = cache.get_many("attendance", [key, ...])       # {key: (meta, payload)}
+    cache.put_many("attendance", [(key, meta, payload), ...])
+
+`meta` is any picklable object (the computed record); `payload` is bytes
+(the rendered fragment). Entries not used for `FRAGMENT_MAX_AGE_DAYS` are
+purged.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+
+FRAGMENT_MAX_AGE_DAYS = int(os.environ.get("NFP_FRAGMENT_MAX_AGE_DAYS", 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fragments (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    meta BLOB NOT NULL,
+    payload BLOB NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fragments_used_at ON fragments (used_at);
+"""
+
+_BATCH = 500   # keys per IN (...) query, under SQLite's bound-parameter limit
+
+
+def default_path():
+    root = os.environ.get("NFP_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".nfp")
+    return os.path.join(root, "fragments.sqlite3")
+
+
+def content_key(*parts):
+    """Stable hex digest of the inputs that determine one fragment."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, kind, keys):
+        """`{key: (meta, payload)}` for the keys that are cached; marks them as used."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(keys), _BATCH):
+                batch = keys[start:start + _BATCH]
+                marks = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, meta, payload FROM fragments WHERE kind = ? AND key IN ({marks})",
+                                    (kind, *batch)).fetchall()
+                found.update((key, (pickle.loads(meta), payload)) for key, meta, payload in rows)
+                conn.execute(f"UPDATE fragments SET used_at = ? WHERE kind = ? AND key IN ({marks})",
+                             (time.time(), kind, *batch))
+        return found
+
+    def put_many(self, kind, items):
+        """Stores `(key, meta, payload)` triples, replacing existing keys."""
+        now = time.time()
+        rows = [(kind, key, pickle.dumps(meta, pickle.HIGHEST_PROTOCOL), payload, now) for key, meta, payload in items]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO fragments (kind, key, meta, payload, used_at) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def purge(self, max_age_days=FRAGMENT_MAX_AGE_DAYS):
+        """Drops fragments not used for `max_age_days`; returns how many."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM fragments WHERE used_at < ?",
+                                (time.time() - max_age_days * 86400,)).rowcount
+
+    def clear(self, kind=None):
+        with self._connect() as conn:
+            if kind is None:
+                return conn.execute("DELETE FROM fragments").rowcount
+            return conn.execute("DELETE FROM fragments WHERE kind = ?", (kind,)).rowcount
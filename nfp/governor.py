@@ -0,0 +1,113 @@
+"""Admission control for heavy tool runs inside one server process.
+
+Every Streamlit session runs its generators in the same process, so a few
+users starting large attendance, invoice or bank conversions together can
+exhaust its memory. Before a heavy run starts it asks the process-wide
+`GOVERNOR` for admission with an estimated cost (peak MB, from the input
+size; see `estimate_cost`). Runs are admitted in arrival order while fewer
+than `max_runs` are going and their estimates fit in `budget_mb`; the rest
+wait, and `on_wait` is called about once a second with their place in line
+so the page can say it is queued. A run estimated above the whole budget is
+admitted on its own once nothing else is running.
+
+    with GOVERNOR.admit("attendance", estimate_cost("attendance", len(roster)), on_wait=show):
+        generate_attendance_file(...)
+
+Background jobs (`nfp.jobs`) are bounded by their worker pool instead.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# tool -> (fixed MB, MB per unit). Units: employee-months for attendance,
+# punch rows for punch logs, register rows for invoices, upload MB for bank
+# statements. About twice the tracemalloc peaks from `benchmarks.run`, to
+# allow for what the process holds beyond Python allocations.
+COSTS = {
+    "attendance": (10, 0.2),
+    "attendance_records": (10, 0.02),
+    "attendance_punches": (10, 0.003),
+    "invoices": (5, 0.02),
+    "bank": (30, 5.0),
+}
+
+
+def estimate_cost(tool, units):
+    """Estimated peak memory in MB of one `tool` run over `units` of input."""
+    fixed, per_unit = COSTS[tool]
+    return fixed + per_unit * max(units, 0)
+
+
+class AdmissionTimeout(RuntimeError):
+    """Raised when a run waited longer than its `timeout` for admission."""
+
+
+class Governor:
+    def __init__(self, budget_mb=None, max_runs=None):
+        self.budget_mb = budget_mb or int(os.environ.get("NFP_HEAVY_BUDGET_MB", 1024))
+        self.max_runs = max_runs or int(os.environ.get("NFP_HEAVY_MAX_RUNS", 2))
+        self._cond = threading.Condition()
+        self._queue = deque()      # tickets waiting, oldest first
+        self._running = {}         # ticket -> (tool, cost)
+        self._tickets = itertools.count()
+
+    def _fits(self, cost):
+        if not self._running:
+            return True
+        in_use = sum(c for _, c in self._running.values())
+        return len(self._running) < self.max_runs and in_use + cost <= self.budget_mb
+
+    @contextmanager
+    def admit(self, tool, cost, on_wait=None, timeout=None, poll=1.0):
+        """Blocks until the run may start, then holds its slot for the `with` block.
+
+        `on_wait(position, running)` is called while queued (position 1 is
+        next in line) and may raise to give up; the place in line is released
+        either way.
+        """
+        ticket = next(self._tickets)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    if self._queue[0] == ticket and self._fits(cost):
+                        self._queue.popleft()
+                        self._running[ticket] = (tool, cost)
+                        self._cond.notify_all()   # the next in line may fit too
+                        break
+                    position, running = self._queue.index(ticket) + 1, len(self._running)
+                # Outside the lock: the callback may update the page or raise
+                if on_wait:
+                    on_wait(position, running)
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise AdmissionTimeout(f"{tool} run not admitted within {timeout:g}s")
+                with self._cond:
+                    if not (self._queue[0] == ticket and self._fits(cost)):
+                        self._cond.wait(poll if deadline is None else max(0.0, min(poll, deadline - time.monotonic())))
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    self._cond.notify_all()
+            raise
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                del self._running[ticket]
+                self._cond.notify_all()
+
+    def status(self):
+        """Runs in progress (tool, estimated MB) and how many are queued."""
+        with self._cond:
+            return {"running": list(self._running.values()), "queued": len(self._queue),
+                    "budget_mb": self.budget_mb, "max_runs": self.max_runs}
+
+
+GOVERNOR = Governor()
@@ -0,0 +1,109 @@
+"""Persistent gazetted-holiday calendar.
+
+Holidays are kept in a small SQLite table keyed by ISO date, so they survive
+sessions and a month's holidays are one indexed range query instead of a scan
+over everything ever entered. The attendance engine takes the result of
+`month()` / `months()` directly as its `holidays_dict`.
+
+    holidays = HolidayCalendar()                  # NFP_DATA_DIR/holidays.sqlite3
+    holidays.bulk_import([(datetime.date(2026, 2, 5), "Kashmir Day"), ...])
+    holidays.month(2026, 2)                       # {date(2026, 2, 5): "Kashmir Day"}
+"""
+import calendar
+import datetime
+import os
+import sqlite3
+from contextlib import contextmanager
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS holidays (
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (day, name)
+) WITHOUT ROWID;
+"""
+
+
+def default_path():
+    root = os.environ.get("NFP_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".nfp")
+    return os.path.join(root, "holidays.sqlite3")
+
+
+def _day(value):
+    """ISO key for a date, datetime, Timestamp or 'YYYY-MM-DD' string."""
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value.strip()[:10]).isoformat()
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+class HolidayCalendar:
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, day, name):
+        return self.bulk_import([(day, name)])
+
+    def bulk_import(self, holidays):
+        """Adds `(date, name)` pairs in one transaction; returns how many were new."""
+        rows = [(_day(day), str(name).strip()) for day, name in holidays if str(name).strip()]
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO holidays (day, name) VALUES (?, ?)", rows)
+            return conn.total_changes - before
+
+    def import_frame(self, df, title="Holiday list"):
+        """Bulk import from an uploaded sheet normalized with `HOLIDAY_COLUMNS`.
+
+        Blank lines are skipped. Rows with a name but no readable date raise a
+        `SchemaError` naming them, and nothing is imported.
+        """
+        from nfp.schema import SchemaError, bad_rows
+        named = df["name"].notna() & (df["name"].astype(str).str.strip() != "")
+        undated = df["date"].isna() & named
+        if undated.any():
+            raise SchemaError(title, [f"'Date' is missing or not a date in row(s) {bad_rows(undated)}"])
+        valid = df[df["date"].notna()]
+        return self.bulk_import(zip(valid["date"], valid["name"]))
+
+    def remove(self, start, end=None):
+        """Deletes every holiday from `start` through `end` (default: just `start`)."""
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM holidays WHERE day BETWEEN ? AND ?", (_day(start), _day(end or start)))
+            return cur.rowcount
+
+    def between(self, start, end):
+        """`(date, name)` pairs from `start` through `end`, in date order."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT day, name FROM holidays WHERE day BETWEEN ? AND ? ORDER BY day, name",
+                                (_day(start), _day(end))).fetchall()
+        return [(datetime.date.fromisoformat(day), name) for day, name in rows]
+
+    def holiday_map(self, start, end):
+        """`{date: name}` for the engine; several holidays on one day are joined with ' / '."""
+        holidays = {}
+        for day, name in self.between(start, end):
+            holidays[day] = f"{holidays[day]} / {name}" if day in holidays else name
+        return holidays
+
+    def month(self, year, month):
+        return self.months([(year, month)])
+
+    def months(self, months):
+        """Holiday map covering every `(year, month)` in a sorted list (see `months_in_range`)."""
+        (first_year, first_month), (last_year, last_month) = months[0], months[-1]
+        last_day = calendar.monthrange(last_year, last_month)[1]
+        return self.holiday_map(datetime.date(first_year, first_month, 1), datetime.date(last_year, last_month, last_day))
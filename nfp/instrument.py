@@ -0,0 +1,160 @@
+"""Per-stage timing and memory instrumentation for tool runs.
+
+Generators mark their stages with `span("ingest" | "compute" | "render" |
+"serialize")`. Spans only record when a `Trace` is active for the current
+context, so engine code called without one (tests, benchmarks) pays nothing.
+Repeated spans with the same name (e.g. "render" once per employee) are
+aggregated into one row per stage.
+
+    trace = Trace("attendance", memory=True)
+    with trace:
+        generate_attendance_file(...)
+    trace.log()            # one structured record per stage on the nfp.perf logger
+    trace.records()        # rows for the UI "Performance" panel
+
+`memory=True` turns on tracemalloc for the duration of the trace (it slows
+allocation-heavy code, so it is opt-in); `profile=True` also runs cProfile
+and exposes the stats for download.
+
+tracemalloc covers the whole process, while the server runs one trace per
+session. It is started by the first memory trace and stopped by the last
+one to finish, and the peak is only reset between spans while a single
+memory trace is running. With several at once, each stage's peak is the
+process peak since that point, so it includes the other runs' memory.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger("nfp.perf")
+
+_active_trace = contextvars.ContextVar("nfp_active_trace", default=None)
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0          # memory traces currently running, in any thread
+_started_tracing = False    # False if tracemalloc was already on (e.g. python -X tracemalloc)
+
+
+def _start_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _reset_peak():
+    with _tracing_lock:
+        if _tracing_users == 1:   # resetting under another run would cut its peak short
+            tracemalloc.reset_peak()
+
+
+class Trace:
+    def __init__(self, job, memory=False, profile=False):
+        self.job = job
+        self.memory = memory
+        self.profiler = cProfile.Profile() if profile else None
+        self.stages = {}
+        self._stack = []       # running tracemalloc peak carried up from nested spans
+        self._token = None
+        self._tracing = 0
+
+    def __enter__(self):
+        self._token = _active_trace.set(self)
+        if self.memory:
+            _start_tracing()
+            self._tracing += 1
+        if self.profiler:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler:
+            self.profiler.disable()
+        if self._tracing:
+            _stop_tracing()
+            self._tracing -= 1
+        _active_trace.reset(self._token)
+        return False
+
+    def _record(self, stage, wall, cpu, peak):
+        rec = self.stages.setdefault(stage, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_mb": None})
+        rec["calls"] += 1
+        rec["wall_s"] += wall
+        rec["cpu_s"] += cpu
+        if peak is not None:
+            rec["peak_mb"] = max(rec["peak_mb"] or 0.0, peak / 2**20)
+
+    def records(self):
+        """One row per stage, in first-seen order."""
+        return [{"job": self.job, "stage": stage, "calls": r["calls"],
+                 "wall_s": round(r["wall_s"], 4), "cpu_s": round(r["cpu_s"], 4),
+                 "peak_mb": round(r["peak_mb"], 2) if r["peak_mb"] is not None else None}
+                for stage, r in self.stages.items()]
+
+    def total_wall(self):
+        return sum(r["wall_s"] for r in self.stages.values())
+
+    def log(self):
+        for rec in self.records():
+            logger.info(json.dumps(rec))
+
+    def profile_text(self, limit=25):
+        """Top functions by cumulative time, as printed by pstats."""
+        if not self.profiler:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def profile_bytes(self):
+        """cProfile dump in the standard .prof format (snakeviz, pstats.Stats(path))."""
+        if not self.profiler:
+            return b""
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+
+@contextmanager
+def span(stage):
+    """Times a stage of the active trace (no-op when none is active)."""
+    trace = _active_trace.get()
+    if trace is None:
+        yield
+        return
+
+    if trace.memory and tracemalloc.is_tracing():
+        # Keep the enclosing span's peak before resetting for this one
+        if trace._stack:
+            trace._stack[-1] = max(trace._stack[-1], tracemalloc.get_traced_memory()[1])
+        _reset_peak()
+        trace._stack.append(0)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        peak = None
+        if trace.memory and tracemalloc.is_tracing():
+            peak = max(trace._stack.pop(), tracemalloc.get_traced_memory()[1])
+            if trace._stack:
+                trace._stack[-1] = max(trace._stack[-1], peak)
+        trace._record(stage, wall, cpu, peak)
@@ -0,0 +1,577 @@
+"""GST invoice generators (printable HTML and Excel) for a sales register."""
+import hashlib
+import html
+import random
+import re
+import zipfile
+
+import pandas as pd
+from openpyxl.styles import Font, Border, Side, Alignment, PatternFill
+
+from nfp.fragments import content_key
+from nfp.instrument import span
+from nfp.schema import INVOICE_COLUMNS, normalize_frame
+from nfp.spool import rewind, spooled_output
+
+
+def num_to_words(n):
+    ones = ['', 'One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 'Eleven', 'Twelve', 'Thirteen', 'Fourteen', 'Fifteen', 'Sixteen', 'Seventeen', 'Eighteen', 'Nineteen']
+    tens = ['', '', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Sixty', 'Seventy', 'Eighty', 'Ninety']
+
+    def convert(n):
+        if n < 20: return ones[n]
+        if n < 100: return tens[n // 10] + ('' if n % 10 == 0 else ' ' + ones[n % 10])
+        if n < 1000: return ones[n // 100] + ' Hundred' + ('' if n % 100 == 0 else ' and ' + convert(n % 100))
+        if n < 1000000: return convert(n // 1000) + ' Thousand' + ('' if n % 1000 == 0 else ' ' + convert(n % 1000))
+        if n < 1000000000: return convert(n // 1000000) + ' Million' + ('' if n % 1000000 == 0 else ' ' + convert(n % 1000000))
+        return 'Number too large'
+
+    if n == 0: return 'Zero'
+    
+    num_str = f"{n:.2f}"
+    integer_part, decimal_part = num_str.split('.')
+    words = convert(int(integer_part))
+    if int(decimal_part) > 0:
+        words += " and " + convert(int(decimal_part)) + " Paisa"
+    return words + " Only"
+
+def _esc(value):
+    """A sheet or header value as HTML text."""
+    return html.escape(str(value))
+
+def render_invoice_html(group, header_info, tax_rate):
+    """Renders one DC (all rows of `group`, a normalized sales register slice) as invoice HTML."""
+    header_info = {key: _esc(value) for key, value in header_info.items()}
+    header_row = next(group.itertuples())
+    customer_name = _esc(header_row.customer_name)
+    bill_address = _esc(header_row.bill_to_address)
+    customer_ntn = _esc(header_row.customer_ntn)
+    invoice_no = _esc(header_row.invoice_no)
+    
+    raw_date = header_row.invoice_date
+    try:
+        invoice_date = pd.to_datetime(raw_date).strftime('%d-%b-%Y')
+    except:
+        invoice_date = _esc(raw_date)
+        
+    payment_terms = _esc(header_row.credit_terms)
+    
+    sub_total = group['total_value'].sum()
+    tax_amount = sub_total * (tax_rate / 100)
+    grand_total = sub_total + tax_amount
+    amount_in_words = num_to_words(grand_total)
+    
+    rows_html = ""
+    for row in group.itertuples():
+        u_price = f"{row.unit_price:,.2f}"
+        t_value = f"{row.total_value:,.2f}"
+        
+        rows_html += f"""
+            <tr class="bg-white">
+                <td class="p-1 text-center">{row.Index + 1}</td>
+                <td class="p-1">{_esc(row.hs_code)}</td>
+                <td class="p-1 wrap-text">{_esc(row.item_description)}</td>
+                <td class="p-1">Weaving</td> 
+                <td class="p-1">JOB-{random.randint(1000,9999)}</td>
+                <td class="p-1">{_esc(row.dc_no)}</td>
+                <td class="p-1">{_esc(row.uom)}</td>
+                <td class="p-1 text-center">{_esc(row.qty)}</td>
+                <td class="p-1 text-right">{u_price}</td>
+                <td class="p-1 text-right">{t_value}</td>
+            </tr>
+            """
+        
+    for _ in range(max(0, 8 - len(group))):
+         rows_html += '<tr class="bg-white"><td class="p-2 text-center">&nbsp;</td><td></td><td class="wrap-text"></td><td></td><td></td><td></td><td></td><td></td><td></td><td></td></tr>'
+
+    invoice_html = f"""
+        <div class="printable-container max-w-6xl mx-auto bg-white p-6 md:p-8 mb-8" style="page-break-after: always;">
+            <header class="flex justify-between items-start pb-4">
+                <div>
+                    <h1 class="text-2xl md:text-3xl font-bold text-gray-800">{header_info['company_name']}</h1>
+                    <p class="text-sm text-gray-500">{header_info['address']}</p>
+                    <p class="text-sm text-gray-500">Phones: {header_info['phone']}</p>
+                    <p class="text-sm text-gray-500">E-mail: {header_info['email']} | Website: {header_info['web']}</p>
+                    <p class="text-sm text-gray-500 font-semibold mt-1">NTN: {header_info['ntn']}</p>
+                </div>
+                <div class="text-right">
+                    <h2 class="text-2xl md:text-3xl font-semibold text-gray-700">SALES TAX INVOICE</h2>
+                    <div class="mt-2 grid grid-cols-2 gap-2 text-left">
+                        <label class="block text-xs font-medium text-gray-500 p-1">Invoice No.</label>
+                        <div class="field block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">{invoice_no}</div>
+                        
+                        <label class="block text-xs font-medium text-gray-500 p-1">Invoice Date</label>
+                        <div class="field block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">{invoice_date}</div>
+                        
+                        <label class="block text-xs font-medium text-gray-500 p-1">Payment Terms</label>
+                        <div class="field block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">{payment_terms}</div>
+
+                        <label class="block text-xs font-medium text-gray-500 p-1">Customer PO</label>
+                        <div class="field block w-full p-1 border-2 border-black rounded-md shadow-sm text-sm text-black font-medium">PO-REF-XX</div>
+                    </div>
+                </div>
+            </header>
+
+            <div class="main-content">
+                <section class="grid grid-cols-2 gap-6 mt-6 section-spacing">
+                    <div class="border-2 border-black rounded-md p-3">
+                        <h3 class="text-sm font-semibold text-white mb-2 bg-gray-700 p-1 -m-3 border-b border-black dark-bg print-header">BILL TO</h3>
+                        <div class="mt-3">
+                            <label class="block text-xs font-medium text-black font-bold">Customer Name</label>
+                            <div class="field mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium">{customer_name}</div>
+                        </div>
+                        <div class="mt-2">
+                            <label class="block text-xs font-medium text-black font-bold">Address</label>
+                            <div class="field field-2 mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium">{bill_address}</div>
+                        </div>
+                        <div class="mt-2 grid grid-cols-2 gap-2">
+                             <div>
+                                <label class="block text-xs font-medium text-black font-bold">NTN</label>
+                                <div class="field mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium">{customer_ntn}</div>
+                             </div>
+                             <div>
+                                <label class="block text-xs font-medium text-black font-bold">STRN</label>
+                                <div class="field mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm text-black dark-border font-medium"></div>
+                             </div>
+                        </div>
+                    </div>
+                    <div class="border-2 border-black rounded-md p-3">
+                        <h3 class="text-sm font-semibold text-white mb-2 bg-gray-700 p-1 -m-3 border-b border-black dark-bg print-header">SHIP TO</h3>
+                        <div class="mt-3">
+                            <p class="text-sm font-semibold text-black">{customer_name}</p>
+                            <p class="text-sm text-black">{bill_address}</p>
+                        </div>
+                    </div>
+                </section>
+    
+                <section class="mt-6 table-container section-spacing">
+                    <h3 class="text-lg font-semibold text-gray-700 mb-2">Item Details</h3>
+                    <table class="w-full text-sm text-left text-gray-500 printable-table">
+                        <thead class="text-xs text-white uppercase bg-gray-700 dark-bg print-header" style="-webkit-print-color-adjust: exact;">
+                            <tr>
+                                <th class="p-2 text-center" style="width: 3%;">Sr.</th>
+                                <th class="p-2" style="width: 8%;">H.S Code</th>
+                                <th class="p-2 wrap-text" style="width: 25%;">Item Description</th>
+                                <th class="p-2" style="width: 10%;">Cost Center</th>
+                                <th class="p-2" style="width: 10%;">Job No.</th>
+                                <th class="p-2" style="width: 10%;">DC No.</th>
+                                <th class="p-2" style="width: 4%;">UOM</th>
+                                <th class="p-2 text-center" style="width: 5%;">Qty</th>
+                                <th class="p-2 text-right" style="width: 10%;">Unit Price</th>
+                                <th class="p-2 text-right" style="width: 15%;">Total Value</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            {rows_html}
+                        </tbody>
+                    </table>
+                </section>
+                
+                <section class="grid grid-cols-2 gap-6 mt-6 section-spacing">
+                    <div>
+                        <label class="block text-sm font-medium text-black font-bold">Amount in Words (PKR)</label>
+                        <div class="field field-2 mt-1 block w-full p-2 border-2 border-black rounded-md shadow-sm text-sm dark-border text-black">{amount_in_words}</div>
+                    </div>
+                    <div class="space-y-2">
+                        <div class="flex justify-between items-center bg-gray-700 text-white p-2 rounded-md border-2 border-black dark-bg print-total-box">
+                            <span class="text-sm font-bold text-white">Sub-Total:</span>
+                            <span class="text-sm font-bold text-white">{sub_total:,.2f}</span>
+                        </div>
+                        <div class="flex justify-between items-center p-2">
+                            <div class="text-sm font-bold text-black">
+                                Sales Tax ({tax_rate}%):
+                            </div>
+                            <span class="text-sm font-bold text-black">{tax_amount:,.2f}</span>
+                        </div>
+                        <div class="flex justify-between items-center bg-gray-700 text-white p-3 rounded-md border-2 border-black dark-bg print-total-box">
+                            <span class="text-base font-bold text-white">Grand Total:</span>
+                            <span class="text-base font-bold text-white">{grand_total:,.2f}</span>
+                        </div>
+                    </div>
+                </section>
+            </div>
+
+            <footer class="mt-8">
+                <div class="grid grid-cols-2 gap-8">
+                    <div></div>
+                    <div class="text-center">
+                        <p class="signature-line pt-2 text-sm font-semibold text-gray-700">For {header_info['company_name']}</p>
+                        <p class="text-xs text-gray-500">(Authorized Signatory)</p>
+                    </div>
+                </div>
+            </footer>
+        </div>
+        """
+    return invoice_html
+
+# Pre-built from the Tailwind utilities the invoice template uses (and only
+# those), so the file renders offline without compiling styles in the browser.
+# Add a rule here when the template gains a class.
+INVOICE_CSS = """
+            *, ::before, ::after { box-sizing: border-box; border: 0 solid #e5e7eb; }
+            html { line-height: 1.5; -webkit-text-size-adjust: 100%; }
+            body { margin: 0; line-height: inherit; }
+            h1, h2, h3, p { margin: 0; font-size: inherit; font-weight: inherit; }
+            table { border-collapse: collapse; text-indent: 0; border-color: inherit; }
+            th { text-align: inherit; font-weight: inherit; }
+            button { font: inherit; color: inherit; margin: 0; padding: 0; background-color: transparent; cursor: pointer; }
+
+            .block { display: block; } .flex { display: flex; } .grid { display: grid; }
+            .grid-cols-2 { grid-template-columns: repeat(2, minmax(0, 1fr)); }
+            .gap-2 { gap: 0.5rem; } .gap-6 { gap: 1.5rem; } .gap-8 { gap: 2rem; }
+            .justify-between { justify-content: space-between; }
+            .items-start { align-items: flex-start; } .items-center { align-items: center; }
+            .space-y-2 > * + * { margin-top: 0.5rem; }
+            .fixed { position: fixed; } .bottom-4 { bottom: 1rem; } .right-4 { right: 1rem; }
+            .w-full { width: 100%; } .max-w-6xl { max-width: 72rem; } .mx-auto { margin-left: auto; margin-right: auto; }
+
+            .p-1 { padding: 0.25rem; } .p-2 { padding: 0.5rem; } .p-3 { padding: 0.75rem; }
+            .p-4 { padding: 1rem; } .p-6 { padding: 1.5rem; } .px-6 { padding-left: 1.5rem; padding-right: 1.5rem; }
+            .py-3 { padding-top: 0.75rem; padding-bottom: 0.75rem; } .pb-4 { padding-bottom: 1rem; } .pt-2 { padding-top: 0.5rem; }
+            .-m-3 { margin: -0.75rem; } .mb-2 { margin-bottom: 0.5rem; } .mb-8 { margin-bottom: 2rem; }
+            .mt-1 { margin-top: 0.25rem; } .mt-2 { margin-top: 0.5rem; } .mt-3 { margin-top: 0.75rem; }
+            .mt-6 { margin-top: 1.5rem; } .mt-8 { margin-top: 2rem; }
+
+            .border-2 { border-width: 2px; } .border-b { border-bottom-width: 1px; } .border-black { border-color: #000000; }
+            .rounded-md { border-radius: 0.375rem; } .rounded-full { border-radius: 9999px; }
+            .shadow-sm { box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.05); }
+            .shadow-lg { box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -4px rgba(0, 0, 0, 0.1); }
+            .bg-white { background-color: #ffffff; } .bg-gray-700 { background-color: #374151; }
+            .bg-blue-600 { background-color: #2563eb; } .hover\\:bg-blue-700:hover { background-color: #1d4ed8; }
+            .transition { transition: color, background-color, border-color, box-shadow 150ms cubic-bezier(0.4, 0, 0.2, 1); }
+
+            .text-xs { font-size: 0.75rem; line-height: 1rem; } .text-sm { font-size: 0.875rem; line-height: 1.25rem; }
+            .text-base { font-size: 1rem; line-height: 1.5rem; } .text-lg { font-size: 1.125rem; line-height: 1.75rem; }
+            .text-2xl { font-size: 1.5rem; line-height: 2rem; }
+            .font-medium { font-weight: 500; } .font-semibold { font-weight: 600; } .font-bold { font-weight: 700; }
+            .uppercase { text-transform: uppercase; }
+            .text-left { text-align: left; } .text-center { text-align: center; } .text-right { text-align: right; }
+            .text-white { color: #ffffff; } .text-black { color: #000000; } .text-gray-500 { color: #6b7280; }
+            .text-gray-700 { color: #374151; } .text-gray-800 { color: #1f2937; }
+            @media (min-width: 768px) {
+                .md\\:p-8 { padding: 2rem; }
+                .md\\:text-3xl { font-size: 1.875rem; line-height: 2.25rem; }
+            }
+
+            .field { min-height: calc(1.75rem + 4px); white-space: pre-wrap; }
+            .field.p-2 { min-height: calc(2.25rem + 4px); }
+            .field-2.p-2 { min-height: calc(3.5rem + 4px); }
+            .wrap-text { overflow-wrap: anywhere; }
+"""
+
+HTML_HEAD = """
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Sales Tax Invoices</title>
+        <style>""" + INVOICE_CSS + """
+            body { background-color: #f9fafb; font-family: Calibri, sans-serif; }
+            @media print {
+                @page { size: A4 portrait; margin: 0.1cm; margin-bottom: 0.5cm; }
+                html, body { background-color: #fff; font-size: 9pt; }
+                .no-print { display: none; }
+                .printable-table th { background-color: #374151 !important; color: #ffffff !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }
+                .print-header { background-color: #374151 !important; color: #ffffff !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }
+                .print-total-box { background-color: #374151 !important; color: #ffffff !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }
+                .text-black { color: #000000 !important; }
+                .text-gray-500, .text-gray-600, .text-gray-700, .text-gray-800 { color: #000000 !important; }
+                .border-black { border-color: #000000 !important; border-width: 2px !important; border-style: solid !important; }
+                .border-2 { border-width: 2px !important; }
+            }
+            .signature-line { border-top: 1px solid #4A5568; margin-top: 2.5rem; }
+            .printable-table, .printable-table th, .printable-table td { border: 1px solid #000000 !important; border-collapse: collapse; }
+        </style>
+    </head>
+    <body class="p-4 md:p-8">
+        """
+
+HTML_TAIL = """
+        <div class="fixed bottom-4 right-4 no-print">
+            <button onclick="window.print()" class="px-6 py-3 bg-blue-600 text-white font-bold rounded-full shadow-lg hover:bg-blue-700 transition">
+                🖨️ Print Invoices
+            </button>
+        </div>
+    </body>
+    </html>
+    """
+
+# --- INCREMENTAL REGENERATION ---
+# The sales register grows through the month, so most DCs are the same on
+# every upload. With a FragmentCache, each DC's rendered invoice (HTML, and
+# its block of Excel rows) is stored under a hash of its lines, the header
+# and the tax rate, and only new or modified DCs are rendered again.
+
+INVOICE_CACHE_VERSION = 3   # bump when render_invoice_html or write_invoice_block output changes
+
+
+def _dc_keys(sales, header_info, tax_rate):
+    """`{dc_no: (key, positions)}` in DC order; `key` covers the DC's lines (with their Sr.), header and rate."""
+    row_hashes = pd.util.hash_pandas_object(sales, index=True).to_numpy()
+    return {
+        dc_no: (content_key("invoice", INVOICE_CACHE_VERSION, dc_no, hashlib.sha256(row_hashes[positions].tobytes()).hexdigest(),
+                            header_info, tax_rate), positions)
+        for dc_no, positions in sales.groupby('dc_no').indices.items()
+    }
+
+
+def invoice_changes(input_df, header_info, tax_rate, cache):
+    """Which DCs a run with `cache` will render again: one row per DC with status new / modified / unchanged.
+
+    Call before generating; the generators record what they rendered.
+    """
+    sales = normalize_frame(input_df, INVOICE_COLUMNS, title="Sales register")
+    dc_keys = _dc_keys(sales, header_info, tax_rate)
+    rendered = cache.get_many("invoice-html", [key for key, _ in dc_keys.values()])
+    seen = cache.get_many("invoice-dc", [content_key("invoice-dc", dc_no) for dc_no in dc_keys])
+    rows = []
+    for dc_no, (key, positions) in dc_keys.items():
+        first = sales.iloc[positions[0]]
+        status = "unchanged" if key in rendered else "modified" if content_key("invoice-dc", dc_no) in seen else "new"
+        rows.append({"dc_no": dc_no, "invoice_no": first["invoice_no"], "customer_name": first["customer_name"],
+                     "lines": len(positions), "status": status})
+    return pd.DataFrame(rows, columns=["dc_no", "invoice_no", "customer_name", "lines", "status"])
+
+
+def _remember_dcs(cache, dc_keys):
+    cache.put_many("invoice-dc", [(content_key("invoice-dc", dc_no), key, b"") for dc_no, (key, _) in dc_keys.items()])
+
+
+def generate_html_invoice(input_df, header_info, tax_rate, cache=None):
+    """Printable HTML for every DC, as a spooled UTF-8 file written one invoice at a time.
+
+    With a `cache` (FragmentCache), DCs unchanged since an earlier run are
+    copied from it instead of rendered.
+    """
+    with span("ingest"):
+        sales = normalize_frame(input_df, INVOICE_COLUMNS, title="Sales register")
+    output = spooled_output()
+    output.write(HTML_HEAD.encode("utf-8"))
+
+    if cache is None:
+        with span("render"):
+            for dc_no, group in sales.groupby('dc_no'):
+                output.write(render_invoice_html(group, header_info, tax_rate).encode("utf-8"))
+    else:
+        with span("ingest"):
+            dc_keys = _dc_keys(sales, header_info, tax_rate)
+            cached = cache.get_many("invoice-html", [key for key, _ in dc_keys.values()])
+        new_fragments = []
+        with span("render"):
+            for dc_no, (key, positions) in dc_keys.items():
+                if key in cached:
+                    page = cached[key][1]
+                else:
+                    page = render_invoice_html(sales.iloc[positions], header_info, tax_rate).encode("utf-8")
+                    new_fragments.append((key, dc_no, page))
+                output.write(page)
+        cache.put_many("invoice-html", new_fragments)
+        _remember_dcs(cache, dc_keys)
+        cache.purge()
+
+    output.write(HTML_TAIL.encode("utf-8"))
+    return rewind(output)
+
+def write_invoice_block(ws, current_row, group, header_info, tax_rate, styles):
+    """Writes one DC's invoice starting at `current_row`; returns the next free row."""
+    header_font = styles['header_font']
+    sub_header_font = styles['sub_header_font']
+    thin_border = styles['thin_border']
+
+    header_row = next(group.itertuples())
+    invoice_no = header_row.invoice_no
+    raw_date = header_row.invoice_date
+    invoice_date = raw_date if isinstance(raw_date, str) else raw_date.strftime('%d-%b-%Y')
+    
+    ws.cell(row=current_row, column=1, value=header_info['company_name']).font = header_font
+    ws.cell(row=current_row, column=8, value="SALES TAX INVOICE").font = header_font
+    current_row += 1
+    ws.cell(row=current_row, column=1, value=header_info['address']).font = sub_header_font
+    ws.cell(row=current_row, column=8, value=f"Invoice No: {invoice_no}").font = sub_header_font
+    current_row += 1
+    ws.cell(row=current_row, column=1, value=f"Phone: {header_info['phone']}").font = sub_header_font
+    ws.cell(row=current_row, column=8, value=f"Date: {invoice_date}").font = sub_header_font
+    current_row += 1
+    ws.cell(row=current_row, column=1, value=f"NTN: {header_info['ntn']}").font = sub_header_font
+    current_row += 2 
+    
+    ws.cell(row=current_row, column=1, value="BILL TO").font = Font(bold=True)
+    ws.cell(row=current_row, column=2, value=header_row.customer_name)
+    current_row += 1
+    ws.cell(row=current_row, column=1, value="Address").font = Font(bold=True)
+    ws.cell(row=current_row, column=2, value=header_row.bill_to_address)
+    current_row += 1
+    ws.cell(row=current_row, column=1, value="NTN").font = Font(bold=True)
+    ws.cell(row=current_row, column=2, value=header_row.customer_ntn)
+    current_row += 2
+    
+    headers = ["Sr.", "H.S Code", "Description", "Cost Center", "Job No", "DC No", "UOM", "Qty", "Unit Price", "Total"]
+    for col_idx, h in enumerate(headers, 1):
+        c = ws.cell(row=current_row, column=col_idx, value=h)
+        c.font = styles['table_header_font']
+        c.fill = styles['fill_dark']
+        c.alignment = Alignment(horizontal='center')
+    current_row += 1
+    
+    sub_total = 0
+    for row in group.itertuples():
+        ws.cell(row=current_row, column=1, value=row.Index+1).border = thin_border
+        ws.cell(row=current_row, column=2, value=row.hs_code).border = thin_border
+        ws.cell(row=current_row, column=3, value=row.item_description).border = thin_border
+        ws.cell(row=current_row, column=4, value="Weaving").border = thin_border
+        ws.cell(row=current_row, column=5, value="JOB-XXXX").border = thin_border
+        ws.cell(row=current_row, column=6, value=row.dc_no).border = thin_border
+        ws.cell(row=current_row, column=7, value=row.uom).border = thin_border
+        ws.cell(row=current_row, column=8, value=row.qty).border = thin_border
+        ws.cell(row=current_row, column=9, value=row.unit_price).border = thin_border
+        total_val = row.total_value
+        ws.cell(row=current_row, column=10, value=total_val).border = thin_border
+        sub_total += total_val
+        current_row += 1
+        
+    tax_amount = sub_total * (tax_rate / 100)
+    grand_total = sub_total + tax_amount
+    
+    current_row += 1
+    ws.cell(row=current_row, column=9, value="Sub-Total").font = Font(bold=True)
+    ws.cell(row=current_row, column=10, value=sub_total).font = Font(bold=True)
+    current_row += 1
+    ws.cell(row=current_row, column=9, value=f"GST ({tax_rate}%)").font = Font(bold=True)
+    ws.cell(row=current_row, column=10, value=tax_amount).font = Font(bold=True)
+    current_row += 1
+    ws.cell(row=current_row, column=9, value="Grand Total").font = Font(bold=True)
+    ws.cell(row=current_row, column=10, value=grand_total).font = Font(bold=True)
+    
+    current_row += 1
+    ws.cell(row=current_row, column=1, value="Amount in Words: " + num_to_words(grand_total)).font = Font(italic=True)
+    current_row += 4
+    return current_row
+
+def invoice_excel_styles():
+    return {
+        "header_font": Font(name='Calibri', size=14, bold=True),
+        "sub_header_font": Font(name='Calibri', size=10),
+        "table_header_font": Font(name='Calibri', size=10, bold=True, color="FFFFFF"),
+        "fill_dark": PatternFill(start_color="4A5568", end_color="4A5568", fill_type="solid"),
+        "thin_border": Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin')),
+    }
+
+def _invoice_sheet(writer):
+    ws = writer.book.create_sheet("Invoices")
+    ws.column_dimensions['A'].width = 5
+    ws.column_dimensions['B'].width = 10
+    ws.column_dimensions['C'].width = 30
+    ws.column_dimensions['D'].width = 10
+    ws.column_dimensions['E'].width = 10
+    ws.column_dimensions['F'].width = 10
+    ws.column_dimensions['G'].width = 8
+    ws.column_dimensions['H'].width = 8
+    ws.column_dimensions['I'].width = 12
+    ws.column_dimensions['J'].width = 15
+    return ws
+
+def generate_excel_invoice(input_df, header_info, tax_rate, cache=None):
+    """All invoices stacked on one sheet, as a spooled workbook.
+
+    With a `cache` (FragmentCache), the rows of DCs unchanged since an earlier
+    run are copied from it instead of rendered.
+    """
+    output = spooled_output()
+    with span("ingest"):
+        sales = normalize_frame(input_df, INVOICE_COLUMNS, title="Sales register")
+    if cache is not None and len(sales):
+        return _write_excel_incremental(output, sales, header_info, tax_rate, cache)
+
+    grouped = sales.groupby('dc_no')
+    styles = invoice_excel_styles()
+    
+    writer = pd.ExcelWriter(output, engine='openpyxl')
+    with span("render"):
+        ws = _invoice_sheet(writer)
+        
+        current_row = 1
+        for dc_no, group in grouped:
+            current_row = write_invoice_block(ws, current_row, group, header_info, tax_rate, styles)
+            
+        if 'Sheet' in writer.book.sheetnames:
+            writer.book.remove(writer.book['Sheet'])
+    with span("serialize"):
+        writer.close()
+    return rewind(output)
+
+# A row is either self-closing or runs to its </row>; cells inside it can be
+# self-closing too (e.g. a blank string cell, `<c r="B8" t="inlineStr" />`).
+_ROW = re.compile(rb'<row r="(\d+)"(?:[^>]*/>|[^>]*>.*?</row>)', re.S)
+_ROW_REF = re.compile(rb'(<row r="|<c r="[A-Z]+)(\d+)')
+
+
+def _shift_rows(rows_xml, delta):
+    """Row XML moved `delta` rows down (row numbers and cell references)."""
+    return _ROW_REF.sub(lambda m: m.group(1) + str(int(m.group(2)) + delta).encode(), rows_xml)
+
+
+def _render_invoice_blocks(sales, dc_keys, rendered, cached, header_info, tax_rate):
+    """Workbook with only the `rendered` DC keys written; returns `(package, sheet_path, starts, next_row)`."""
+    book_file = spooled_output()
+    writer = pd.ExcelWriter(book_file, engine='openpyxl')
+    styles = invoice_excel_styles()
+    with span("render"):
+        ws = _invoice_sheet(writer)
+        current_row, starts = 1, []
+        for key, positions in dc_keys.values():
+            starts.append(current_row)
+            if key in rendered:
+                current_row = write_invoice_block(ws, current_row, sales.iloc[positions], header_info, tax_rate, styles)
+            else:
+                current_row += cached[key][0]["height"]
+        if 'Sheet' in writer.book.sheetnames:
+            writer.book.remove(writer.book['Sheet'])
+    with span("serialize"):
+        writer.close()
+    return zipfile.ZipFile(rewind(book_file)), ws.path.lstrip("/"), starts, current_row
+
+def _write_excel_incremental(output, sales, header_info, tax_rate, cache):
+    with span("ingest"):
+        dc_keys = _dc_keys(sales, header_info, tax_rate)
+        keys = [key for key, _ in dc_keys.values()]
+        cached = cache.get_many("invoice-xlsx", keys)
+
+    # Style ids in the cached rows index the workbook's style table, which
+    # openpyxl builds from the cells it writes: always rendering the first DC
+    # keeps that table the same however few DCs changed.
+    rendered = {key for key in keys if key not in cached} | {keys[0]}
+    package, sheet_path, starts, next_row = _render_invoice_blocks(sales, dc_keys, rendered, cached, header_info, tax_rate)
+    styles_key = content_key(package.read("xl/styles.xml"))
+    if any(cached[key][0]["styles"] != styles_key for key in keys if key not in rendered):
+        rendered = set(keys)   # cached rows are from another style table (e.g. openpyxl upgrade)
+        package, sheet_path, starts, next_row = _render_invoice_blocks(sales, dc_keys, rendered, cached, header_info, tax_rate)
+
+    with span("serialize"):
+        sheet = package.read(sheet_path)
+        head, _, rest = sheet.partition(b"<sheetData>")
+        body, _, tail = rest.partition(b"</sheetData>")
+        rows = {int(m.group(1)): m.group(0) for m in _ROW.finditer(body)}
+
+        blocks, new_fragments = [], []
+        for key, start, end in zip(keys, starts, starts[1:] + [next_row]):
+            if key in rendered:
+                block = b"".join(rows[r] for r in range(start, end) if r in rows)
+                blocks.append(block)
+                stored = cached.get(key)
+                # Shared-string cells (older openpyxl) would point into this workbook's string table
+                if b' t="s"' not in block and (stored is None or stored[0]["styles"] != styles_key):
+                    new_fragments.append((key, {"height": end - start, "styles": styles_key}, _shift_rows(block, 1 - start)))
+            else:
+                blocks.append(_shift_rows(cached[key][1], start - 1))
+        last_row = max(int(m.group(1)) for m in _ROW.finditer(blocks[-1]))
+        sheet = re.sub(rb'<dimension ref="[^"]*"', f'<dimension ref="A1:J{last_row}"'.encode(), head, count=1) \
+            + b"<sheetData>" + b"".join(blocks) + b"</sheetData>" + tail
+
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as final:
+            for info in package.infolist():
+                final.writestr(info, sheet if info.filename == sheet_path else package.read(info))
+        cache.put_many("invoice-xlsx", new_fragments)
+        _remember_dcs(cache, dc_keys)
+        cache.purge()
+    return rewind(output)
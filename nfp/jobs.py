@@ -0,0 +1,421 @@
+"""Local background job queue for long tool runs.
+
+Jobs are rows in a SQLite database that lives next to their input and output
+files (`NFP_JOBS_DIR`, default `<tmp>/nfp_jobs`). A tool page submits a job
+and returns immediately; a fixed pool of worker processes claims queued jobs
+one at a time, writes progress back to the database and saves the finished
+artifacts in the job's directory, where they stay downloadable until purged.
+The pool size bounds how many generations run at once, however many sessions
+submit work.
+
+    runner = JobRunner(workers=2).start()
+    job_id = runner.store.submit("attendance", params, owner=session_id)
+    runner.store.get(job_id)["status"]     # queued -> running -> done | failed
+    runner.store.artifact_path(job_id, "NFP_Attendance_February_2026.xlsx")
+
+Each job kind is a function `(params, progress) -> (artifacts, result)` in
+`JOB_KINDS`: `artifacts` is a list of `(file_name, output, mime)` with the
+generator's spooled output file (see `nfp.spool`) and `result`
+is any picklable value handed back to the UI (e.g. the attendance summary).
+"""
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+from nfp.spool import save_output
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+DEFAULT_WORKERS = max(1, min(2, os.cpu_count() or 1))
+RETENTION_SECONDS = 24 * 3600
+PURGE_INTERVAL_SECONDS = 600   # how often idle workers delete jobs past retention
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    owner TEXT,
+    label TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    artifacts TEXT NOT NULL DEFAULT '[]',
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    worker_pid INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, created);
+"""
+
+
+def default_root():
+    return os.environ.get("NFP_JOBS_DIR") or os.path.join(tempfile.gettempdir(), "nfp_jobs")
+
+
+# --- JOB KINDS ---
+# Engine modules are imported inside each kind so the worker only loads what its job needs.
+
+def _input_frame(params, schema, title):
+    """The normalized frame submitted by the UI, or one read from an uploaded .xlsx (`input_path`)."""
+    if "df" in params:
+        return params["df"]
+    import pandas as pd
+    from nfp.schema import normalize_frame
+    return normalize_frame(pd.read_excel(params["input_path"]), schema, title=title)
+
+
+def _run_attendance(params, progress):
+    from nfp.attendance import generate_attendance_file
+    from nfp.fragments import FragmentCache
+    from nfp.schema import ATTENDANCE_COLUMNS
+    output, summary = generate_attendance_file(
+        _input_frame(params, ATTENDANCE_COLUMNS, "Attendance file"), params["month"], params["year"], params["holidays"], params["company_name"],
+        params["std_shift"], params.get("sp_shift"), progress=progress,
+        cache=FragmentCache() if params.get("incremental") else None
+    )
+    run = {"summary": summary, "period": params["period"], "std_hours": params["std_shift"]["hours"]}
+    return [(params["file_name"], output, XLSX_MIME)], run
+
+
+def _run_attendance_punches(params, progress):
+    from nfp.attendance import generate_attendance_from_punches
+    output, summary = generate_attendance_from_punches(
+        params["punches"], params["month"], params["year"], params["holidays"], params["company_name"],
+        params["std_shift"], params.get("sp_shift"), roster_df=params.get("roster"), progress=progress
+    )
+    run = {"summary": summary, "period": params["period"], "std_hours": params["std_shift"]["hours"]}
+    return [(params["file_name"], output, XLSX_MIME)], run
+
+
+def _run_attendance_records(params, progress):
+    from nfp.attendance import generate_attendance_records
+    from nfp.schema import ATTENDANCE_COLUMNS
+    output, summary = generate_attendance_records(
+        _input_frame(params, ATTENDANCE_COLUMNS, "Attendance file"), params["month"], params["year"],
+        params["holidays"], params["std_shift"], params.get("sp_shift"), fmt=params["fmt"], progress=progress
+    )
+    run = {"summary": summary, "period": params["period"], "std_hours": params["std_shift"]["hours"]}
+    summary_name = f"{os.path.splitext(params['file_name'])[0]}_summary.csv"
+    return [(params["file_name"], output, "text/csv" if params["fmt"] == "csv" else "application/vnd.apache.parquet"),
+            (summary_name, io.BytesIO(summary.to_csv(index=False).encode("utf-8")), "text/csv")], run
+
+
+def _run_attendance_range(params, progress):
+    from nfp.attendance import generate_attendance_range
+    from nfp.schema import ATTENDANCE_COLUMNS
+    output, summary = generate_attendance_range(
+        _input_frame(params, ATTENDANCE_COLUMNS, "Attendance file"), params["months"], params["holidays"],
+        params["company_name"], params["std_shift"], params.get("sp_shift"), progress=progress
+    )
+    return [(params["file_name"], output, "application/zip")], None
+
+
+def _run_invoices(params, progress):
+    from nfp.fragments import FragmentCache
+    from nfp.invoices import generate_excel_invoice, generate_html_invoice, invoice_changes
+    from nfp.schema import INVOICE_COLUMNS
+    df = _input_frame(params, INVOICE_COLUMNS, "Sales register")
+    cache = FragmentCache() if params.get("incremental") else None
+    changes = invoice_changes(df, params["header_info"], params["tax_rate"], cache) if cache else None
+    html = generate_html_invoice(df, params["header_info"], params["tax_rate"], cache=cache)
+    progress(0.5)
+    excel = generate_excel_invoice(df, params["header_info"], params["tax_rate"], cache=cache)
+    artifacts = [("GST_Invoices_Printable.html", html, "text/html"),
+                 ("GST_Invoices.xlsx", excel, XLSX_MIME)]
+    if changes is not None:
+        artifacts.append(("GST_Invoices_Changes.csv", io.BytesIO(changes.to_csv(index=False).encode("utf-8")), "text/csv"))
+    return artifacts, None
+
+
+def _run_bank(params, progress):
+    from nfp.bank import categorize, extract_text_from_pdf, generate_bank_excel, parse_bank_statement, statement_frame
+    raw_text = extract_text_from_pdf(io.BytesIO(params["pdf"]) if "pdf" in params else params["input_path"])
+    progress(0.6)
+    transactions = parse_bank_statement(raw_text)
+    if not transactions:
+        raise ValueError("No valid transaction patterns found. Please check if the PDF is a standard Bank AL Habib statement.")
+    progress(0.8)
+    df = statement_frame(transactions)
+    if params.get("rules") is not None:
+        df = df.assign(Category=categorize(df, params["rules"]))
+    return [(params["file_name"], generate_bank_excel(df), XLSX_MIME)], None
+
+
+def _run_tax_register(params, progress):
+    from nfp.payroll import generate_register_excel
+    from nfp.schema import SALARY_COLUMNS
+    from nfp.tax import build_tax_register
+    tax_df = build_tax_register(_input_frame(params, SALARY_COLUMNS, "Salary roster"), params["tax_year"])
+    progress(0.5)
+    return [(params["file_name"], generate_register_excel(tax_df, 'Tax Register'), XLSX_MIME)], None
+
+
+JOB_KINDS = {
+    "attendance": _run_attendance,
+    "attendance_range": _run_attendance_range,
+    "attendance_records": _run_attendance_records,
+    "attendance_punches": _run_attendance_punches,
+    "invoices": _run_invoices,
+    "bank": _run_bank,
+    "tax_register": _run_tax_register,
+}
+
+
+# --- STORE ---
+
+class JobStore:
+    """Job table plus one directory per job for its params, result and artifacts."""
+
+    def __init__(self, root=None):
+        self.root = root or default_root()
+        os.makedirs(self.root, exist_ok=True)
+        self.db_path = os.path.join(self.root, "jobs.sqlite3")
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def job_dir(self, job_id):
+        return os.path.join(self.root, job_id)
+
+    def artifact_path(self, job_id, file_name):
+        return os.path.join(self.job_dir(job_id), "artifacts", os.path.basename(file_name))
+
+    @staticmethod
+    def _row(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["artifacts"] = json.loads(job["artifacts"])
+        return job
+
+    def submit(self, kind, params, owner=None, label=None, files=None, links=None):
+        """Queue a job; returns its id (also the name of its directory).
+
+        `files` maps a param name to a file (e.g. a streamed upload) that is
+        moved into the job directory; the param is set to its new path.
+        `links` does the same for files that must stay where they are (e.g.
+        in the upload store): they are hard-linked, or copied across file
+        systems, so the job keeps its input if the original is deleted.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'. Available: {', '.join(JOB_KINDS)}")
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.job_dir(job_id), "artifacts"))
+        params = dict(params)
+        for name, path in (files or {}).items():
+            params[name] = os.path.join(self.job_dir(job_id), os.path.basename(path))
+            shutil.move(path, params[name])
+        for name, path in (links or {}).items():
+            params[name] = os.path.join(self.job_dir(job_id), os.path.basename(path))
+            try:
+                os.link(path, params[name])
+            except OSError:
+                shutil.copyfile(path, params[name])
+        with open(os.path.join(self.job_dir(job_id), "params.pkl"), "wb") as f:
+            pickle.dump(params, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute("INSERT INTO jobs (id, kind, owner, label, status, created) VALUES (?, ?, ?, ?, ?, ?)",
+                         (job_id, kind, owner, label or kind, QUEUED, time.time()))
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            return self._row(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, owner=None, limit=50):
+        """Most recent jobs first, optionally only those submitted by `owner`."""
+        with self._connect() as conn:
+            if owner is None:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,))
+            else:
+                rows = conn.execute("SELECT * FROM jobs WHERE owner = ? ORDER BY created DESC LIMIT ?", (owner, limit))
+            return [self._row(r) for r in rows.fetchall()]
+
+    def counts(self):
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def claim(self, worker_pid):
+        """Atomically move the oldest queued job to running; returns it or None."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE jobs SET status = ?, started = ?, worker_pid = ? WHERE id = ?",
+                                 (RUNNING, time.time(), worker_pid, row["id"]))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row is not None else None
+
+    def set_progress(self, job_id, fraction):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (float(fraction), job_id))
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started yet; returns True if it was cancelled."""
+        with self._connect() as conn:
+            cur = conn.execute("UPDATE jobs SET status = ?, finished = ? WHERE id = ? AND status = ?",
+                               (CANCELLED, time.time(), job_id, QUEUED))
+            return cur.rowcount == 1
+
+    def _finish(self, job_id, status, artifacts=(), error=None):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, progress = MAX(progress, ?), artifacts = ?, error = ?, finished = ? WHERE id = ?",
+                         (status, 1.0 if status == DONE else 0.0, json.dumps(list(artifacts)), error, time.time(), job_id))
+
+    def load_params(self, job_id):
+        with open(os.path.join(self.job_dir(job_id), "params.pkl"), "rb") as f:
+            return pickle.load(f)
+
+    def load_result(self, job_id):
+        """The value returned alongside the artifacts (None if the kind has none)."""
+        path = os.path.join(self.job_dir(job_id), "result.pkl")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def recover(self):
+        """Fail running jobs whose worker process is gone (crashed or killed mid-run)."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, worker_pid FROM jobs WHERE status = ?", (RUNNING,)).fetchall()
+        for row in rows:
+            if not _pid_alive(row["worker_pid"]):
+                self._finish(row["id"], FAILED, error="The worker stopped before the job finished (out of memory or restarted).")
+
+    def purge(self, max_age=RETENTION_SECONDS):
+        """Delete finished jobs (and their files) older than `max_age` seconds."""
+        cutoff = time.time() - max_age
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT id FROM jobs WHERE finished < ? AND status IN ({','.join('?' * len(FINISHED))})",
+                                (cutoff, *FINISHED)).fetchall()
+            for row in rows:
+                shutil.rmtree(self.job_dir(row["id"]), ignore_errors=True)
+                conn.execute("DELETE FROM jobs WHERE id = ?", (row["id"],))
+        return len(rows)
+
+
+# --- WORKERS ---
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def run_job(store, job):
+    """Run one claimed job to completion, recording artifacts or the error."""
+    job_id = job["id"]
+    last = [0.0]
+
+    def progress(fraction):
+        # Progress bars only need whole percents; skip the database write otherwise
+        if fraction - last[0] >= 0.01:
+            last[0] = fraction
+            store.set_progress(job_id, fraction)
+
+    try:
+        artifacts, result = JOB_KINDS[job["kind"]](store.load_params(job_id), progress)
+        saved = []
+        for file_name, output, mime in artifacts:
+            with output:
+                size = save_output(output, store.artifact_path(job_id, file_name))
+            saved.append({"name": os.path.basename(file_name), "mime": mime, "size": size})
+        if result is not None:
+            with open(os.path.join(store.job_dir(job_id), "result.pkl"), "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        store._finish(job_id, DONE, saved)
+    except Exception as e:
+        report = e.report() if hasattr(e, "report") else f"{type(e).__name__}: {e}"
+        store._finish(job_id, FAILED, error=report)
+
+
+def worker_loop(root, poll_interval=0.5, stop=None, purge_interval=PURGE_INTERVAL_SECONDS):
+    """Worker process body: claim and run queued jobs until `stop` is set.
+
+    While idle it also purges finished jobs past retention, at most once per
+    `purge_interval`, so a long-running server does not keep them forever.
+    """
+    store = JobStore(root)
+    pid = os.getpid()
+    last_purge = time.monotonic()
+    while stop is None or not stop.is_set():
+        job = store.claim(pid)
+        if job is not None:
+            run_job(store, job)
+            continue
+        if time.monotonic() - last_purge >= purge_interval:
+            store.purge()
+            last_purge = time.monotonic()
+        time.sleep(poll_interval)
+
+
+class JobRunner:
+    """A fixed pool of worker processes serving one job store."""
+
+    def __init__(self, root=None, workers=None, poll_interval=0.5):
+        self.store = JobStore(root)
+        self.workers = workers or int(os.environ.get("NFP_JOB_WORKERS", DEFAULT_WORKERS))
+        self.poll_interval = poll_interval
+        # spawn, not fork: the Streamlit server is multi-threaded
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._processes = []
+
+    def _spawn(self, i):
+        process = self._ctx.Process(target=worker_loop, args=(self.store.root, self.poll_interval, self._stop),
+                                    name=f"nfp-job-worker-{i}", daemon=True)
+        process.start()
+        return process
+
+    def start(self):
+        self.store.purge()
+        self.store.recover()
+        self._processes = [self._spawn(i) for i in range(self.workers)]
+        return self
+
+    def ensure(self):
+        """Replace workers that died (e.g. killed for memory) and fail the jobs they held."""
+        for i, process in enumerate(self._processes):
+            if not process.is_alive():
+                process.join(0)
+                self._processes[i] = self._spawn(i)
+        self.store.recover()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
@@ -0,0 +1,105 @@
+"""Payroll register: attendance summary + salary roster -> gross, tax and net pay.
+
+The attendance generator returns one summary row per employee (present days,
+absent days, OT hours). This stage joins that summary with a normalized
+salary roster on employee code and computes the whole company's payroll in
+one vectorized pass:
+
+- Earned salary = monthly gross x paid days / days in month, where paid days
+  are the employee's active days (joining/leaving aware) minus absences.
+  Sundays and gazetted holidays inside the active period are paid.
+- OT pay = OT hours x hourly rate x OT multiplier, with the hourly rate being
+  monthly gross / (working-day basis x standard hours per day).
+- FBR withholding comes from the tax engine on the month's gross pay.
+"""
+import numpy as np
+import pandas as pd
+
+from nfp.schema import code_key
+from nfp.spool import rewind, spooled_output
+from nfp.tax import DEFAULT_TAX_YEAR, calculate_fbr_tax_batch
+
+OT_MULTIPLIER = 2.0        # Factories Act: overtime at twice the ordinary rate
+WORKING_DAY_BASIS = 26     # working days per month used for the hourly rate
+
+PAYROLL_COLUMNS = [
+    "CODE", "NAME", "Status", "Monthly Gross Salary", "Days in Month", "Paid Days",
+    "Present Days", "Absent Days", "OT Hours", "Hourly Rate", "Earned Salary", "OT Pay",
+    "Gross Pay", "Income Tax", "Net Pay",
+]
+
+
+def build_payroll_register(attendance_summary, roster, std_hours_per_day,
+                           tax_year=DEFAULT_TAX_YEAR, ot_multiplier=OT_MULTIPLIER,
+                           working_day_basis=WORKING_DAY_BASIS):
+    """Compute the payroll register.
+
+    `attendance_summary` is the summary frame returned by
+    `generate_attendance_file`; `roster` is normalized with `SALARY_COLUMNS`.
+    Returns `(register_df, missing_codes)` where `missing_codes` lists
+    attendance employees with no salary in the roster (left out of the register).
+    """
+    att = attendance_summary.assign(_key=code_key(attendance_summary["code"]))
+    salaries = (roster.assign(_key=code_key(roster["code"]))
+                      .drop_duplicates("_key", keep="last")[["_key", "monthly_gross"]])
+    merged = att.merge(salaries, on="_key", how="left")
+
+    missing = merged["monthly_gross"].isna()
+    missing_codes = merged.loc[missing, "code"].tolist()
+    merged = merged[~missing]
+
+    gross_salary = merged["monthly_gross"].to_numpy(dtype=float)
+    days_in_month = merged["days_in_month"].to_numpy(dtype=float)
+    paid_days = np.clip(merged["active_days"].to_numpy(dtype=float)
+                        - merged["absent_days"].to_numpy(dtype=float), 0, None)
+    ot_hours = merged["ot_hours"].to_numpy(dtype=float)
+
+    hourly_rate = gross_salary / (working_day_basis * std_hours_per_day)
+    earned = gross_salary * paid_days / days_in_month
+    ot_pay = ot_hours * hourly_rate * ot_multiplier
+    gross_pay = earned + ot_pay
+    _, _, monthly_tax = calculate_fbr_tax_batch(gross_pay, tax_year)
+
+    register = pd.DataFrame({
+        "CODE": merged["code"].to_numpy(),
+        "NAME": merged["name"].to_numpy(),
+        "Status": merged["status"].to_numpy(),
+        "Monthly Gross Salary": gross_salary,
+        "Days in Month": days_in_month.astype(int),
+        "Paid Days": paid_days.astype(int),
+        "Present Days": merged["present_days"].to_numpy(),
+        "Absent Days": merged["absent_days"].to_numpy(),
+        "OT Hours": ot_hours,
+        "Hourly Rate": hourly_rate.round(2),
+        "Earned Salary": earned.round(2),
+        "OT Pay": ot_pay.round(2),
+        "Gross Pay": gross_pay.round(2),
+        "Income Tax": monthly_tax.round(2),
+        "Net Pay": (gross_pay - monthly_tax).round(2),
+    }, columns=PAYROLL_COLUMNS)
+    return register, missing_codes
+
+
+def generate_register_excel(df, sheet_name):
+    """Writes a tabular register (tax or payroll) with the brand header style; returns a spooled file."""
+    output = spooled_output()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+        workbook = writer.book
+        worksheet = writer.sheets[sheet_name]
+
+        header_fmt = workbook.add_format({
+            'bold': True, 'font_color': 'white', 'bg_color': '#003366',
+            'border': 1, 'align': 'center', 'valign': 'vcenter'
+        })
+        num_fmt = workbook.add_format({'num_format': '#,##0', 'border': 1})
+
+        for col_num, value in enumerate(df.columns.values):
+            worksheet.write(0, col_num, value, header_fmt)
+            if value == "NAME":
+                worksheet.set_column(col_num, col_num, 30)
+            elif pd.api.types.is_numeric_dtype(df[value]):
+                worksheet.set_column(col_num, col_num, 18, num_fmt)
+            else:
+                worksheet.set_column(col_num, col_num, 12)
+    return rewind(output)
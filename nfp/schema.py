@@ -0,0 +1,183 @@
+"""Column schemas for uploaded Excel files.
+
+Uploaded sheets arrive with whatever headers the user typed ("CODE", "Code ",
+"Absent Days", ...). Instead of probing several spellings on every row, each
+tool declares its columns once here. `normalize_frame` resolves the aliases a
+single time per DataFrame, coerces the typed columns in bulk and returns a
+frame whose columns are plain identifiers, so generators can loop with
+`itertuples()` and read `row.code`, `row.ot_hours`, etc.
+"""
+from typing import NamedTuple
+
+import pandas as pd
+
+
+class Column(NamedTuple):
+    name: str                 # canonical identifier used by the generators
+    aliases: tuple            # accepted header spellings (case/space-insensitive)
+    required: bool = False
+    default: object = ""
+    kind: str = "text"        # "text", "int", "number", "status" or "date"
+
+
+class SchemaError(ValueError):
+    """Raised when an uploaded file does not match the expected layout."""
+
+    def __init__(self, title, problems):
+        self.title = title
+        self.problems = list(problems)
+        super().__init__(self.report())
+
+    def report(self):
+        lines = [f"{self.title} could not be processed:"]
+        lines += [f"- {p}" for p in self.problems]
+        return "\n".join(lines)
+
+
+ATTENDANCE_COLUMNS = (
+    Column("s_no", ("S#", "S.No", "S. No", "Sr", "Sr.")),
+    Column("code", ("CODE", "Emp Code", "Employee Code"), required=True),
+    Column("name", ("NAME", "Employee Name"), required=True),
+    Column("absent_days", ("ABSENT DAYS", "Absent"), default=0, kind="int"),
+    Column("ot_hours", ("Overtime Hours", "Overtime", "OT Hours", "OT"), default=0, kind="int"),
+    Column("status", ("STATUS",), kind="status"),
+    Column("date", ("DATE",), default=pd.NaT, kind="date"),
+)
+
+# Raw biometric device exports: one row per punch (check-in or check-out)
+PUNCH_COLUMNS = (
+    Column("code", ("CODE", "Emp Code", "Employee Code", "User ID", "UserID", "AC-No.", "Enroll No", "Badge"), required=True),
+    Column("name", ("NAME", "Employee Name", "User Name")),
+    Column("punch_time", ("Punch Time", "Date/Time", "Date Time", "DateTime", "Timestamp", "Check Time", "CHECKTIME", "Time"),
+           required=True, default=pd.NaT, kind="date"),
+)
+
+INVOICE_COLUMNS = (
+    Column("dc_no", ("DC No.", "DC No", "DC"), required=True),
+    Column("invoice_no", ("Invoice No.", "Invoice No")),
+    Column("invoice_date", ("Invoice Date",)),
+    Column("customer_name", ("Customer Name",)),
+    Column("bill_to_address", ("Bill To Address", "Address")),
+    Column("customer_ntn", ("Customer NTN", "NTN")),
+    Column("credit_terms", ("Credit Terms", "Payment Terms"), default="Cash"),
+    Column("item_description", ("Item Description", "Description"), required=True),
+    Column("hs_code", ("H.S Code", "HS Code", "H.S. Code"), required=True),
+    Column("uom", ("UOM",), required=True),
+    Column("qty", ("Qty", "Quantity"), required=True, default=0, kind="number"),
+    Column("unit_price", ("Unit Price (PKR)", "Unit Price"), required=True, default=0, kind="number"),
+    Column("total_value", ("Total Value (PKR)", "Total Value"), required=True, default=0, kind="number"),
+)
+
+SALARY_COLUMNS = (
+    Column("code", ("CODE", "Emp Code", "Employee Code")),
+    Column("name", ("NAME", "Employee Name")),
+    Column("monthly_gross", ("Monthly Gross Salary", "Gross Salary", "Monthly Salary", "Salary", "Gross"),
+           required=True, default=0, kind="number"),
+)
+
+NET_SALARY_COLUMNS = (
+    Column("code", ("CODE", "Emp Code", "Employee Code", "Grade")),
+    Column("name", ("NAME", "Employee Name", "Designation")),
+    Column("monthly_net", ("Target Net Salary", "Net Salary", "Monthly Net Salary", "Take Home", "Net"),
+           required=True, default=0, kind="number"),
+)
+
+HOLIDAY_COLUMNS = (
+    Column("date", ("DATE", "Holiday Date", "Day"), required=True, default=pd.NaT, kind="date"),
+    Column("name", ("NAME", "Holiday", "Holiday Name", "Description", "Occasion"), required=True),
+)
+
+
+CATEGORY_RULE_COLUMNS = (
+    Column("pattern", ("Pattern", "Keyword", "Keywords", "Contains", "Regex"), required=True),
+    Column("category", ("Category", "Account", "Ledger Account", "Ledger"), required=True),
+    Column("match", ("Match", "Match Type", "Type"), default="keyword"),
+    Column("applies_to", ("Applies To", "Side", "Direction"), default="any"),
+)
+
+
+def _key(label):
+    """Header comparison key: case-insensitive, whitespace-collapsed."""
+    return " ".join(str(label).split()).casefold()
+
+
+def resolve_columns(df, schema):
+    """Map each canonical column name to the matching header in `df` (or None)."""
+    lookup = {}
+    for col in df.columns:
+        lookup.setdefault(_key(col), col)
+
+    resolved = {}
+    for column in schema:
+        resolved[column.name] = None
+        for alias in (column.name,) + column.aliases:
+            if _key(alias) in lookup:
+                resolved[column.name] = lookup[_key(alias)]
+                break
+    return resolved
+
+
+def bad_rows(mask, limit=5):
+    """Spreadsheet row numbers (header is row 1) for the first few bad values."""
+    rows = [str(i + 2) for i in mask[mask].index[:limit]]
+    more = int(mask.sum()) - len(rows)
+    return ", ".join(rows) + (f" (+{more} more)" if more > 0 else "")
+
+
+def _coerce(series, column, problems):
+    if column.kind in ("int", "number"):
+        blank = series.isna() | (series.astype(str).str.strip() == "")
+        numbers = pd.to_numeric(series.where(~blank), errors="coerce")
+        invalid = numbers.isna() & ~blank
+        if invalid.any():
+            problems.append(f"'{series.name}' has non-numeric values in row(s) {bad_rows(invalid)}")
+        numbers = numbers.fillna(column.default)
+        return numbers.astype(int) if column.kind == "int" else numbers
+
+    if column.kind == "status":
+        text = series.fillna("").astype(str).str.strip()
+        text = text.where(text.str.lower() != "nan", "")
+        return text.str.title()
+
+    if column.kind == "date":
+        return pd.to_datetime(series, errors="coerce")
+
+    return series.where(series.notna(), column.default)
+
+
+def normalize_frame(df, schema, title="Uploaded file"):
+    """Return a copy of `df` with canonical, coerced columns for `schema`.
+
+    Missing optional columns are filled with their defaults. All problems
+    (missing required columns, unparseable numbers) are collected and raised
+    together as a `SchemaError` so the user sees one complete report.
+    """
+    resolved = resolve_columns(df, schema)
+    problems = []
+    missing = [c for c in schema if c.required and resolved[c.name] is None]
+    if missing:
+        expected = ", ".join(f"'{c.aliases[0]}'" for c in missing)
+        problems.append(f"missing required column(s): {expected}")
+
+    out = pd.DataFrame(index=df.index)
+    for column in schema:
+        source = resolved[column.name]
+        if source is None:
+            out[column.name] = column.default
+        else:
+            out[column.name] = _coerce(df[source], column, problems)
+
+    if problems:
+        raise SchemaError(title, problems)
+    return out
+
+
+def code_key(codes):
+    """Join key for employee codes that may be numbers in one file and text in another.
+
+    `1360`, `1360.0`, `" 1360 "` and `"1360"` all give `"1360"`; letters are
+    upper-cased. A column with any blank code stays float after normalizing,
+    so the ".0" must go for codes to match across files.
+    """
+    text = pd.Series(codes).astype(str).str.strip()
+    return text.str.replace(r"\.0$", "", regex=True).str.upper().to_numpy()
@@ -0,0 +1,47 @@
+"""Spooled temporary files for generated artifacts.
+
+Generators write workbooks and HTML into a `SpooledTemporaryFile`: small
+outputs stay in memory, large ones roll over to a temp file on disk once they
+pass `SPOOL_MAX_BYTES`. Callers get the file back rewound to the start and
+copy it where it is needed (a job artifact, a download at click time) instead
+of calling `getvalue()` and holding a second full copy in memory.
+"""
+import os
+import shutil
+import tempfile
+
+SPOOL_MAX_BYTES = int(os.environ.get("NFP_SPOOL_MAX_MB", 8)) * 2**20
+
+
+def spooled_output():
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+
+
+def rewind(output):
+    output.seek(0)
+    return output
+
+
+def on_disk(output):
+    """True once a spooled artifact has rolled over to a temp file (in-memory outputs have no name)."""
+    return getattr(output, "name", None) is not None
+
+
+def output_size(output):
+    position = output.tell()
+    output.seek(0, os.SEEK_END)
+    size = output.tell()
+    output.seek(position)
+    return size
+
+
+def read_output(output):
+    """The whole artifact as bytes, for consumers that need bytes (e.g. a download click)."""
+    return rewind(output).read()
+
+
+def save_output(output, path):
+    """Copy the artifact to `path` in chunks; returns its size in bytes."""
+    with open(path, "wb") as f:
+        shutil.copyfileobj(rewind(output), f, 2**20)
+        return f.tell()
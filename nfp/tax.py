@@ -0,0 +1,181 @@
+"""FBR salaried-individual income tax, computed for single salaries or whole arrays.
+
+Each tax year is a `TaxTable` built from its slab list (annual income
+threshold, marginal rate above it). The fixed tax due at every threshold is
+precomputed when the table is built, so evaluating any income is a binary
+search for its slab plus one multiply-add: `bisect` for a single salary and
+`np.searchsorted` for a whole payroll.
+
+Net income after tax is also piecewise linear and strictly increasing in
+gross (every marginal rate is below 100%), so the inverse (the gross that
+yields a target net) is the same lookup run against the net income at each
+slab threshold.
+"""
+import bisect
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class TaxTable(NamedTuple):
+    year: str
+    lower: tuple   # slab lower bounds (exclusive), starting at 0
+    rate: tuple    # marginal rate within each slab
+    base: tuple    # cumulative tax already due at each lower bound
+
+
+def build_tax_table(year, slabs):
+    """Build a `TaxTable` from `(income above, marginal rate)` pairs.
+
+    Income up to the first threshold is tax-free. The cumulative tax at each
+    threshold is derived from the rates, so only the published thresholds
+    and percentages need to be typed in for a new tax year.
+    """
+    lower = [0]
+    rate = [0.0]
+    base = [0.0]
+    for threshold, slab_rate in slabs:
+        if threshold <= lower[-1]:
+            raise ValueError(f"Tax year {year}: slab thresholds must be increasing")
+        if not 0 <= slab_rate < 1:
+            raise ValueError(f"Tax year {year}: slab rates must be between 0 and 100%")
+        base.append(base[-1] + (threshold - lower[-1]) * rate[-1])
+        lower.append(threshold)
+        rate.append(slab_rate)
+    return TaxTable(year, tuple(lower), tuple(rate), tuple(base))
+
+
+TAX_TABLES = {
+    "2025-26": build_tax_table("2025-26", (
+        (600000, 0.01),
+        (1200000, 0.11),
+        (2200000, 0.23),
+        (3200000, 0.30),
+        (4100000, 0.35),
+    )),
+    "2024-25": build_tax_table("2024-25", (
+        (600000, 0.05),
+        (1200000, 0.15),
+        (2200000, 0.25),
+        (3200000, 0.30),
+        (4100000, 0.35),
+    )),
+}
+
+DEFAULT_TAX_YEAR = "2025-26"
+
+
+def get_tax_table(tax_year=DEFAULT_TAX_YEAR):
+    try:
+        return TAX_TABLES[tax_year]
+    except KeyError:
+        raise ValueError(f"Unknown tax year '{tax_year}'. Available: {', '.join(TAX_TABLES)}") from None
+
+
+@lru_cache(maxsize=None)
+def _table_arrays(table):
+    return (np.array(table.lower, dtype=float),
+            np.array(table.rate, dtype=float),
+            np.array(table.base, dtype=float))
+
+
+@lru_cache(maxsize=None)
+def _net_arrays(table):
+    """Slab bounds, marginal rates and the annual net income at each lower bound."""
+    lower, rate, base = _table_arrays(table)
+    return lower, rate, lower - base
+
+
+def annual_tax(annual_income, tax_year=DEFAULT_TAX_YEAR):
+    """Annual tax for a single annual income."""
+    table = get_tax_table(tax_year)
+    # bisect_left keeps an income exactly on a threshold in the lower slab
+    idx = max(bisect.bisect_left(table.lower, annual_income) - 1, 0)
+    return table.base[idx] + (annual_income - table.lower[idx]) * table.rate[idx]
+
+
+def annual_tax_batch(annual_income, tax_year=DEFAULT_TAX_YEAR):
+    """Annual tax for an array of annual incomes."""
+    lower, rate, base = _table_arrays(get_tax_table(tax_year))
+    income = np.asarray(annual_income, dtype=float)
+    idx = np.maximum(np.searchsorted(lower, income, side="left") - 1, 0)
+    return base[idx] + (income - lower[idx]) * rate[idx]
+
+
+def gross_for_net(annual_net, tax_year=DEFAULT_TAX_YEAR):
+    """Annual income whose after-tax amount is `annual_net`."""
+    table = get_tax_table(tax_year)
+    net_lower = [lower - base for lower, base in zip(table.lower, table.base)]
+    idx = max(bisect.bisect_left(net_lower, annual_net) - 1, 0)
+    return table.lower[idx] + (annual_net - net_lower[idx]) / (1 - table.rate[idx])
+
+
+def gross_for_net_batch(annual_net, tax_year=DEFAULT_TAX_YEAR):
+    """Annual incomes for an array of after-tax amounts."""
+    lower, rate, net_lower = _net_arrays(get_tax_table(tax_year))
+    net = np.asarray(annual_net, dtype=float)
+    idx = np.maximum(np.searchsorted(net_lower, net, side="left") - 1, 0)
+    return lower[idx] + (net - net_lower[idx]) / (1 - rate[idx])
+
+
+def calculate_fbr_tax(monthly_gross_salary, tax_year=DEFAULT_TAX_YEAR):
+    """Returns `(annual_income, annual_tax, monthly_tax)` for one monthly salary."""
+    annual_income = monthly_gross_salary * 12
+    tax = annual_tax(annual_income, tax_year)
+    return annual_income, tax, tax / 12
+
+
+def calculate_fbr_tax_batch(monthly_gross_salary, tax_year=DEFAULT_TAX_YEAR):
+    """Vectorized `calculate_fbr_tax`; returns numpy arrays."""
+    monthly = np.asarray(monthly_gross_salary, dtype=float)
+    annual_income = monthly * 12
+    tax = annual_tax_batch(annual_income, tax_year)
+    return annual_income, tax, tax / 12
+
+
+def calculate_gross_for_net(monthly_net_salary, tax_year=DEFAULT_TAX_YEAR):
+    """Monthly gross salary that leaves `monthly_net_salary` after FBR tax."""
+    return gross_for_net(monthly_net_salary * 12, tax_year) / 12
+
+
+def calculate_gross_for_net_batch(monthly_net_salary, tax_year=DEFAULT_TAX_YEAR):
+    """Vectorized `calculate_gross_for_net`; returns a numpy array."""
+    return gross_for_net_batch(np.asarray(monthly_net_salary, dtype=float) * 12, tax_year) / 12
+
+
+def build_tax_register(roster, tax_year=DEFAULT_TAX_YEAR):
+    """Tax register for a normalized salary roster (see `SALARY_COLUMNS`)."""
+    gross = roster["monthly_gross"].to_numpy(dtype=float)
+    annual_income, tax, monthly_tax = calculate_fbr_tax_batch(gross, tax_year)
+    return pd.DataFrame({
+        "CODE": roster["code"].to_numpy(),
+        "NAME": roster["name"].to_numpy(),
+        "Monthly Gross Salary": gross,
+        "Annual Income": annual_income,
+        "Annual Tax": tax,
+        "Monthly Tax": monthly_tax,
+        "Net Monthly Salary": gross - monthly_tax,
+    })
+
+
+def build_gross_up_register(roster, tax_year=DEFAULT_TAX_YEAR):
+    """Gross-up register for a normalized target-net roster (see `NET_SALARY_COLUMNS`).
+
+    The solved gross is run back through the forward calculator, so the
+    "Net Monthly Salary" column shows the net each gross actually yields.
+    """
+    target = roster["monthly_net"].to_numpy(dtype=float)
+    gross = calculate_gross_for_net_batch(target, tax_year)
+    annual_income, tax, monthly_tax = calculate_fbr_tax_batch(gross, tax_year)
+    return pd.DataFrame({
+        "CODE": roster["code"].to_numpy(),
+        "NAME": roster["name"].to_numpy(),
+        "Target Net Salary": target,
+        "Monthly Gross Salary": gross,
+        "Annual Income": annual_income,
+        "Annual Tax": tax,
+        "Monthly Tax": monthly_tax,
+        "Net Monthly Salary": gross - monthly_tax,
+    })
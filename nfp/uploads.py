@@ -0,0 +1,121 @@
+"""Content-addressed store for uploaded input files.
+
+Streamlit hands each upload to the page as an in-memory file. Instead of
+parsing that buffer on every rerun (and copying it again for background
+jobs), a page puts the upload here once: it is written to disk in chunks
+while its SHA-256 is computed, and stored as `<sha256><suffix>` under
+`NFP_UPLOAD_DIR` (default `<tmp>/nfp_uploads`). Tools then read from the
+path: pandas and pdfplumber open files directly and CSVs are memory-mapped,
+and the same file uploaded by several sessions is stored and parsed once.
+
+    store = UploadStore()
+    path = store.put(uploaded_file, suffix=".xlsx")   # same content -> same path
+    df = read_table(path)
+
+Files not used for `UPLOAD_MAX_AGE_HOURS` are evicted, then the least
+recently used until the store fits in `UPLOAD_MAX_MB`. An evicted file that
+is still open stays readable until closed; `touch` tells a caller holding an
+old path whether to put the upload again.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+UPLOAD_MAX_AGE_HOURS = float(os.environ.get("NFP_UPLOAD_MAX_AGE_HOURS", 24))
+UPLOAD_MAX_MB = int(os.environ.get("NFP_UPLOAD_MAX_MB", 2048))
+EVICT_INTERVAL_SECONDS = 60
+
+_CHUNK = 2**20
+_PARTIAL = ".part"
+
+
+def default_root():
+    return os.environ.get("NFP_UPLOAD_DIR") or os.path.join(tempfile.gettempdir(), "nfp_uploads")
+
+
+class UploadStore:
+    def __init__(self, root=None, max_age_hours=None, max_mb=None):
+        self.root = root or default_root()
+        self.max_age_hours = UPLOAD_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        self.max_mb = UPLOAD_MAX_MB if max_mb is None else max_mb
+        self._last_evict = 0.0
+        os.makedirs(self.root, exist_ok=True)
+
+    def put(self, fileobj, suffix=""):
+        """Streams `fileobj` into the store while hashing it; returns the stored file's path.
+
+        Uploads with the same content (and suffix) share one file; storing a
+        duplicate only marks the existing file as used.
+        """
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        digest = hashlib.sha256()
+        fd, partial = tempfile.mkstemp(suffix=_PARTIAL, dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: fileobj.read(_CHUNK), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+            path = os.path.join(self.root, digest.hexdigest() + suffix.lower())
+            if self.touch(path):
+                os.remove(partial)
+            else:
+                os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        finally:
+            if hasattr(fileobj, "seek"):
+                fileobj.seek(0)
+        if time.time() - self._last_evict >= EVICT_INTERVAL_SECONDS:
+            self.evict(keep=(path,))
+        return path
+
+    def touch(self, path):
+        """Marks a stored file as just used; False if it has been evicted."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self, max_age_hours=None, max_mb=None, keep=()):
+        """Deletes files unused for `max_age_hours`, then the oldest until the store fits in `max_mb`; returns how many."""
+        max_age = (self.max_age_hours if max_age_hours is None else max_age_hours) * 3600
+        max_bytes = (self.max_mb if max_mb is None else max_mb) * 2**20
+        self._last_evict = now = time.time()
+        entries = []
+        for entry in os.scandir(self.root):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:   # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            in_progress = path.endswith(_PARTIAL) and now - mtime < 3600
+            if path in keep or in_progress or (now - mtime < max_age and total <= max_bytes):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def size(self):
+        """Total bytes held by the store."""
+        return sum(entry.stat().st_size for entry in os.scandir(self.root))
+
+
+def read_table(path, **kwargs):
+    """A stored .xlsx or .csv as a DataFrame; CSVs are memory-mapped rather than read into a buffer first."""
+    import pandas as pd
+    if path.lower().endswith(".csv"):
+        return pd.read_csv(path, memory_map=True, **kwargs)
+    return pd.read_excel(path, **kwargs)
@@ -0,0 +1,23 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("nfp")
+    group.addoption("--update-golden", action="store_true",
+                    help="rewrite tests/golden/outputs.json from the current generators instead of comparing")
+    group.addoption("--perf", action="store_true", help="run the timed benchmarks against tests/perf_baseline.json")
+    group.addoption("--update-baseline", action="store_true",
+                    help="with --perf, store the measured timings as the new baseline")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: timed benchmark, compared with the stored baseline (run with --perf)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf"):
+        return
+    skip = pytest.mark.skip(reason="timed benchmark; run with --perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,101 @@
+import io
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+uvicorn = pytest.importorskip("uvicorn")
+pytest.importorskip("starlette")
+
+from benchmarks.synthetic import make_roster, make_salary_roster  # noqa: E402
+from nfp.api import create_app  # noqa: E402
+
+
+def _xlsx(df):
+    buf = io.BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+@pytest.fixture(scope="module")
+def base_url(tmp_path_factory):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    app = create_app(str(tmp_path_factory.mktemp("jobs")), workers=2)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(10)
+
+
+def _request(url, data=None, method=None):
+    req = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, resp.read(), resp.headers
+    except urllib.error.HTTPError as e:
+        return e.code, e.read(), e.headers
+
+
+def _wait(base_url, job_id):
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        job = json.loads(_request(f"{base_url}/jobs/{job_id}")[1])
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError("job did not finish")
+
+
+def test_tax_endpoint(base_url):
+    status, body, _ = _request(f"{base_url}/tax?monthly_gross=100000&monthly_gross=50000")
+    results = json.loads(body)["results"]
+    assert status == 200
+    assert [r["monthly_tax"] for r in results] == [500.0, 0.0]
+
+
+def test_tax_endpoint_rejects_invalid_salaries(base_url):
+    for value in ("nan", "inf", "-inf", "1e400", "-5", "abc"):
+        status, body, _ = _request(f"{base_url}/tax?monthly_gross=100000&monthly_gross={value}")
+        assert status == 400, value
+        assert json.loads(body) == {"error": f"'monthly_gross' must be a non-negative number, got '{value}'"}
+
+
+def test_attendance_upload_runs_and_downloads(base_url):
+    status, body, headers = _request(f"{base_url}/jobs/attendance?month=2&year=2026&holiday=2026-02-05=Kashmir%20Day",
+                                     data=_xlsx(make_roster(5)))
+    assert status == 202
+    job = _wait(base_url, json.loads(body)["id"])
+    assert job["status"] == "done"
+    status, content, headers = _request(job["artifacts"][0]["url"])
+    assert status == 200 and content[:2] == b"PK"
+    assert "NFP_Attendance_February_2026.xlsx" in headers["content-disposition"]
+
+
+def test_concurrent_tax_register_jobs(base_url):
+    ids = [json.loads(_request(f"{base_url}/jobs/tax_register", data=_xlsx(make_salary_roster(200)))[1])["id"]
+           for _ in range(4)]
+    assert [_wait(base_url, i)["status"] for i in ids] == ["done"] * 4
+
+
+def test_bad_upload_reports_schema_problems(base_url):
+    status, body, _ = _request(f"{base_url}/jobs/invoices", data=_xlsx(make_salary_roster(2)))
+    job = _wait(base_url, json.loads(body)["id"])
+    assert job["status"] == "failed"
+    assert "missing required column" in job["error"]
+
+
+def test_request_errors(base_url):
+    assert _request(f"{base_url}/jobs/payslips", data=b"x")[0] == 404
+    assert _request(f"{base_url}/jobs/attendance?month=13", data=b"x")[0] == 400
+    assert _request(f"{base_url}/jobs/bank", data=b"")[0] == 400
+    assert _request(f"{base_url}/jobs/0123/artifacts/a.xlsx")[0] == 404
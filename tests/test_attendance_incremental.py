@@ -0,0 +1,48 @@
+import openpyxl
+
+from benchmarks.synthetic import make_roster
+from nfp.attendance import generate_attendance_file
+from nfp.fragments import FragmentCache
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+
+
+def _cells(output):
+    wb = openpyxl.load_workbook(output)
+    return {ws.title: [[cell.value for cell in row] for row in ws.iter_rows()] for ws in wb.worksheets}
+
+
+def test_only_changed_employees_are_rebuilt(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    roster = make_roster(12)
+    first, summary = generate_attendance_file(roster, 2, 2026, {}, "ABC", STD_SHIFT, cache=cache)
+    assert len(summary.attrs["rebuilt"]) == 12
+
+    corrected = roster.copy()
+    corrected.loc[5, "Overtime Hours"] += 3
+    second, summary = generate_attendance_file(corrected, 2, 2026, {}, "ABC", STD_SHIFT, cache=cache)
+    assert summary.attrs["rebuilt"] == [roster.loc[5, "CODE"]]
+
+    before, after = _cells(first), _cells(second)
+    assert list(before) == list(after)
+    changed = [title for title in before if before[title] != after[title]]
+    assert changed == ["Index", list(before)[6]]
+
+
+def test_reused_sheets_keep_their_formatting(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    roster = make_roster(4)
+    generate_attendance_file(roster, 2, 2026, {}, "ABC", STD_SHIFT, cache=cache)
+    output, summary = generate_attendance_file(roster, 2, 2026, {}, "ABC", STD_SHIFT, cache=cache)
+    assert summary.attrs["rebuilt"] == []
+    ws = openpyxl.load_workbook(output).worksheets[3]
+    assert ws["A6"].value == "DATE" and ws["A6"].font.b and ws["A6"].border.left.style == "thin"
+    assert "B1:F1" in {str(r) for r in ws.merged_cells.ranges}
+
+
+def test_month_settings_invalidate_the_cache(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    roster = make_roster(3)
+    generate_attendance_file(roster, 2, 2026, {}, "ABC", STD_SHIFT, cache=cache)
+    _, summary = generate_attendance_file(roster, 2, 2026, {}, "XYZ", STD_SHIFT, cache=cache)
+    assert len(summary.attrs["rebuilt"]) == 3
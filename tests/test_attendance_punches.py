@@ -0,0 +1,78 @@
+import datetime
+
+import openpyxl
+import pandas as pd
+
+from benchmarks.synthetic import make_punch_log
+from nfp.attendance import aggregate_punches, generate_attendance_from_punches
+from nfp.schema import PUNCH_COLUMNS, normalize_frame
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+SP_SHIFT = {"name": "(0900:1500)", "hours": 6, "out_hour": 15,
+            "start": datetime.date(2026, 2, 3), "end": datetime.date(2026, 2, 3)}
+
+
+def _log(*punches):
+    return pd.DataFrame(punches, columns=["User ID", "Name", "Date/Time"])
+
+
+def _daily(log, sp_shift=None):
+    daily = aggregate_punches(normalize_frame(log, PUNCH_COLUMNS), 2, 2026, STD_SHIFT, sp_shift)
+    return {(row.code, row.date): (row.time_in, row.time_out, row.ot_hours, row.late) for row in daily.itertuples()}
+
+
+def test_first_in_last_out_ot_and_late_per_day():
+    daily = _daily(_log(
+        (101, "Ali", "2026-02-02 12:00"), (101, "Ali", "2026-02-02 20:15"), (101, "Ali", "2026-02-02 08:58"),
+        (101, "Ali", "2026-02-03 09:20"), (102, "Sara", "2026-02-02 09:00"), (102, "Sara", "2026-02-02 18:59"),
+        (101, "Ali", "2026-01-31 09:00"), (101, "Ali", "2026-03-01 09:00"),
+    ))
+    assert daily == {
+        ("101", datetime.date(2026, 2, 2)): ("08:58", "20:15", 2, False),
+        ("101", datetime.date(2026, 2, 3)): ("09:20", "", 0, True),
+        ("102", datetime.date(2026, 2, 2)): ("09:00", "18:59", 0, False),
+    }
+
+
+def test_special_shift_days_earn_no_ot():
+    daily = _daily(_log((101, "Ali", "2026-02-03 09:00"), (101, "Ali", "2026-02-03 17:30")), SP_SHIFT)
+    assert daily[("101", datetime.date(2026, 2, 3))] == ("09:00", "17:30", 0, False)
+
+
+def test_sheets_show_real_times_and_roster_adds_absentees():
+    log = _log((1001, "Ali", "2026-02-02 08:58"), (1001, "Ali", "2026-02-02 20:15"), (1001, "Ali", "2026-02-03 09:01"))
+    roster = pd.DataFrame({"CODE": ["1001", "1002"], "NAME": ["Ali", "Sara"], "STATUS": ["", "New"],
+                           "Date": [pd.NaT, datetime.datetime(2026, 2, 16)]})
+    holidays = {datetime.date(2026, 2, 5): "Kashmir Day"}
+    output, summary = generate_attendance_from_punches(log, 2, 2026, holidays, "ABC", STD_SHIFT, roster_df=roster)
+
+    ali, sara = summary.to_dict("records")
+    assert (ali["present_days"], ali["ot_hours"], ali["absent_days"]) == (2, 2, 21)
+    assert (sara["present_days"], sara["absent_days"]) == (0, 12)
+
+    ws = openpyxl.load_workbook(output)["1001_Ali"]
+    assert [c.value for c in ws[8]] == ["02-Feb-26", "(0900:1800)", "08:58", "20:15", 2, "On Time"]
+    assert [c.value for c in ws[9]][2:] == ["09:01", None, None, "Missing Out Punch"]
+    assert ws["F11"].value == "Kashmir Day"
+
+
+def test_synthetic_month_log():
+    log = make_punch_log(20)
+    output, summary = generate_attendance_from_punches(log, 2, 2026, {}, "ABC", STD_SHIFT)
+    days = pd.to_datetime(log["Date/Time"]).dt.normalize()
+    punched_days = days.groupby(log["User ID"]).nunique()
+    assert list(summary["code"]) == list(punched_days.index)
+    assert list(summary["present_days"]) == list(punched_days)
+    assert (summary["present_days"] + summary["absent_days"] == 24).all()
+
+
+def test_roster_codes_read_as_floats_still_match_punches():
+    # A blank CODE leaves the roster's codes as floats (1001.0) after normalizing
+    log = _log((1001, "Ali", "2026-02-02 09:00"), (1001, "Ali", "2026-02-02 18:00"), ("e7", "Omar", "2026-02-03 09:00"))
+    roster = pd.DataFrame({"CODE": [1001.0, None], "NAME": ["Ali", "Temp"]})
+    _, summary = generate_attendance_from_punches(log, 2, 2026, {}, "ABC", STD_SHIFT, roster_df=roster)
+    assert summary["present_days"].iloc[0] == 1
+
+    roster = pd.DataFrame({"CODE": ["E7"], "NAME": ["Omar"]})
+    _, summary = generate_attendance_from_punches(log, 2, 2026, {}, "ABC", STD_SHIFT, roster_df=roster)
+    assert summary["present_days"].iloc[0] == 1
@@ -0,0 +1,58 @@
+import datetime
+import threading
+import zipfile
+
+import openpyxl
+import pytest
+
+from benchmarks.synthetic import make_roster
+from nfp.attendance import generate_attendance_range, month_file_name, months_in_range
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+
+
+def test_months_in_range_crosses_year_end():
+    assert months_in_range(datetime.date(2025, 11, 15), datetime.date(2026, 2, 1)) == [
+        (2025, 11), (2025, 12), (2026, 1), (2026, 2)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_range_builds_one_workbook_per_month(max_workers):
+    months = [(2025, 12), (2026, 1), (2026, 2)]
+    holidays = {datetime.date(2025, 12, 25): "Quaid Day", datetime.date(2026, 2, 5): "Kashmir Day"}
+    output, summary = generate_attendance_range(make_roster(4), months, holidays, "ABC", STD_SHIFT,
+                                                max_workers=max_workers)
+    bundle = zipfile.ZipFile(output)
+    assert bundle.namelist() == [month_file_name(*ym) for ym in months]
+    assert list(summary.groupby("period", sort=False).size()) == [4, 4, 4]
+    assert summary.loc[summary["period"] == "February 2026", "days_in_month"].eq(28).all()
+
+    with bundle.open(month_file_name(2025, 12)) as f:
+        wb = openpyxl.load_workbook(f)
+    remarks = {ws.cell(row=6 + day, column=6).value for ws in wb.worksheets[1:] for day in range(1, 32)}
+    assert "Quaid Day" in remarks and "Kashmir Day" not in remarks
+
+
+def test_concurrent_in_process_ranges_keep_their_own_rosters():
+    # Two sessions of one server running ranges at once, both mid-run before either finishes
+    months = [(2026, 1), (2026, 2)]
+    both_started = threading.Barrier(2, timeout=30)
+    results = {}
+
+    def run(n):
+        started = []
+
+        def progress(fraction):
+            if not started:
+                started.append(True)
+                both_started.wait()
+        results[n] = generate_attendance_range(make_roster(n), months, {}, f"Company {n}", STD_SHIFT,
+                                               progress=progress, max_workers=1)[1]
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in (3, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {n: list(summary.groupby("period", sort=False).size()) for n, summary in results.items()} == {
+        3: [3, 3], 5: [5, 5]}
@@ -0,0 +1,35 @@
+import datetime
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from benchmarks.synthetic import make_roster
+from nfp.attendance import generate_attendance_file, generate_attendance_records
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+HOLIDAYS = {datetime.date(2026, 2, 5): "Kashmir Day"}
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_records_have_one_row_per_employee_day(fmt):
+    output, summary = generate_attendance_records(make_roster(5), 2, 2026, HOLIDAYS, STD_SHIFT, fmt=fmt, batch_size=2)
+    days = pd.read_csv(output) if fmt == "csv" else pq.read_table(output).to_pandas()
+    assert list(days.columns) == ["code", "name", "date", "shift", "time_in", "time_out", "ot_hours", "remark"]
+    assert len(days) == 5 * 28
+    assert days.groupby("code").size().eq(28).all()
+    assert set(days.loc[pd.to_datetime(days["date"]).dt.day == 5, "remark"].dropna()) <= {"Kashmir Day", "Not Joined", "Resigned"}
+    assert days["ot_hours"].notna().all()
+    assert len(summary) == 5
+
+
+def test_records_summary_matches_workbook_summary():
+    roster = make_roster(6)
+    _, records_summary = generate_attendance_records(roster, 2, 2026, HOLIDAYS, STD_SHIFT)
+    _, workbook_summary = generate_attendance_file(roster, 2, 2026, HOLIDAYS, "ABC", STD_SHIFT)
+    pd.testing.assert_frame_equal(records_summary.drop(columns=["ot_hours"]), workbook_summary.drop(columns=["ot_hours"]))
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError, match="Unknown export format"):
+        generate_attendance_records(make_roster(1), 2, 2026, {}, STD_SHIFT, fmt="json")
@@ -0,0 +1,33 @@
+import datetime
+import random
+import zipfile
+
+import pytest
+
+from benchmarks.synthetic import make_roster
+from nfp.attendance import generate_attendance_file
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+SP_SHIFT = {"name": "(0900:1500)", "hours": 6, "out_hour": 15,
+            "start": datetime.date(2026, 3, 1), "end": datetime.date(2026, 3, 10)}
+
+
+def _parts(output):
+    package = zipfile.ZipFile(output)
+    return {name: package.read(name) for name in package.namelist() if name != "docProps/core.xml"}
+
+
+@pytest.mark.parametrize("month, sp_shift", [(2, None), (3, SP_SHIFT)])
+def test_template_render_matches_cell_by_cell(month, sp_shift):
+    roster = make_roster(15)
+    holidays = {datetime.date(2026, month, 5): "Kashmir Day"}
+    random.seed(7)
+    cells, _ = generate_attendance_file(roster, month, 2026, holidays, "ABC", STD_SHIFT, sp_shift, render="cells")
+    random.seed(7)
+    template, _ = generate_attendance_file(roster, month, 2026, holidays, "ABC", STD_SHIFT, sp_shift)
+    assert _parts(template) == _parts(cells)
+
+
+def test_unknown_render_mode_is_rejected():
+    with pytest.raises(ValueError, match="render mode"):
+        generate_attendance_file(make_roster(2), 2, 2026, {}, "ABC", STD_SHIFT, render="xml")
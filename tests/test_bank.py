@@ -0,0 +1,72 @@
+import tracemalloc
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_statement_pdf, make_statement_text
+from nfp.bank import (DEFAULT_RULES, UNCATEGORIZED, categorize, compile_rules, extract_text_from_pdf, generate_bank_excel,
+                      parse_bank_statement)
+from nfp.schema import SchemaError
+
+
+def _statement(rows):
+    return pd.DataFrame([{"Posting Date": "01/01/2025", "Value Date": "", "Instrument/Doc No": "", "Details": details,
+                          "Debit": debit, "Credit": credit, "Balance": 0.0} for details, debit, credit in rows])
+
+
+def _rules(*rows):
+    return pd.DataFrame(rows, columns=["Pattern", "Category", "Match", "Applies To"])
+
+
+def test_first_matching_rule_wins_per_side():
+    df = _statement([("--- Opening Balance ---", 0, 0), ("SALARY CREDIT REF1", 100, 0), ("SALARY CREDIT REF2", 0, 100),
+                     ("IBFT SALARY MARCH", 0, 50), ("SOMETHING ELSE", 10, 0)])
+    rules = _rules(("salary", "Payroll Expense", "keyword", "debit"), ("ibft", "Transfers", "keyword", "any"),
+                   ("salary", "Salary Income", "keyword", "credit"))
+    assert list(categorize(df, rules)) == ["", "Payroll Expense", "Salary Income", "Transfers", UNCATEGORIZED]
+
+
+def test_keywords_match_whole_words_and_phrases():
+    df = _statement([("UTILITY BILL PAYMENT K-ELECTRIC", 5, 0), ("TAXI FARE", 5, 0), ("ATM CASH\nWITHDRAWAL", 5, 0),
+                     ("WHT DEDUCTED", 5, 0)])
+    rules = _rules(("k electric", "Utilities", "keyword", "any"), ("tax, wht", "Taxes", "keyword", "any"),
+                   ("ATM CASH WITHDRAWAL", "Cash", "keyword", "any"))
+    assert list(categorize(df, rules)) == ["Utilities", UNCATEGORIZED, "Cash", "Taxes"]
+
+
+def test_regex_rules_respect_table_order():
+    df = _statement([("SMS ALERT CHARGES", 5, 0), ("POS PURCHASE 1234", 5, 0)])
+    rules = _rules((r"CHARGES?$", "Bank Charges", "regex", "any"), ("sms alert", "Alerts", "keyword", "any"),
+                   (r"POS\s+PURCHASE\s+\d+", "Cards", "regex", "any"))
+    assert list(categorize(df, rules)) == ["Bank Charges", "Cards"]
+
+
+def test_invalid_rules_are_reported_together():
+    with pytest.raises(SchemaError) as e:
+        compile_rules(_rules(("(", "A", "regex", "any"), ("x", "B", "fuzzy", "any"), ("y", "C", "keyword", "both")))
+    assert len(e.value.problems) == 3
+
+
+def test_excel_gets_category_column():
+    df = _statement([("--- Opening Balance ---", 0, 0), ("ATM CASH WITHDRAWAL", 500, 0)])
+    df = df.assign(Category=categorize(df, DEFAULT_RULES))
+    ws = openpyxl.load_workbook(generate_bank_excel(df)).active
+    assert ws["H1"].value == "Category" and ws["H3"].value == "Cash"
+
+
+def _extraction_peak(path):
+    tracemalloc.start()
+    try:
+        text = extract_text_from_pdf(path)
+        return text, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_pdf_extraction_memory_stays_flat_with_page_count(tmp_path):
+    small_text, small_peak = _extraction_peak(make_statement_pdf(tmp_path / "small.pdf", 2, lines_per_page=10))
+    large_text, large_peak = _extraction_peak(make_statement_pdf(tmp_path / "large.pdf", 12, lines_per_page=10))
+    assert len(parse_bank_statement(large_text)) == len(parse_bank_statement(make_statement_text(12, 10)))
+    # Six times the pages; with per-page layout caches kept alive the peak grows about as much
+    assert large_peak < 1.5 * small_peak
@@ -0,0 +1,24 @@
+import time
+
+from nfp.fragments import FragmentCache, content_key
+
+
+def test_round_trip_and_kinds_are_separate(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    cache.put_many("attendance", [("a", {"n": 1}, b"<sheet/>")])
+    assert cache.get_many("attendance", ["a", "missing"]) == {"a": ({"n": 1}, b"<sheet/>")}
+    assert cache.get_many("invoices", ["a"]) == {}
+
+
+def test_content_key_depends_on_every_part():
+    assert content_key("x", 1, {"h": 9}) == content_key("x", 1, {"h": 9})
+    assert content_key("x", 1, {"h": 9}) != content_key("x", 1, {"h": 8})
+
+
+def test_purge_drops_unused_entries(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    cache.put_many("attendance", [(str(i), None, b"") for i in range(600)])
+    assert len(cache.get_many("attendance", [str(i) for i in range(600)])) == 600
+    assert cache.purge(max_age_days=1) == 0
+    time.sleep(0.01)
+    assert cache.purge(max_age_days=0) == 600
@@ -0,0 +1,149 @@
+"""Generator outputs on the repository samples, compared with tests/golden/outputs.json.
+
+Each output is reduced to a canonical form (cell values, merged ranges,
+column widths and the styling that affects the printout) and hashed per
+sheet, so a change shows which sheet moved without storing whole workbooks.
+Timestamps and other package metadata are ignored. After an intended change
+to an output, regenerate the goldens with `pytest --update-golden` and
+review the diff of outputs.json.
+"""
+import datetime
+import hashlib
+import json
+import os
+import random
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from benchmarks.run import HEADER_INFO, STD_SHIFT
+from benchmarks.synthetic import make_punch_log, make_salary_roster, make_statement_pdf
+from nfp.attendance import generate_attendance_file, generate_attendance_from_punches
+from nfp.bank import DEFAULT_RULES, categorize, extract_text_from_pdf, generate_bank_excel, parse_bank_statement, statement_frame
+from nfp.invoices import generate_excel_invoice, generate_html_invoice
+from nfp.payroll import build_payroll_register, generate_register_excel
+from nfp.schema import SALARY_COLUMNS, normalize_frame
+from nfp.tax import build_gross_up_register, build_tax_register
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_PATH = os.path.join(ROOT, "tests", "golden", "outputs.json")
+HOLIDAYS = {datetime.date(2026, 2, 5): "Kashmir Day"}
+SEED = 0
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _sheet_form(ws):
+    cells = []
+    for row in ws.iter_rows():
+        for cell in row:
+            if cell.value is None and not cell.has_style:
+                continue
+            cells.append([cell.coordinate, repr(cell.value), cell.font.b, cell.font.sz, cell.font.color and cell.font.color.rgb,
+                          cell.border.left.style, cell.border.bottom.style, cell.alignment.horizontal,
+                          cell.fill.fgColor.rgb if cell.fill.fill_type else None, cell.number_format])
+    return {"cells": cells, "merged": sorted(str(r) for r in ws.merged_cells.ranges),
+            "widths": {k: d.width for k, d in sorted(ws.column_dimensions.items()) if d.width}}
+
+
+def _workbook(output):
+    wb = openpyxl.load_workbook(output)
+    return {ws.title: _digest(_sheet_form(ws)) for ws in wb.worksheets}
+
+
+def _frame(df):
+    return {"rows": len(df), "columns": list(df.columns), "digest": _digest(df.to_dict("split")["data"])}
+
+
+def _seeded(fn, *args, **kwargs):
+    random.seed(SEED)
+    return fn(*args, **kwargs)
+
+
+def attendance_output():
+    output, summary = _seeded(generate_attendance_file, pd.read_excel(os.path.join(ROOT, "data.xlsx")), 2, 2026,
+                              HOLIDAYS, "ABC COMPANY", STD_SHIFT)
+    return {"workbook": _workbook(output), "summary": _frame(summary)}
+
+
+def punch_attendance_output():
+    output, summary = generate_attendance_from_punches(make_punch_log(25, seed=SEED), 2, 2026, HOLIDAYS, "ABC COMPANY", STD_SHIFT)
+    return {"workbook": _workbook(output), "summary": _frame(summary)}
+
+
+def invoices_output():
+    sales = pd.read_excel(os.path.join(ROOT, "sales_register.xlsx"))
+    html = _seeded(generate_html_invoice, sales, HEADER_INFO, 18.0).read()
+    excel = _seeded(generate_excel_invoice, sales, HEADER_INFO, 18.0)
+    return {"html": hashlib.sha256(html).hexdigest()[:16], "workbook": _workbook(excel)}
+
+
+def bank_output(tmp_path):
+    # The repository has no sample bank statement, so a fixed synthetic one stands in
+    text = extract_text_from_pdf(make_statement_pdf(tmp_path / "statement.pdf", 3, seed=SEED))
+    df = statement_frame(parse_bank_statement(text))
+    df = df.assign(Category=categorize(df, DEFAULT_RULES))
+    return {"text": hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], "transactions": _frame(df),
+            "workbook": _workbook(generate_bank_excel(df))}
+
+
+def payroll_output():
+    random.seed(SEED)
+    _, summary = generate_attendance_file(pd.read_excel(os.path.join(ROOT, "data.xlsx")), 2, 2026, HOLIDAYS, "ABC COMPANY", STD_SHIFT)
+    salaries = make_salary_roster(60, seed=SEED)
+    salaries["CODE"] = summary["code"].tolist() + list(salaries["CODE"][len(summary):])
+    roster = normalize_frame(salaries, SALARY_COLUMNS)
+    register, missing = build_payroll_register(summary, roster, STD_SHIFT["hours"])
+    tax = build_tax_register(roster)
+    gross_up = build_gross_up_register(roster.assign(monthly_net=roster["monthly_gross"]))
+    return {"payroll": _frame(register), "missing": [str(code) for code in missing],
+            "payroll_workbook": _workbook(generate_register_excel(register, "Payroll Register")),
+            "tax": _frame(tax), "gross_up": _frame(gross_up.round(6))}
+
+
+OUTPUTS = {
+    "attendance": attendance_output,
+    "attendance_punches": punch_attendance_output,
+    "invoices": invoices_output,
+    "bank": bank_output,
+    "payroll": payroll_output,
+}
+
+
+def _load_golden():
+    if not os.path.exists(GOLDEN_PATH):
+        return {}
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _changed(expected, actual, path=""):
+    """Paths of the leaves that differ, e.g. `workbook/1001_Ali`."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return [p for key in sorted(set(expected) | set(actual))
+                for p in _changed(expected.get(key), actual.get(key), f"{path}/{key}".lstrip("/"))]
+    return [] if expected == actual else [path or "(value)"]
+
+
+@pytest.mark.parametrize("name", list(OUTPUTS))
+def test_matches_golden(name, request, tmp_path):
+    build = OUTPUTS[name]
+    actual = build(tmp_path) if name == "bank" else build()
+    actual = json.loads(json.dumps(actual, default=str))
+
+    if request.config.getoption("--update-golden"):
+        golden = _load_golden()
+        golden[name] = actual
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+            f.write("\n")
+        return
+
+    golden = _load_golden()
+    assert name in golden, f"no golden output for '{name}'; run pytest --update-golden"
+    changed = _changed(golden[name], actual)
+    assert not changed, f"{name} output differs from the golden in: {', '.join(changed[:20])}"
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from nfp.governor import AdmissionTimeout, Governor, estimate_cost
+
+
+def _run_all(governor, jobs, hold=0.05):
+    """Starts `(tool, cost)` runs on threads in order; returns the admission order and peak concurrency."""
+    order, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def run(name, cost):
+        with governor.admit(name, cost, poll=0.01):
+            with lock:
+                order.append(name)
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(hold)
+            with lock:
+                active[0] -= 1
+
+    threads = []
+    for name, cost in jobs:
+        threads.append(threading.Thread(target=run, args=(name, cost)))
+        threads[-1].start()
+        time.sleep(0.005)   # fix arrival order
+    for thread in threads:
+        thread.join()
+    return order, peak[0]
+
+
+def test_concurrent_runs_are_capped():
+    order, peak = _run_all(Governor(budget_mb=10_000, max_runs=2), [(f"job{i}", 10) for i in range(6)])
+    assert peak == 2
+    assert order == [f"job{i}" for i in range(6)]
+
+
+def test_memory_budget_limits_admission():
+    _, peak = _run_all(Governor(budget_mb=100, max_runs=10), [(f"job{i}", 60) for i in range(4)])
+    assert peak == 1
+
+
+def test_oversized_run_is_admitted_alone():
+    order, peak = _run_all(Governor(budget_mb=100, max_runs=4), [("small", 10), ("huge", 500), ("after", 10)])
+    assert order == ["small", "huge", "after"]
+    assert peak == 1
+
+
+def test_queued_run_reports_position_and_can_give_up():
+    governor = Governor(budget_mb=100, max_runs=1)
+    positions = []
+
+    def on_wait(position, running):
+        positions.append((position, running))
+        raise KeyboardInterrupt   # e.g. the session was closed
+
+    with governor.admit("first", 10):
+        with pytest.raises(KeyboardInterrupt):
+            with governor.admit("second", 10, on_wait=on_wait):
+                pass
+        assert governor.status()["queued"] == 0
+    assert positions == [(1, 1)]
+    assert governor.status() == {"running": [], "queued": 0, "budget_mb": 100, "max_runs": 1}
+
+
+def test_admission_timeout():
+    governor = Governor(budget_mb=100, max_runs=1)
+    with governor.admit("first", 10):
+        with pytest.raises(AdmissionTimeout):
+            with governor.admit("second", 10, timeout=0.05, poll=0.01):
+                pass
+    with governor.admit("third", 10, timeout=0.05):
+        pass
+
+
+def test_cost_grows_with_input_size():
+    assert estimate_cost("attendance", 5000) > estimate_cost("attendance", 50) > 0
+    with pytest.raises(KeyError):
+        estimate_cost("unknown", 1)
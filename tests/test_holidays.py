@@ -0,0 +1,46 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from nfp.holidays import HolidayCalendar
+from nfp.schema import HOLIDAY_COLUMNS, SchemaError, normalize_frame
+
+D = datetime.date
+
+
+def test_month_query_returns_only_that_month(tmp_path):
+    cal = HolidayCalendar(str(tmp_path / "h.sqlite3"))
+    assert cal.bulk_import([(D(2026, 2, 5), "Kashmir Day"), (D(2026, 3, 23), "Pakistan Day"),
+                            ("2026-01-31", "Edge"), (D(2026, 2, 28), "Month End")]) == 4
+    assert cal.month(2026, 2) == {D(2026, 2, 5): "Kashmir Day", D(2026, 2, 28): "Month End"}
+    assert list(cal.months([(2026, 1), (2026, 2), (2026, 3)])) == [
+        D(2026, 1, 31), D(2026, 2, 5), D(2026, 2, 28), D(2026, 3, 23)]
+
+
+def test_holidays_persist_and_duplicates_are_ignored(tmp_path):
+    path = str(tmp_path / "h.sqlite3")
+    HolidayCalendar(path).add(D(2026, 5, 1), "Labour Day")
+    cal = HolidayCalendar(path)
+    assert cal.add(D(2026, 5, 1), "Labour Day") == 0
+    cal.add(D(2026, 5, 1), "Youm-e-Takbeer")
+    assert cal.month(2026, 5) == {D(2026, 5, 1): "Labour Day / Youm-e-Takbeer"}
+    assert cal.remove(D(2026, 5, 1), D(2026, 5, 31)) == 2
+    assert cal.month(2026, 5) == {}
+
+
+def test_import_from_uploaded_sheet(tmp_path):
+    cal = HolidayCalendar(str(tmp_path / "h.sqlite3"))
+    sheet = pd.DataFrame({"Holiday Date": ["2026-08-14", None, "2026-12-25"],
+                          "Holiday": ["Independence Day", None, "Quaid Day"]})   # blank line is skipped
+    assert cal.import_frame(normalize_frame(sheet, HOLIDAY_COLUMNS)) == 2
+    assert [name for _, name in cal.between(D(2026, 1, 1), D(2026, 12, 31))] == ["Independence Day", "Quaid Day"]
+
+
+def test_import_reports_unreadable_dates(tmp_path):
+    cal = HolidayCalendar(str(tmp_path / "h.sqlite3"))
+    sheet = pd.DataFrame({"Holiday Date": ["2026-08-14", "not a date", None],
+                          "Holiday": ["Independence Day", "Bad Row", "No Date"]})
+    with pytest.raises(SchemaError, match=r"row\(s\) 3, 4"):
+        cal.import_frame(normalize_frame(sheet, HOLIDAY_COLUMNS))
+    assert cal.between(D(2026, 1, 1), D(2026, 12, 31)) == []
@@ -0,0 +1,110 @@
+import datetime
+import pstats
+
+from benchmarks.synthetic import make_roster
+from nfp.attendance import generate_attendance_file
+from nfp.instrument import Trace, span
+from nfp.schema import ATTENDANCE_COLUMNS, normalize_frame
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+
+
+def test_spans_without_trace_are_noops():
+    with span("compute"):
+        pass
+
+
+def test_repeated_spans_aggregate_per_stage():
+    trace = Trace("job")
+    with trace:
+        for _ in range(3):
+            with span("render"):
+                pass
+        with span("serialize"):
+            pass
+    records = trace.records()
+    assert [r["stage"] for r in records] == ["render", "serialize"]
+    assert records[0]["calls"] == 3
+    assert records[0]["peak_mb"] is None
+
+
+def test_nested_span_peak_carries_to_parent():
+    trace = Trace("job", memory=True)
+    with trace:
+        with span("outer"):
+            with span("inner"):
+                block = bytearray(4 * 2**20)
+            del block
+    stages = {r["stage"]: r for r in trace.records()}
+    assert stages["inner"]["peak_mb"] >= 4
+    assert stages["outer"]["peak_mb"] >= stages["inner"]["peak_mb"]
+
+
+def test_trace_entered_once_per_stage():
+    # The pages enter their trace around each run call only, not across the whole rerun
+    import tracemalloc
+
+    trace = Trace("job", memory=True)
+    with trace, span("ingest"):
+        pass
+    assert not tracemalloc.is_tracing()
+    with trace, span("compute"):
+        block = bytearray(2 * 2**20)
+        del block
+    assert not tracemalloc.is_tracing()
+    stages = {r["stage"]: r for r in trace.records()}
+    assert list(stages) == ["ingest", "compute"]
+    assert stages["compute"]["peak_mb"] >= 2
+
+
+def test_attendance_run_reports_every_stage(tmp_path):
+    roster = normalize_frame(make_roster(3), ATTENDANCE_COLUMNS)
+    trace = Trace("attendance", memory=True, profile=True)
+    with trace:
+        generate_attendance_file(roster, 2, 2026, {datetime.date(2026, 2, 5): "Kashmir Day"}, "ABC", STD_SHIFT)
+    stages = {r["stage"]: r for r in trace.records()}
+    assert {"compute", "render", "serialize"} <= set(stages)
+    assert stages["compute"]["calls"] == 3
+
+    prof = tmp_path / "run.prof"
+    prof.write_bytes(trace.profile_bytes())
+    assert pstats.Stats(str(prof)).total_calls > 0
+
+
+def test_concurrent_memory_traces_share_tracemalloc():
+    # Two sessions' runs overlapping: A finishing first must not stop tracing under B,
+    # and B's spans must not reset the peak A is measuring
+    import threading
+    import tracemalloc
+
+    a_freed, b_started, a_done = threading.Event(), threading.Event(), threading.Event()
+    traces = {"a": Trace("a", memory=True), "b": Trace("b", memory=True)}
+
+    def run_a():
+        with traces["a"]:
+            with span("work"):
+                block = bytearray(8 * 2**20)
+                del block
+                a_freed.set()
+                b_started.wait(10)
+        a_done.set()
+
+    def run_b():
+        a_freed.wait(10)
+        with traces["b"]:
+            with span("start"):
+                pass
+            b_started.set()
+            a_done.wait(10)
+            assert tracemalloc.is_tracing()
+            with span("after_a"):
+                pass
+
+    threads = [threading.Thread(target=run_a), threading.Thread(target=run_b)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {r["stage"]: r["peak_mb"] for r in traces["a"].records()}["work"] >= 8
+    assert {r["stage"]: r["peak_mb"] for r in traces["b"].records()}["after_a"] is not None
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,32 @@
+import re
+
+from benchmarks.synthetic import make_sales_register
+from nfp.invoices import generate_html_invoice
+
+HEADER = {"company_name": "ABC", "address": "Karachi", "phone": "1", "email": "a@b.c", "web": "abc.pk", "ntn": "N1"}
+# Hooks for the print rules and layout, not utilities
+MARKER_CLASSES = {"dark-bg", "dark-border", "main-content", "printable-container", "section-spacing", "table-container"}
+
+
+def test_html_is_self_contained_and_static():
+    html = generate_html_invoice(make_sales_register(3, 2), HEADER, 18).read().decode("utf-8")
+    assert "<script" not in html and "http" not in html.split("<body")[0]
+    assert "<input" not in html and "<textarea" not in html
+
+
+def test_every_template_class_has_a_rule():
+    html = generate_html_invoice(make_sales_register(3, 2), HEADER, 18).read().decode("utf-8")
+    css = html.split("</style>")[0].replace("\\:", ":")
+    used = {name for attr in re.findall(r'class="([^"]*)"', html) for name in attr.split()}
+    missing = {name for name in used - MARKER_CLASSES if f".{name} " not in css and f".{name}:" not in css and f".{name}." not in css}
+    assert not missing
+
+
+def test_sheet_and_header_values_are_escaped():
+    sales = make_sales_register(1, 1)
+    sales["Customer Name"] = "A & B <Ltd>"
+    sales["Item Description"] = "Yarn </td></tr><script>x</script>"
+    html = generate_html_invoice(sales, dict(HEADER, company_name="C&D"), 18).read().decode("utf-8")
+    assert "A &amp; B &lt;Ltd&gt;" in html and "<Ltd>" not in html
+    assert "&lt;/td&gt;&lt;/tr&gt;&lt;script&gt;" in html and "<script" not in html
+    assert "For C&amp;D" in html
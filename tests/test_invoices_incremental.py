@@ -0,0 +1,76 @@
+import openpyxl
+import pandas as pd
+
+from benchmarks.synthetic import make_sales_register
+from nfp.fragments import FragmentCache
+from nfp.invoices import generate_excel_invoice, generate_html_invoice, invoice_changes
+
+HEADER = {"company_name": "ABC", "address": "Karachi", "phone": "1", "email": "a@b.c", "web": "abc.pk", "ntn": "N1"}
+
+
+def _cells(output):
+    ws = openpyxl.load_workbook(output).active
+    return ws.dimensions, [[(c.value, c.font.b, c.border.left.style) for c in row] for row in ws.iter_rows()]
+
+
+def test_excel_from_cache_matches_full_render(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    sales = make_sales_register(6, 3)
+    generate_excel_invoice(sales, HEADER, 18, cache=cache)
+
+    grown = sales.copy()
+    grown.loc[grown.index[-1], "Qty"] += 5
+    grown = pd.concat([grown, make_sales_register(8, 3).iloc[-6:]], ignore_index=True)
+    assert _cells(generate_excel_invoice(grown, HEADER, 18, cache=cache)) == _cells(generate_excel_invoice(grown, HEADER, 18))
+
+
+def test_change_report_and_html_reuse(tmp_path):
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    sales = make_sales_register(4, 2)
+    assert set(invoice_changes(sales, HEADER, 18, cache)["status"]) == {"new"}
+    first = generate_html_invoice(sales, HEADER, 18, cache=cache).read()
+
+    edited = sales.copy()
+    edited.loc[edited.index[0], "Unit Price (PKR)"] += 1
+    changes = invoice_changes(edited, HEADER, 18, cache)
+    assert list(changes["status"]) == ["modified", "unchanged", "unchanged", "unchanged"]
+    assert set(invoice_changes(sales, HEADER, 17, cache)["status"]) == {"modified"}
+
+    # Unchanged DCs are copied byte for byte, including their random job numbers
+    assert generate_html_invoice(sales, HEADER, 18, cache=cache).read() == first
+
+
+def test_blank_customer_fields_survive_row_splitting(tmp_path):
+    # Blank string cells are written self-closing; rows holding them must be kept whole
+    cache = FragmentCache(str(tmp_path / "fragments.sqlite3"))
+    sales = make_sales_register(5, 2)
+    sales.loc[sales.index[:3], "Customer NTN"] = None
+    sales.loc[sales.index[-1], "Customer Name"] = ""
+    full = _cells(generate_excel_invoice(sales, HEADER, 18))
+    assert _cells(generate_excel_invoice(sales, HEADER, 18, cache=cache)) == full   # cold cache
+    assert _cells(generate_excel_invoice(sales, HEADER, 18, cache=cache)) == full   # all DCs cached
+
+
+def test_rows_with_shared_strings_are_not_cached(tmp_path, monkeypatch):
+    # A writer that emits shared-string cells: their indexes only mean something in this workbook
+    import io
+    import sqlite3
+    import zipfile
+
+    from nfp import invoices
+    render = invoices._render_invoice_blocks
+
+    def shared_string_render(*args):
+        package, sheet_path, starts, next_row = render(*args)
+        rewritten = io.BytesIO()
+        with zipfile.ZipFile(rewritten, "w") as out:
+            for info in package.infolist():
+                data = package.read(info)
+                out.writestr(info, data.replace(b't="inlineStr"', b't="s"') if info.filename == sheet_path else data)
+        return zipfile.ZipFile(rewritten), sheet_path, starts, next_row
+
+    monkeypatch.setattr(invoices, "_render_invoice_blocks", shared_string_render)
+    path = tmp_path / "fragments.sqlite3"
+    generate_excel_invoice(make_sales_register(3, 2), HEADER, 18, cache=FragmentCache(str(path)))
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fragments WHERE kind = 'invoice-xlsx'").fetchone() == (0,)
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_roster, make_salary_roster
+from nfp.jobs import DONE, FAILED, RETENTION_SECONDS, JobRunner, JobStore, run_job, worker_loop
+from nfp.schema import ATTENDANCE_COLUMNS, SALARY_COLUMNS, normalize_frame
+
+STD_SHIFT = {"name": "(0900:1800)", "hours": 9, "out_hour": 18}
+
+
+def _attendance_params(n):
+    return {"df": normalize_frame(make_roster(n), ATTENDANCE_COLUMNS), "month": 2, "year": 2026,
+            "holidays": {}, "company_name": "ABC", "std_shift": STD_SHIFT, "sp_shift": None,
+            "period": "February 2026", "file_name": "NFP_Attendance_February_2026.xlsx"}
+
+
+def _tax_params(n):
+    return {"df": normalize_frame(make_salary_roster(n), SALARY_COLUMNS), "tax_year": "2025-26",
+            "file_name": "NFP_Tax_Register_2025-26.xlsx"}
+
+
+def test_job_runs_to_completion_with_artifact_and_result(tmp_path):
+    store = JobStore(str(tmp_path))
+    job_id = store.submit("attendance", _attendance_params(4), owner="s1")
+    assert store.get(job_id)["status"] == "queued"
+
+    run_job(store, store.claim(worker_pid=1))
+    job = store.get(job_id)
+    assert job["status"] == DONE and job["progress"] == 1.0
+    assert [a["name"] for a in job["artifacts"]] == ["NFP_Attendance_February_2026.xlsx"]
+    with open(store.artifact_path(job_id, job["artifacts"][0]["name"]), "rb") as f:
+        assert f.read(2) == b"PK"
+    assert len(store.load_result(job_id)["summary"]) == 4
+    assert store.claim(worker_pid=1) is None
+
+
+def test_failed_job_records_error(tmp_path):
+    store = JobStore(str(tmp_path))
+    bad = _tax_params(2)
+    bad["df"] = pd.DataFrame({"code": [1]})
+    job_id = store.submit("tax_register", bad)
+    run_job(store, store.claim(worker_pid=1))
+    job = store.get(job_id)
+    assert job["status"] == FAILED
+    assert "monthly_gross" in job["error"]
+
+
+def test_queued_jobs_can_be_cancelled_and_are_listed_per_owner(tmp_path):
+    store = JobStore(str(tmp_path))
+    first = store.submit("tax_register", _tax_params(2), owner="a")
+    store.submit("tax_register", _tax_params(2), owner="b")
+    assert store.cancel(first)
+    assert store.claim(worker_pid=1)["owner"] == "b"
+    assert [j["id"] for j in store.list(owner="a")] == [first]
+
+
+def test_unknown_kind_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown job kind"):
+        JobStore(str(tmp_path)).submit("payslips", {})
+
+
+def test_dead_worker_jobs_are_failed(tmp_path):
+    store = JobStore(str(tmp_path))
+    job_id = store.submit("tax_register", _tax_params(2))
+    store.claim(worker_pid=2**22 + 12345)
+    store.recover()
+    assert store.get(job_id)["status"] == FAILED
+
+
+def test_worker_pool_processes_queue(tmp_path):
+    runner = JobRunner(str(tmp_path), workers=2, poll_interval=0.05).start()
+    try:
+        ids = [runner.store.submit("tax_register", _tax_params(50)) for _ in range(3)]
+        deadline = time.time() + 60
+        while time.time() < deadline and any(runner.store.get(i)["status"] != DONE for i in ids):
+            time.sleep(0.1)
+        assert [runner.store.get(i)["status"] for i in ids] == [DONE] * 3
+        assert len({runner.store.get(i)["worker_pid"] for i in ids}) <= 2
+    finally:
+        runner.stop()
+
+
+def test_attendance_records_job_stores_days_and_summary(tmp_path):
+    store = JobStore(str(tmp_path))
+    params = dict(_attendance_params(3), fmt="csv", file_name="NFP_Attendance_February_2026.csv")
+    job_id = store.submit("attendance_records", params)
+    run_job(store, store.claim(worker_pid=1))
+    job = store.get(job_id)
+    assert job["status"] == DONE
+    assert [a["name"] for a in job["artifacts"]] == ["NFP_Attendance_February_2026.csv",
+                                                     "NFP_Attendance_February_2026_summary.csv"]
+    assert len(pd.read_csv(store.artifact_path(job_id, job["artifacts"][0]["name"]))) == 3 * 28
+
+
+def test_idle_worker_purges_expired_jobs(tmp_path):
+    store = JobStore(str(tmp_path))
+    old, recent = (store.submit("tax_register", _tax_params(2)) for _ in range(2))
+    for job_id in (old, recent):
+        run_job(store, store.claim(worker_pid=1))
+    with store._connect() as conn:
+        conn.execute("UPDATE jobs SET finished = ? WHERE id = ?", (time.time() - RETENTION_SECONDS - 60, old))
+
+    stop = threading.Event()
+    worker = threading.Thread(target=worker_loop, args=(store.root, 0.01, stop), kwargs={"purge_interval": 0})
+    worker.start()
+    deadline = time.time() + 10
+    while store.get(old) is not None and time.time() < deadline:
+        time.sleep(0.02)
+    stop.set()
+    worker.join()
+    assert store.get(old) is None and not os.path.exists(store.job_dir(old))
+    assert store.get(recent)["status"] == DONE
@@ -0,0 +1,38 @@
+import ast
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules app.py may import at top level; everything tool-specific is imported inside its page
+SHELL_IMPORTS = {"streamlit", "datetime", "logging", "urllib.parse", "os"}
+
+
+def test_app_top_level_imports_stay_light():
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    imported = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imported.add(node.module)
+    assert imported <= SHELL_IMPORTS, f"heavy top-level import in app.py: {imported - SHELL_IMPORTS}"
+
+
+@pytest.mark.parametrize("module, forbidden", [
+    ("nfp.tax", ["pdfplumber", "openpyxl", "xlsxwriter"]),
+    ("nfp.payroll", ["pdfplumber", "openpyxl"]),
+    ("nfp.attendance", ["pdfplumber"]),
+    ("nfp.invoices", ["pdfplumber"]),
+    ("nfp.bank", ["openpyxl"]),
+    ("nfp.jobs", ["pandas", "pdfplumber", "openpyxl"]),
+    ("nfp.uploads", ["pandas", "pdfplumber", "openpyxl"]),
+])
+def test_tool_modules_do_not_pull_other_tools_dependencies(module, forbidden):
+    code = f"import sys, {module}; print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
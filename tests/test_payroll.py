@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from nfp.payroll import build_payroll_register
+from nfp.schema import SALARY_COLUMNS, normalize_frame
+from nfp.tax import calculate_fbr_tax
+
+
+def _summary(**overrides):
+    row = {"code": 1360, "name": "Khurram", "status": "", "days_in_month": 28, "active_days": 28,
+           "present_days": 23, "absent_days": 0, "std_hours": 207, "ot_hours": 0, "payable_hours": 207}
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def _roster(code, salary):
+    return normalize_frame(pd.DataFrame({"CODE": [code], "Monthly Gross Salary": [salary]}), SALARY_COLUMNS)
+
+
+def test_full_month_without_ot_pays_full_salary():
+    register, missing = build_payroll_register(_summary(), _roster("1360", 100000), std_hours_per_day=9)
+    row = register.iloc[0]
+    assert missing == []
+    assert row["Gross Pay"] == pytest.approx(100000)
+    assert row["Income Tax"] == pytest.approx(calculate_fbr_tax(100000)[2])
+    assert row["Net Pay"] == pytest.approx(100000 - calculate_fbr_tax(100000)[2])
+
+
+def test_absence_and_ot_adjust_gross():
+    register, _ = build_payroll_register(_summary(absent_days=2, ot_hours=10), _roster(1360, 52000),
+                                         std_hours_per_day=8, ot_multiplier=2.0, working_day_basis=26)
+    row = register.iloc[0]
+    assert row["Paid Days"] == 26
+    assert row["Earned Salary"] == pytest.approx(52000 * 26 / 28, abs=0.01)
+    assert row["OT Pay"] == pytest.approx(10 * 250 * 2.0)
+
+
+def test_employees_without_salary_are_reported():
+    register, missing = build_payroll_register(_summary(code="E-9"), _roster("1360", 100000), std_hours_per_day=9)
+    assert register.empty
+    assert missing == ["E-9"]
@@ -0,0 +1,86 @@
+"""Timed benchmarks compared with tests/perf_baseline.json (run with `pytest --perf`).
+
+Each workload is the "small" size from `benchmarks.run`. The baseline and
+every check use the median of several runs, stored relative to the median
+of a fixed pure-Python calibration loop run on the same machine, so a
+baseline recorded on one computer still means something on another. A test
+fails when its relative time grows beyond NFP_PERF_THRESHOLD (default 1.5x)
+of the baseline, or NFP_PERF_FAST_THRESHOLD (default 2x) for workloads
+under 0.1 s whose timings are mostly scheduler noise, and by more than
+NFP_PERF_MIN_SECONDS (default 0.03 s).
+After an intended slowdown, or to record new tools, run
+`pytest --perf --update-baseline` and commit the file.
+"""
+import json
+import os
+import statistics
+import time
+
+import pytest
+
+from benchmarks.run import WORKLOADS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "tests", "perf_baseline.json")
+THRESHOLD = float(os.environ.get("NFP_PERF_THRESHOLD", 1.5))
+FAST_THRESHOLD = float(os.environ.get("NFP_PERF_FAST_THRESHOLD", 2.0))
+FAST_SECONDS = 0.1
+MIN_SECONDS = float(os.environ.get("NFP_PERF_MIN_SECONDS", 0.03))
+REPEATS = 7
+TOOLS = [tool for tool in WORKLOADS if tool != "attendance_cells"]   # attendance_cells is a reference path
+
+
+def _median_time(job, repeats=REPEATS):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        job()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def _calibration_loop():
+    total = 0
+    for i in range(300_000):
+        total += hash(str(i)) % 7
+    return sorted(str(i * 7919 % 100_003) for i in range(100_000))
+
+
+@pytest.fixture(scope="session")
+def calibration():
+    return _median_time(_calibration_loop)
+
+
+def _load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("tool", TOOLS)
+def test_no_regression_against_baseline(tool, calibration, request):
+    factory, sizes = WORKLOADS[tool]
+    n, _, job = factory(sizes["small"])
+    job()   # warm-up: imports, caches, first-call allocations
+    wall = _median_time(job)
+    relative = wall / calibration
+
+    if request.config.getoption("--update-baseline"):
+        baseline = _load_baseline()
+        baseline[tool] = {"n": n, "relative": round(relative, 4), "wall_s": round(wall, 4)}
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+            f.write("\n")
+        return
+
+    baseline = _load_baseline().get(tool)
+    if baseline is None:
+        pytest.skip(f"no baseline for '{tool}'; run pytest --perf --update-baseline")
+    assert n == baseline["n"], f"workload size changed ({baseline['n']} -> {n}); update the baseline"
+    threshold = FAST_THRESHOLD if baseline["wall_s"] < FAST_SECONDS else THRESHOLD
+    slower_by = (relative - baseline["relative"]) * calibration
+    assert relative <= baseline["relative"] * threshold or slower_by <= MIN_SECONDS, (
+        f"{tool} took {wall:.3f}s (median of {REPEATS}), {relative / baseline['relative']:.2f}x its baseline "
+        f"(limit {threshold:g}x, calibration {calibration:.3f}s)")
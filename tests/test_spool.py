@@ -0,0 +1,29 @@
+import openpyxl
+
+from benchmarks.synthetic import make_sales_register, make_salary_roster
+from nfp import spool
+from nfp.invoices import generate_html_invoice
+from nfp.payroll import generate_register_excel
+from nfp.schema import SALARY_COLUMNS, normalize_frame
+from nfp.tax import build_tax_register
+
+HEADER_INFO = {"company_name": "X", "address": "A", "phone": "1", "email": "e", "web": "w", "ntn": "n"}
+
+
+def test_large_outputs_roll_over_to_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(spool, "SPOOL_MAX_BYTES", 64 * 1024)
+    html = generate_html_invoice(make_sales_register(50, 4), HEADER_INFO, 18.0)
+    assert spool.on_disk(html)
+    assert html.tell() == 0
+
+    size = spool.save_output(html, tmp_path / "invoices.html")
+    assert size == spool.output_size(html) == (tmp_path / "invoices.html").stat().st_size
+    text = spool.read_output(html).decode("utf-8")
+    assert text.lstrip().startswith("<!DOCTYPE html>") and text.rstrip().endswith("</html>")
+
+
+def test_small_outputs_stay_in_memory_and_open_as_workbooks():
+    roster = normalize_frame(make_salary_roster(10), SALARY_COLUMNS)
+    output = generate_register_excel(build_tax_register(roster), "Tax Register")
+    assert not spool.on_disk(output)
+    assert openpyxl.load_workbook(output).active.max_row == 11
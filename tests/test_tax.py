@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfp.tax import (TAX_TABLES, annual_tax, annual_tax_batch, build_gross_up_register, build_tax_table,
+                     calculate_fbr_tax, calculate_fbr_tax_batch, calculate_gross_for_net,
+                     calculate_gross_for_net_batch, get_tax_table, gross_for_net, gross_for_net_batch)
+
+# Fixed tax published by FBR at each slab threshold, Tax Year 2025-26
+PUBLISHED_2025_26 = {600000: 0, 1200000: 6000, 2200000: 116000, 3200000: 346000, 4100000: 616000}
+
+
+def test_cumulative_tax_matches_published_amounts():
+    table = get_tax_table("2025-26")
+    assert dict(zip(table.lower[1:], table.base[1:])) == pytest.approx(PUBLISHED_2025_26)
+
+
+@pytest.mark.parametrize("year", list(TAX_TABLES))
+def test_boundaries_are_continuous(year):
+    table = get_tax_table(year)
+    for threshold, base in zip(table.lower[1:], table.base[1:]):
+        # Income exactly on a threshold is taxed in the lower slab and equals the precomputed base
+        assert annual_tax(threshold, year) == pytest.approx(base)
+        assert annual_tax(threshold + 1, year) == pytest.approx(base + table.rate[table.lower.index(threshold)])
+
+
+@pytest.mark.parametrize("income, expected", [
+    (0, 0), (600000, 0), (600001, 0.01), (1200000, 6000), (1500000, 39000),
+    (2200000, 116000), (3000000, 300000), (4100000, 616000), (5000000, 931000),
+])
+def test_known_values_2025_26(income, expected):
+    assert annual_tax(income, "2025-26") == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("year", list(TAX_TABLES))
+def test_batch_matches_scalar(year):
+    table = get_tax_table(year)
+    incomes = np.concatenate([
+        np.array(table.lower, dtype=float),
+        np.array(table.lower[1:], dtype=float) + 1,
+        np.array(table.lower[1:], dtype=float) - 1,
+        np.random.default_rng(0).uniform(0, 20000000, 1000),
+    ])
+    expected = [annual_tax(x, year) for x in incomes]
+    assert annual_tax_batch(incomes, year) == pytest.approx(expected)
+
+
+def test_monthly_helpers_agree():
+    salaries = [0, 50000, 100000, 250000, 1000000]
+    annual, tax, monthly = calculate_fbr_tax_batch(salaries)
+    for i, salary in enumerate(salaries):
+        assert (annual[i], tax[i], monthly[i]) == pytest.approx(calculate_fbr_tax(salary))
+
+
+def test_unknown_tax_year_is_rejected():
+    with pytest.raises(ValueError, match="Unknown tax year"):
+        get_tax_table("1999-00")
+
+
+def test_thresholds_must_increase():
+    with pytest.raises(ValueError):
+        build_tax_table("bad", ((600000, 0.01), (500000, 0.05)))
+
+
+def test_rates_must_be_below_one():
+    with pytest.raises(ValueError):
+        build_tax_table("bad", ((600000, 1.0),))
+
+
+@pytest.mark.parametrize("year", list(TAX_TABLES))
+def test_gross_for_net_inverts_forward_calculator(year):
+    table = get_tax_table(year)
+    gross = np.concatenate([
+        np.array(table.lower, dtype=float),
+        np.array(table.lower[1:], dtype=float) + 1,
+        np.array(table.lower[1:], dtype=float) - 1,
+        np.random.default_rng(0).uniform(0, 20000000, 1000),
+    ])
+    net = gross - annual_tax_batch(gross, year)
+    assert gross_for_net_batch(net, year) == pytest.approx(gross, abs=1e-6)
+    assert [gross_for_net(x, year) for x in net] == pytest.approx(gross, abs=1e-6)
+
+
+def test_monthly_gross_for_net_round_trips():
+    targets = [0, 40000, 100000, 97850, 250000, 1000000]
+    gross = calculate_gross_for_net_batch(targets)
+    for target, g in zip(targets, gross):
+        assert g == pytest.approx(calculate_gross_for_net(target))
+        assert g - calculate_fbr_tax(g)[2] == pytest.approx(target)
+
+
+def test_gross_up_register_reports_forward_net():
+    roster = pd.DataFrame({"code": ["G1", "G2"], "name": ["Officer", "Manager"], "monthly_net": [150000.0, 400000.0]})
+    register = build_gross_up_register(roster)
+    assert list(register["Net Monthly Salary"]) == pytest.approx([150000.0, 400000.0])
+    assert (register["Monthly Gross Salary"] > register["Target Net Salary"]).all()
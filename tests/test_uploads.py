@@ -0,0 +1,70 @@
+import hashlib
+import io
+import os
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_statement_pdf
+from nfp.jobs import DONE, JobStore, run_job
+from nfp.uploads import UploadStore, read_table
+
+
+def _age(path, hours):
+    past = time.time() - hours * 3600
+    os.utime(path, (past, past))
+
+
+def test_identical_uploads_share_one_content_addressed_file(tmp_path):
+    store = UploadStore(str(tmp_path / "uploads"))
+    data = os.urandom(3 * 2**20 + 17)   # spans several chunks
+    first = store.put(io.BytesIO(data), suffix=".XLSX")
+    second = store.put(io.BytesIO(data), suffix=".xlsx")
+    other = store.put(io.BytesIO(data[:-1]), suffix=".xlsx")
+
+    assert first == second != other
+    assert os.path.basename(first) == hashlib.sha256(data).hexdigest() + ".xlsx"
+    with open(first, "rb") as f:
+        assert f.read() == data
+    assert sorted(os.listdir(store.root)) == sorted(os.path.basename(p) for p in (first, other))
+
+
+def test_put_rewinds_the_upload(tmp_path):
+    upload = io.BytesIO(b"code,name\n1,Ali\n")
+    upload.read(4)
+    path = UploadStore(str(tmp_path)).put(upload, suffix=".csv")
+    assert upload.tell() == 0
+    assert read_table(path).to_dict("list") == {"code": [1], "name": ["Ali"]}
+
+
+def test_eviction_by_age_then_size(tmp_path):
+    store = UploadStore(str(tmp_path), max_age_hours=24, max_mb=2)
+    old, stale, recent, newest = (store.put(io.BytesIO(bytes([i]) * 2**20), suffix=".pdf") for i in range(4))
+    _age(old, 48)
+    _age(stale, 3)
+    _age(recent, 2)
+
+    assert store.evict() == 2   # `old` for age, then `stale` to fit 2 MB
+    assert not os.path.exists(old) and not os.path.exists(stale)
+    assert store.size() == 2 * 2**20
+    assert not store.touch(old) and store.touch(recent)
+    assert store.evict(max_mb=0, keep=(newest,)) == 1
+    assert os.listdir(store.root) == [os.path.basename(newest)]
+
+
+def test_background_job_keeps_its_input_after_eviction(tmp_path):
+    store = UploadStore(str(tmp_path / "uploads"))
+    pdf = tmp_path / "statement.pdf"
+    make_statement_pdf(str(pdf), n_pages=2, lines_per_page=5)
+    with open(pdf, "rb") as f:
+        path = store.put(f, suffix=".pdf")
+
+    jobs = JobStore(str(tmp_path / "jobs"))
+    job_id = jobs.submit("bank", {"rules": None, "file_name": "out.xlsx"}, links={"input_path": path})
+    store.evict(max_mb=0)
+    assert not os.path.exists(path)
+
+    run_job(jobs, jobs.claim(worker_pid=1))
+    job = jobs.get(job_id)
+    assert job["status"] == DONE, job["error"]
+    assert len(pd.read_excel(jobs.artifact_path(job_id, "out.xlsx"))) > 0